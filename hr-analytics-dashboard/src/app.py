@@ -6,6 +6,7 @@ import plotly.express as px
 
 # Import local modules
 from data_loader import load_sample_data, calculate_metrics
+from hr_metrics import compute_metrics, dataset_version
 import visualizations as viz
 
 # Page configuration
@@ -30,10 +31,13 @@ st.markdown("""
 # Load data
 @st.cache_data
 def load_data():
-    return load_sample_data()
+    df = load_sample_data()
+    return df, dataset_version(df)
 
-df = load_data()
-metrics = calculate_metrics(df)
+# Streamlit reruns this script on every interaction; the data version lets
+# the metric registry reuse metrics already computed for the same data
+df, version = load_data()
+metrics = calculate_metrics(df, version)
 
 # Sidebar
 st.sidebar.title("Filters")
@@ -49,8 +53,10 @@ selected_departments = st.sidebar.multiselect(
 # Apply filters
 if 'All' in selected_departments or not selected_departments:
     filtered_df = df
+    filtered_version = version
 else:
     filtered_df = df[df['department'].isin(selected_departments)]
+    filtered_version = (version, tuple(sorted(selected_departments)))
 
 # Main content
 st.title("HR Analytics Dashboard")
@@ -59,29 +65,31 @@ st.markdown("---")
 # Key Metrics
 st.markdown("### Key Metrics")
 col1, col2, col3, col4 = st.columns(4)
+kpis = compute_metrics(filtered_df, ['total_employees', 'attrition_rate', 'avg_salary', 'avg_satisfaction'],
+                       version=filtered_version)
 
 with col1:
     st.markdown("<div class='metric-card'>"
-                f"<div class='metric-value'>{len(filtered_df):,}</div>"
+                f"<div class='metric-value'>{kpis['total_employees']:,}</div>"
                 "<div class='metric-label'>Total Employees</div>"
                 "</div>", unsafe_allow_html=True)
 
 with col2:
-    attrition_rate = filtered_df['attrition'].mean() * 100
+    attrition_rate = kpis['attrition_rate']
     st.markdown("<div class='metric-card'>"
                 f"<div class='metric-value'>{attrition_rate:.1f}%</div>"
                 "<div class='metric-label'>Attrition Rate</div>"
                 "</div>", unsafe_allow_html=True)
 
 with col3:
-    avg_salary = filtered_df['salary'].mean()
+    avg_salary = kpis['avg_salary']
     st.markdown("<div class='metric-card'>"
                 f"<div class='metric-value'>${avg_salary:,.0f}</div>"
                 "<div class='metric-label'>Avg. Salary</div>"
                 "</div>", unsafe_allow_html=True)
 
 with col4:
-    avg_satisfaction = filtered_df['satisfaction'].mean()
+    avg_satisfaction = kpis['avg_satisfaction']
     st.markdown("<div class='metric-card'>"
                 f"<div class='metric-value'>{avg_satisfaction:.1f}/5.0</div>"
                 "<div class='metric-label'>Avg. Satisfaction</div>"
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from hr_metrics import compute_metrics
+
 def load_sample_data():
     """
     Generate and return sample HR data for demonstration purposes.
@@ -37,52 +39,33 @@ def load_sample_data():
     
     # Add some date fields
     end_date = pd.Timestamp.now()
-    start_dates = [end_date - pd.Timedelta(days=int(365.25 * t)) for t in df['tenure']]
-    df['hire_date'] = start_dates
+    df['hire_date'] = end_date - pd.to_timedelta((365.25 * df['tenure']).astype(int), unit='D')
     
     return df
 
-def calculate_metrics(df):
+def calculate_metrics(df, version=None):
     """
     Calculate key HR metrics from the dataset.
     
+    Metrics come from the metric registry in hr_metrics, with rates in percent.
+    
     Args:
         df (pd.DataFrame): Input HR data
+        version (hashable): Identifies df so metrics already computed for it
+            are reused, e.g. from dataset_version
         
     Returns:
         dict: Dictionary containing calculated metrics
     """
-    metrics = {}
-    
     # Overall metrics
-    metrics['total_employees'] = len(df)
-    metrics['attrition_rate'] = df['attrition'].mean() * 100
-    metrics['avg_satisfaction'] = df['satisfaction'].mean()
-    metrics['avg_tenure'] = df['tenure'].mean()
-    
-    # Department-wise metrics
-    dept_metrics = df.groupby('department').agg({
-        'employee_id': 'count',
-        'attrition': 'mean',
-        'salary': 'mean',
-        'satisfaction': 'mean'
-    }).rename(columns={
-        'employee_id': 'employee_count',
-        'attrition': 'attrition_rate',
-        'salary': 'avg_salary',
-        'satisfaction': 'avg_satisfaction'
-    })
+    metrics = compute_metrics(df, ['total_employees', 'attrition_rate', 'avg_satisfaction', 'avg_tenure'],
+                              version=version)
     
-    # Position-wise metrics
-    position_metrics = df.groupby('position').agg({
-        'employee_id': 'count',
-        'attrition': 'mean',
-        'salary': 'mean'
-    }).rename(columns={
-        'employee_id': 'employee_count',
-        'attrition': 'attrition_rate',
-        'salary': 'avg_salary'
-    })
+    # Department-wise and position-wise metrics
+    dept_metrics = compute_metrics(df, ['employee_count', 'attrition_rate', 'avg_salary', 'avg_satisfaction'],
+                                   by='department', version=version)
+    position_metrics = compute_metrics(df, ['employee_count', 'attrition_rate', 'avg_salary'],
+                                       by='position', version=version)
     
     # Diversity metrics
     gender_dist = df['gender'].value_counts(normalize=True) * 100
@@ -90,8 +73,8 @@ def calculate_metrics(df):
     
     return {
         'overall': metrics,
-        'by_department': dept_metrics.reset_index().to_dict('records'),
-        'by_position': position_metrics.reset_index().to_dict('records'),
+        'by_department': dept_metrics.to_dict('records'),
+        'by_position': position_metrics.to_dict('records'),
         'gender_distribution': gender_dist.to_dict(),
         'education_distribution': education_dist.to_dict()
     }
@@ -0,0 +1,165 @@
+# Copy of hr_metrics.py from the repository root, so this app runs on its
+# own with the packages in requirements.txt. Keep the two files identical
+# apart from this comment so every dashboard computes the same numbers.
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Every metric the dashboards show, as numbers with rates in percent. A base
+# metric reduces one column with a pandas reducer ('size' counts rows and
+# needs no column), optionally multiplied by a scale; a derived metric
+# combines other metrics. Formatting is left to the reports.
+METRICS = {
+    # Employee records, one row per employee
+    'total_employees': {'column': None, 'reducer': 'size'},
+    'employee_count': {'column': 'employee_id', 'reducer': 'count'},
+    'attrition_rate': {'column': 'attrition', 'reducer': 'mean', 'scale': 100},
+    'avg_salary': {'column': 'salary', 'reducer': 'mean'},
+    'avg_satisfaction': {'column': 'satisfaction', 'reducer': 'mean'},
+    'avg_tenure': {'column': 'tenure', 'reducer': 'mean'},
+    # Monthly staffing table, one row per month in order
+    'avg_headcount': {'column': 'headcount', 'reducer': 'mean'},
+    'current_month_headcount': {'column': 'headcount', 'reducer': 'last'},
+    'total_joiners': {'column': 'joiners', 'reducer': 'sum'},
+    'total_leavers': {'column': 'leavers', 'reducer': 'sum'},
+    'last_month_leavers': {'column': 'leavers', 'reducer': 'last'},
+    'avg_monthly_attrition': {'column': 'attrition_rate', 'reducer': 'mean'},
+    'net_growth': {'inputs': ['total_joiners', 'total_leavers'], 'combine': np.subtract},
+}
+
+# Results kept for datasets with a version, most recently used last
+METRIC_CACHE_SIZE = 64
+_results = OrderedDict()
+_results_lock = threading.Lock()
+
+def plan_metrics(names, columns):
+    """Work out the column reductions a set of metrics needs
+
+    Args:
+        names (list): Metric names from METRICS
+        columns (iterable): Columns of the data
+
+    Returns:
+        tuple: The metrics that can be computed, in the order asked for, and
+            the distinct (column, reducer) pairs they need, each listed once
+    """
+    columns = set(columns)
+    available, reductions = [], []
+
+    def resolve(name):
+        if name not in METRICS:
+            raise ValueError(f"Unknown metric: {name}. Use one of {sorted(METRICS)}")
+        spec = METRICS[name]
+        if 'inputs' in spec:
+            return all([resolve(input_name) for input_name in spec['inputs']])
+        if spec['column'] is not None and spec['column'] not in columns:
+            return False
+        reduction = (spec['column'], spec['reducer'])
+        if reduction not in reductions:
+            reductions.append(reduction)
+        return True
+
+    for name in names:
+        if resolve(name):
+            available.append(name)
+        else:
+            logger.debug(f"Skipping metric {name}: the data lacks its columns")
+    return available, reductions
+
+def _reduce(series, reducer):
+    """Reduce a whole column the way the groupby reducer of the same name does"""
+    if reducer == 'last':
+        series = series.dropna()
+        return series.iloc[-1] if len(series) else np.nan
+    return getattr(series, reducer)()
+
+def _metric_value(name, reduced):
+    spec = METRICS[name]
+    if 'inputs' in spec:
+        return spec['combine'](*(_metric_value(input_name, reduced) for input_name in spec['inputs']))
+    value = reduced[(spec['column'], spec['reducer'])]
+    return value * spec['scale'] if 'scale' in spec else value
+
+def _compute(df, names, by):
+    available, reductions = plan_metrics(names, df.columns)
+    if by is None:
+        reduced = {(column, reducer): len(df) if reducer == 'size' else _reduce(df[column], reducer)
+                   for column, reducer in reductions}
+        return {name: _metric_value(name, reduced) for name in available}
+
+    # One groupby holds the group of every row, shared by all reductions
+    grouped = df.groupby(by, observed=True)
+    keys = {reduction: f"{reduction[0]}__{reduction[1]}" for reduction in reductions}
+    table = grouped.agg(**{key: reduction for reduction, key in keys.items() if reduction[1] != 'size'})
+    if (None, 'size') in keys:
+        table[keys[(None, 'size')]] = grouped.size()
+    reduced = {reduction: table[key] for reduction, key in keys.items()}
+    result = pd.DataFrame({name: _metric_value(name, reduced) for name in available}, index=table.index)
+    return result.reset_index()
+
+def _copy(result):
+    return result.copy() if isinstance(result, pd.DataFrame) else dict(result)
+
+def compute_metrics(df, names, by=None, version=None):
+    """Compute metrics from the registry in one pass over the data
+
+    Only the columns the requested metrics need are reduced, each column and
+    reducer once however many metrics share it. Metrics whose columns the
+    data lacks are left out.
+
+    Args:
+        df (pd.DataFrame): Employee records or monthly staffing table
+        names (list): Metric names from METRICS
+        by (str | list): Column(s) to compute the metrics per group of,
+            None for the whole data
+        version (hashable): Identifies the data, e.g. a file path and
+            modification time or dataset_version(df); results for a version
+            seen before are returned without touching the data
+
+    Returns:
+        dict | pd.DataFrame: Metric values by name, or with by, one row per
+            group with the group columns followed by the metrics
+    """
+    key = None
+    if version is not None:
+        key = (version, tuple(names), by if by is None or isinstance(by, str) else tuple(by))
+        with _results_lock:
+            if key in _results:
+                _results.move_to_end(key)
+                return _copy(_results[key])
+
+    result = _compute(df, names, by)
+
+    if key is not None:
+        with _results_lock:
+            _results[key] = result
+            while len(_results) > METRIC_CACHE_SIZE:
+                _results.popitem(last=False)
+    return _copy(result)
+
+def dataset_version(df):
+    """Content hash of a DataFrame, for use as a compute_metrics version
+
+    Hashing reads every value, so compute it once per loaded dataset and
+    reuse it rather than per call.
+
+    Args:
+        df (pd.DataFrame): Any data
+
+    Returns:
+        str: Hex digest that changes when any value or column name does
+    """
+    digest = hashlib.sha256(repr(list(df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
@@ -1,4 +1,9 @@
+import hashlib
+import itertools
+import json
 import os
+import sys
+import time
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -6,6 +11,7 @@ from pathlib import Path
 from datetime import datetime
 import argparse
 import logging
+import hr_sample_data
 
 # Set up logging
 logging.basicConfig(
@@ -15,41 +21,519 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create output directory for HTML and images
-output_dir = Path("hr_analytics_output")
-output_dir.mkdir(exist_ok=True)
-images_dir = output_dir / "images"
-images_dir.mkdir(exist_ok=True)
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
-def load_data(file_path=None):
+try:
+    import pyarrow as pa
+except ImportError:  # The data cache needs pyarrow
+    pa = None
+
+try:
+    import python_calamine
+except ImportError:  # Excel files are then streamed with openpyxl
+    python_calamine = None
+
+# Kind of each HR export column the dashboards use, applied while the file is
+# read: 'category' for repeated labels, 'number' for numbers (downcast to the
+# smallest integer type when whole), 'date' for dates and 'string' for free
+# text. Other columns get a kind inferred from the first rows.
+EMPLOYEE_SCHEMA = {
+    'employee_id': 'number',
+    'department': 'category',
+    'position': 'category',
+    'age': 'number',
+    'tenure': 'number',
+    'salary': 'number',
+    'education': 'category',
+    'gender': 'category',
+    'attrition': 'number',
+    'satisfaction': 'number',
+    'performance_rating': 'number',
+    'work_life_balance': 'number',
+    'hire_date': 'date',
+    'exit_date': 'date',
+}
+REQUIRED_COLUMNS = ['department', 'position', 'age', 'tenure', 'salary', 'gender', 'attrition']
+
+# Date formats tried, in order, on a sample of each date column; the first
+# that parses every sampled value is used for the whole column. Month-first
+# comes before day-first, as pandas guesses.
+DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y/%m/%d', '%m/%d/%Y', '%d/%m/%Y', '%d.%m.%Y',
+                '%d-%b-%Y', '%Y%m%d']
+
+# Rows read to infer column kinds and date formats, and rows per CSV chunk
+SCHEMA_SAMPLE_ROWS = 10_000
+CSV_CHUNK_ROWS = 500_000
+EXCEL_CHUNK_ROWS = 100_000
+
+# Converted copies of source files are kept as uncompressed Arrow IPC files,
+# which later loads memory-map instead of parsing the source again. Bump the
+# version when the conversion changes in a way the cache key does not cover.
+DATA_CACHE_VERSION = 1
+DATA_CACHE_MAX_BYTES = 4 * 1024 ** 3
+DATA_CACHE_INDEX = 'sources.json'
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB, None where unknown"""
+    # Linux reports the peak of the running program here; ru_maxrss also
+    # counts the parent's memory at the time this process was started
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+def infer_schema(sample):
+    """Kind of each column of a sample, see EMPLOYEE_SCHEMA
+    
+    Args:
+        sample (pd.DataFrame): First rows of the data, read without dtypes
+        
+    Returns:
+        dict: Column name mapped to 'category', 'number', 'date' or 'string'
+    """
+    schema = {}
+    for col in sample.columns:
+        values = sample[col]
+        if col in EMPLOYEE_SCHEMA:
+            schema[col] = EMPLOYEE_SCHEMA[col]
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            schema[col] = 'number'
+        elif str(col).lower().endswith('date'):
+            schema[col] = 'date'
+        elif values.nunique() <= len(values) // 2:
+            schema[col] = 'category'
+        else:
+            schema[col] = 'string'
+    return schema
+
+def detect_date_format(values):
+    """First of DATE_FORMATS that parses every value, None if none does
+    
+    Args:
+        values (pd.Series): Sampled date strings; missing values are ignored
+        
+    Returns:
+        str: strptime format, or None to let pandas infer it
+    """
+    values = values.dropna().astype(str)
+    if values.empty:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            pd.to_datetime(values, format=date_format)
+        except (ValueError, TypeError):
+            continue
+        return date_format
+    logger.warning(f"No known date format fits column {values.name}; pandas will infer it")
+    return None
+
+def _downcast_integers(values):
+    """Integer column in the smallest signed type holding its range"""
+    if values.empty:
+        return values
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values
+
+def apply_schema(df, schema, date_formats):
+    """Convert the columns of a chunk of data to the dtypes of their kinds
+    
+    Values that do not parse as a number or date become missing, with a warning.
+    
+    Args:
+        df (pd.DataFrame): Chunk of data
+        schema (dict): Kind of each column, from infer_schema
+        date_formats (dict): Format of each date column, from detect_date_format
+        
+    Returns:
+        pd.DataFrame: The chunk with converted columns
+    """
+    for col, kind in schema.items():
+        values = df[col]
+        if kind == 'number':
+            numeric = pd.api.types.is_numeric_dtype(values)
+            converted = values if numeric else pd.to_numeric(values, errors='coerce')
+            # Whole numbers stored as floats, as some Excel readers return them
+            if pd.api.types.is_float_dtype(converted) and converted.notna().all() \
+                    and (converted % 1 == 0).all() and converted.abs().max() < 2 ** 53:
+                converted = converted.astype(np.int64)
+            if pd.api.types.is_integer_dtype(converted):
+                converted = _downcast_integers(converted)
+            if numeric:
+                df[col] = converted
+                continue
+        elif kind == 'date':
+            if pd.api.types.is_datetime64_dtype(values):
+                continue
+            converted = pd.to_datetime(values, format=date_formats.get(col), errors='coerce')
+        else:
+            if kind == 'category' and not isinstance(values.dtype, pd.CategoricalDtype):
+                df[col] = values.astype('category')
+            continue
+        unparsed = int((converted.isna() & values.notna()).sum())
+        if unparsed:
+            logger.warning(f"{unparsed:,} values of column {col} could not be read as a {kind}")
+        df[col] = converted
+    return df
+
+def remove_unused_categories(df):
+    """Drop the labels no row holds from the category columns of a subset
+    
+    A row subset of loaded data keeps every label of the file in its
+    categories, which value_counts and groupby would report as empty groups.
+    
+    Args:
+        df (pd.DataFrame): Rows selected from loaded data
+        
+    Returns:
+        pd.DataFrame: df with only the labels it holds in each category column
+    """
+    categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return df
+    df = df.copy(deep=False)
+    for col in categorical:
+        df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+def _combine_chunks(chunks, schema):
+    """One frame from typed chunks, joining the categories of each chunk"""
+    for col, kind in schema.items():
+        if kind == 'category':
+            # A chunk's categories are only the labels it holds
+            categories = pd.Index(sorted(set().union(*(chunk[col].cat.categories for chunk in chunks))))
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+def read_csv_typed(file_path, columns=None, chunk_rows=CSV_CHUNK_ROWS):
+    """Read a CSV file in chunks straight into compact typed columns
+    
+    Column kinds and date formats are worked out once from the first
+    SCHEMA_SAMPLE_ROWS rows. Each chunk is converted as it is read, so the
+    file is never held as text in full.
+    
+    Args:
+        file_path (str): CSV file
+        columns (list): Columns to read, None for all; names the file lacks
+            are ignored
+        chunk_rows (int): Rows per chunk
+        
+    Returns:
+        pd.DataFrame: The data, with category, downcast integer and datetime columns
+    """
+    sample = pd.read_csv(file_path, nrows=SCHEMA_SAMPLE_ROWS)
+    usecols = [col for col in sample.columns if columns is None or col in columns]
+    schema = infer_schema(sample[usecols])
+    date_formats = {col: detect_date_format(sample[col]) for col, kind in schema.items() if kind == 'date'}
+    
+    # The reader parses labels straight into categories and dates with their
+    # detected format; apply_schema then downcasts integers and converts any
+    # date column the reader could not parse
+    dtypes = {col: 'category' if kind == 'category' else str
+              for col, kind in schema.items() if kind in ('category', 'string')}
+    reader = pd.read_csv(file_path, usecols=usecols, dtype=dtypes, chunksize=chunk_rows,
+                         parse_dates=list(date_formats),
+                         date_format={col: fmt for col, fmt in date_formats.items() if fmt})
+    chunks = [apply_schema(chunk, schema, date_formats) for chunk in reader]
+    if not chunks:
+        return apply_schema(sample[usecols].copy(), schema, date_formats)
+    return _combine_chunks(chunks, schema)
+
+def excel_engine():
+    """Excel reader in use: 'calamine' when python-calamine is installed, else 'openpyxl'"""
+    return 'openpyxl' if python_calamine is None else 'calamine'
+
+def _closing(rows, close):
+    """Yield rows, closing their file once they are exhausted"""
+    try:
+        yield from rows
+    finally:
+        close()
+
+def _sheet_name(names, sheet_name, file_path):
+    """Name of the sheet selected by name or position, the first by default"""
+    if sheet_name is None:
+        sheet_name = 0
+    if isinstance(sheet_name, int):
+        if not 0 <= sheet_name < len(names):
+            raise ValueError(f"{file_path} has {len(names)} sheets, no sheet {sheet_name}")
+        return names[sheet_name]
+    if sheet_name not in names:
+        raise ValueError(f"Sheet {sheet_name!r} not found in {file_path}. Sheets: {names}")
+    return sheet_name
+
+def excel_rows(file_path, sheet_name=None):
+    """Open one worksheet to read a row at a time
+    
+    python-calamine, which parses in Rust and also reads .xls files, is used
+    when installed. Otherwise .xlsx files are read by openpyxl in read-only
+    mode, which streams the sheet rather than building the whole workbook.
+    
+    Args:
+        file_path (str): Excel file
+        sheet_name (str | int): Sheet name or position, None for the first sheet
+        
+    Returns:
+        tuple: Sheet name, row count including the header (None when the
+            file does not record it) and an iterator of rows as sequences
+            of cell values, header first, closing the file when exhausted
+    """
+    if python_calamine is not None:
+        workbook = python_calamine.CalamineWorkbook.from_path(file_path)
+        name = _sheet_name(workbook.sheet_names, sheet_name, file_path)
+        sheet = workbook.get_sheet_by_name(name)
+        return name, sheet.height, _closing(sheet.iter_rows(), workbook.close)
+    
+    try:
+        import openpyxl
+    except ImportError as e:
+        raise ImportError("Reading Excel files requires openpyxl (pip install openpyxl)") from e
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    name = _sheet_name(workbook.sheetnames, sheet_name, file_path)
+    sheet = workbook[name]
+    return name, sheet.max_row, _closing(sheet.iter_rows(values_only=True), workbook.close)
+
+def read_excel_typed(file_path, sheet_name=None, columns=None, chunk_rows=EXCEL_CHUNK_ROWS):
+    """Stream one Excel worksheet in chunks into compact typed columns
+    
+    Rows come from excel_rows and are converted chunk by chunk as in
+    read_csv_typed, with column kinds and date formats worked out from the
+    first rows. Progress is logged after each chunk.
+    
+    Args:
+        file_path (str): Excel file
+        sheet_name (str | int): Sheet name or position, None for the first sheet
+        columns (list): Columns to read, None for all; names the sheet lacks
+            are ignored
+        chunk_rows (int): Rows per chunk
+        
+    Returns:
+        pd.DataFrame: The data, with category, downcast integer and datetime columns
+    """
+    if python_calamine is None and file_path.endswith('.xls'):
+        # openpyxl cannot read the old binary format; pandas reads it whole
+        df = pd.read_excel(file_path, sheet_name=sheet_name or 0)
+        if columns is not None:
+            df = df[[col for col in df.columns if col in columns]]
+        schema = infer_schema(df.head(SCHEMA_SAMPLE_ROWS))
+        return apply_schema(df, schema, {col: detect_date_format(df[col].head(SCHEMA_SAMPLE_ROWS))
+                                         for col, kind in schema.items() if kind == 'date'})
+    
+    name, total_rows, rows = excel_rows(file_path, sheet_name)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError(f"Sheet {name!r} of {file_path} is empty")
+    header = [f"Unnamed: {i}" if value is None or value == '' else str(value) for i, value in enumerate(header)]
+    usecols = [col for col in header if columns is None or col in columns]
+    
+    start_time = time.perf_counter()
+    schema, date_formats, chunks, read = None, None, [], 0
+    while True:
+        batch = [row[:len(header)] for row in itertools.islice(rows, chunk_rows)]
+        if not batch:
+            break
+        # Short rows are padded with missing values; empty text cells are missing too
+        chunk = pd.DataFrame(batch, columns=header)[usecols].dropna(how='all')
+        for col in chunk.select_dtypes(exclude=['number', 'datetime']).columns:
+            chunk[col] = chunk[col].replace('', None)
+        if schema is None:
+            schema = infer_schema(chunk.head(SCHEMA_SAMPLE_ROWS).infer_objects())
+            date_formats = {col: detect_date_format(chunk[col].head(SCHEMA_SAMPLE_ROWS))
+                            for col, kind in schema.items() if kind == 'date'}
+        chunks.append(apply_schema(chunk, schema, date_formats))
+        read += len(batch)
+        of_total = f" of {total_rows - 1:,}" if total_rows else ""
+        logger.info(f"Read {read:,}{of_total} rows from sheet {name!r} "
+                    f"in {time.perf_counter() - start_time:.1f} seconds")
+    
+    if not chunks:
+        return pd.DataFrame({col: pd.Series(dtype=object) for col in usecols})
+    return _combine_chunks(chunks, schema)
+
+def file_digest(file_path, block_size=4 * 1024 ** 2):
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _source_digest(file_path, cache_dir):
+    """Content hash of a source file, re-read only when its size or mtime changed"""
+    index_file = cache_dir / DATA_CACHE_INDEX
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    path = str(Path(file_path).resolve())
+    stat = os.stat(path)
+    entry = index.get(path)
+    if entry and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return entry[2]
+    
+    logger.info(f"Hashing {file_path} for the data cache")
+    digest = file_digest(path)
+    index[path] = [stat.st_size, stat.st_mtime_ns, digest]
+    partial = index_file.with_suffix('.tmp')
+    with open(partial, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(partial, index_file)
+    return digest
+
+def data_cache_key(file_path, columns, cache_dir, sheet_name=None):
+    """Key of the converted copy of a source file in the data cache
+    
+    Covers the file's contents, the columns read and every setting of the
+    conversion, so an edited file or a changed schema misses the cache.
+    
+    Args:
+        file_path (str): Source CSV or Excel file
+        columns (list): Columns read, None for all
+        cache_dir (Path): Data cache directory holding the source index
+        sheet_name (str | int): Worksheet read from an Excel file
+        
+    Returns:
+        str: Hex digest
+    """
+    suffix = Path(file_path).suffix.lower()
+    excel = (sheet_name, excel_engine()) if suffix != '.csv' else None
+    settings = (DATA_CACHE_VERSION, _source_digest(file_path, cache_dir), suffix, excel,
+                sorted(columns) if columns is not None else None, EMPLOYEE_SCHEMA, DATE_FORMATS,
+                SCHEMA_SAMPLE_ROWS, pd.__version__, pa.__version__)
+    return hashlib.sha256(repr(settings).encode()).hexdigest()
+
+def evict_data_cache(cache_dir, max_bytes=DATA_CACHE_MAX_BYTES):
+    """Delete the least recently used converted files beyond max_bytes,
+    always keeping the most recent one
+    
+    Args:
+        cache_dir (Path): Data cache directory
+        max_bytes (int): Largest total size to keep
+        
+    Returns:
+        int: Number of converted files deleted
+    """
+    entries = sorted(((entry.stat(), entry) for entry in Path(cache_dir).glob('*.arrow')),
+                     key=lambda item: item[0].st_mtime_ns)
+    total = sum(stat.st_size for stat, _ in entries)
+    evicted = 0
+    for stat, entry in entries[:-1]:
+        if total <= max_bytes:
+            break
+        try:
+            entry.unlink()
+        except OSError:
+            continue  # Still mapped by a running load on Windows
+        total -= stat.st_size
+        evicted += 1
+    return evicted
+
+def _read_source(file_path, columns, sheet_name=None):
+    """Parse a CSV file or an Excel worksheet into typed columns"""
+    if file_path.endswith('.csv'):
+        return read_csv_typed(file_path, columns)
+    elif file_path.endswith(('.xlsx', '.xls')):
+        return read_excel_typed(file_path, sheet_name, columns)
+    else:
+        logger.error("Unsupported file format. Please provide a CSV or Excel file.")
+        raise ValueError("Unsupported file format")
+
+def read_cached_source(file_path, columns, cache_dir, sheet_name=None, max_cache_bytes=DATA_CACHE_MAX_BYTES):
+    """Load a source file through the data cache
+    
+    The first load parses the file and writes its typed columns as an Arrow
+    IPC file; later loads of the same contents memory-map that copy.
+    
+    Args:
+        file_path (str): Source CSV or Excel file
+        columns (list): Columns to read, None for all
+        cache_dir (Path): Data cache directory
+        sheet_name (str | int): Worksheet of an Excel file, None for the first
+        max_cache_bytes (int): Size bound of the data cache
+        
+    Returns:
+        pd.DataFrame: The data, as _read_source returns it
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached = cache_dir / f"{data_cache_key(file_path, columns, cache_dir, sheet_name)}.arrow"
+    if cached.exists():
+        os.utime(cached)  # Mark as recently used
+        logger.info(f"Reading {file_path} from the data cache")
+        return pa.ipc.open_file(pa.memory_map(str(cached))).read_all().to_pandas(split_blocks=True)
+    
+    df = _read_source(file_path, columns, sheet_name)
+    # Write under a temporary name so a crash never leaves a partial entry
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    partial = cached.with_suffix('.tmp')
+    with pa.OSFile(str(partial), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(partial, cached)
+    evicted = evict_data_cache(cache_dir, max_cache_bytes)
+    logger.info(f"Data cache: converted {file_path} to {cached.name}"
+                + (f", {evicted} older files evicted" if evicted else ""))
+    return df
+
+def load_data(file_path=None, columns=None, cache_dir=None, sheet_name=None):
     """
     Load HR data from a CSV or Excel file, or generate sample data if no file provided
     
+    Files are read with the dtypes of EMPLOYEE_SCHEMA, in chunks; Excel
+    worksheets are streamed a row at a time, see read_excel_typed.
+    With a cache directory, the typed columns are kept as an Arrow file that
+    later loads of the same file contents memory-map, see read_cached_source.
+    The load time, the size of the data in memory and the peak memory of the
+    process are logged.
+    
     Args:
         file_path (str): Path to the CSV or Excel file containing HR data
+        columns (list): Columns to read, None for all of them
+        cache_dir (Path): Data cache directory, None to always parse the file
+        sheet_name (str | int): Worksheet of an Excel file, by name or
+            position; None for the first
         
     Returns:
         pd.DataFrame: DataFrame containing HR data
     """
     if file_path and os.path.exists(file_path):
         logger.info(f"Loading data from {file_path}")
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
+        start_time = time.perf_counter()
+        if cache_dir is not None and pa is None:
+            logger.warning("The data cache needs pyarrow (pip install pyarrow); reading without it")
+            cache_dir = None
+        if cache_dir is not None:
+            df = read_cached_source(file_path, columns, cache_dir, sheet_name)
         else:
-            logger.error("Unsupported file format. Please provide a CSV or Excel file.")
-            raise ValueError("Unsupported file format")
+            df = _read_source(file_path, columns, sheet_name)
         
         # Check if the DataFrame has the required columns
-        required_columns = ['department', 'position', 'age', 'tenure', 'salary', 'gender', 'attrition']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         
         if missing_columns:
             logger.warning(f"The following required columns are missing: {missing_columns}")
             logger.warning("Using sample data instead")
             return generate_sample_data()
         
+        peak = peak_memory_mb()
+        logger.info(f"Loaded {len(df):,} rows x {len(df.columns)} columns in "
+                    f"{time.perf_counter() - start_time:.2f} seconds, "
+                    f"{df.memory_usage(deep=True).sum() / 1024 ** 2:,.1f} MB in memory"
+                    + (f", peak process memory {peak:,.0f} MB" if peak is not None else ""))
         return df
     else:
         logger.info("No valid file path provided. Using generated sample data.")
@@ -58,36 +542,6 @@ def load_data(file_path=None):
 def generate_sample_data(n_employees=100):
     """Generate sample HR data for demonstration"""
     logger.info(f"Generating sample data with {n_employees} employee records")
-    np.random.seed(42)
-    
-    departments = ['Engineering', 'Marketing', 'Sales', 'HR', 'Finance']
-    positions = ['Manager', 'Senior', 'Mid-level', 'Junior', 'Intern']
-    education = ["Bachelor's", "Master's", 'PhD', 'High School']
-    
-    data = {
-        'employee_id': range(1, n_employees + 1),
-        'department': np.random.choice(departments, n_employees),
-        'position': np.random.choice(positions, n_employees),
-        'age': np.random.normal(35, 8, n_employees).astype(int).clip(22, 65),
-        'tenure': np.random.gamma(3, 1, n_employees).astype(int).clip(0, 15),
-        'salary': np.random.normal(75000, 25000, n_employees).astype(int).clip(30000, 200000),
-        'education': np.random.choice(education, n_employees),
-        'gender': np.random.choice(['Male', 'Female', 'Other'], n_employees),
-        'attrition': np.random.choice([0, 1], n_employees, p=[0.85, 0.15]),
-        'satisfaction': np.random.randint(1, 6, n_employees),
-        'performance_rating': np.random.randint(1, 6, n_employees)
-    }
-    
-    # Add hire date
-    end_date = pd.Timestamp('2025-06-08')  # Today's date for reference
-    hire_dates = []
-    for t in data['tenure']:
-        days = int(365.25 * t)
-        hire_date = end_date - pd.Timedelta(days=days)
-        hire_dates.append(hire_date)
-    
-    data['hire_date'] = hire_dates
-    
-    return pd.DataFrame(data)
+    return hr_sample_data.generate_sample_data(n_employees)
 
 # Create visualizations - this will be on part 2
@@ -0,0 +1,493 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from hr_staffing_tracker import process_monthly_staffing, build_staffing_cube
+from hr_staffing_tracker import department_transitions, project_department_headcount
+from hr_forecasting import staffing_series, backtest_forecasts
+from hr_headcount_index import build_headcount_index, headcount_as_of, headcount_between
+from hr_retention import retention_curves, cohort_retention_matrix
+from hr_requisitions import vacancy_counts, time_to_fill, match_requisitions_to_hires
+from hr_staffing_tracker import staffing_chart_tasks, optimal_hiring_time
+from hr_visualizations import visualization_tasks, render_charts
+from hr_report_assets import RESPONSIVE_FORMATS, RESPONSIVE_WIDTHS, build_chart_variants
+from hr_report_templates import DEPARTMENT_COLUMNS, department_metrics_table, table_column, write_report
+from hr_html_generator import calculate_metrics, load_branding_config
+from hr_dashboard_main import generate_dashboard, generate_batch, generate_department_pages, build_dashboard
+from hr_sample_data import generate_sample_data, generate_movement_history, generate_sample_requisitions
+from hr_sample_data import write_sample_data
+import hr_analytics_real_data
+from hr_analytics_real_data import load_data, peak_memory_mb
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+REFERENCE_DATE = pd.Timestamp('2025-06-08')
+
+def make_staffing_frame(n_employees, n_years, seed=42):
+    """Build a synthetic hire/exit history spanning the given number of years"""
+    rng = np.random.default_rng(seed)
+    history_days = int(365.25 * n_years)
+    hire_offsets = rng.integers(0, history_days, n_employees)
+    hire_date = REFERENCE_DATE - pd.to_timedelta(hire_offsets, unit='D')
+    stay_days = rng.integers(30, history_days, n_employees)
+    left = (rng.random(n_employees) < 0.4) & (stay_days < hire_offsets)
+    exit_date = pd.Series(hire_date + pd.to_timedelta(stay_days, unit='D')).where(left)
+    return pd.DataFrame({
+        'employee_id': np.arange(1, n_employees + 1),
+        'hire_date': hire_date,
+        'exit_date': exit_date,
+        'attrition': left.astype(int),
+    })
+
+def legacy_monthly_staffing(df, months_range):
+    """Month-by-month mask implementation kept as a correctness reference"""
+    monthly_data = []
+    for month_start in months_range:
+        month_end = month_start + pd.offsets.MonthEnd(1)
+        active_count = int(((df['hire_date'] <= month_end) &
+                            ((df['exit_date'].isna()) | (df['exit_date'] > month_end))).sum())
+        joiners = int(((df['hire_date'] >= month_start) & (df['hire_date'] <= month_end)).sum())
+        leavers = int(((df['exit_date'] >= month_start) & (df['exit_date'] <= month_end)).sum())
+        attrition_rate = (leavers / active_count * 100) if active_count > 0 else 0
+        monthly_data.append({
+            'month': month_start.strftime('%Y-%m'),
+            'headcount': active_count,
+            'joiners': joiners,
+            'leavers': leavers,
+            'attrition_rate': round(attrition_rate, 2)
+        })
+    return pd.DataFrame(monthly_data)
+
+def legacy_department_table(dept_metrics):
+    """Row-by-row string concatenation kept as a report rendering reference"""
+    html = "<table><tr><th>Department</th><th>Employee Count</th><th>Attrition Rate</th><th>Avg. Salary</th></tr>"
+    for _, row in dept_metrics.iterrows():
+        html += f"""
+                <tr>
+                    <td>{row['department']}</td>
+                    <td>{row['Employee Count']}</td>
+                    <td>{row['Attrition Rate']}</td>
+                    <td>{row['Avg. Salary']}</td>
+                </tr>
+        """
+    return html + "</table>"
+
+def legacy_department_metrics(df):
+    """Department metrics formatted by lambdas inside groupby, kept as a reference"""
+    dept_metrics = df.groupby('department', observed=True).agg({
+        'employee_id': 'count',
+        'attrition': lambda x: f"{x.mean() * 100:.1f}%",
+        'salary': lambda x: f"${x.mean():,.0f}",
+    })
+    dept_metrics['satisfaction'] = df.groupby('department', observed=True)['satisfaction'].agg(lambda x: f"{x.mean():.1f}")
+    return dept_metrics.rename(columns={
+        'employee_id': 'Employee Count',
+        'attrition': 'Attrition Rate',
+        'salary': 'Avg. Salary',
+        'satisfaction': 'Avg. Satisfaction'
+    }).reset_index()
+
+def time_call(func, *args, repeat=3):
+    """Return the best wall time in seconds over several runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_monthly_staffing(sizes=(10_000, 100_000, 400_000, 1_600_000), n_years=15, check_rows=20_000):
+    """Time process_monthly_staffing over growing employee counts and history lengths"""
+    logger.info("Checking event-sweep results against the month-by-month reference")
+    df = make_staffing_frame(check_rows, n_years)
+    monthly_df = process_monthly_staffing(df.copy())
+    months_range = pd.to_datetime(monthly_df['month'])
+    legacy_df = legacy_monthly_staffing(df, months_range)
+    pd.testing.assert_frame_equal(monthly_df, legacy_df, check_dtype=False)
+
+    logger.info(f"Scaling with employees ({n_years} years of history)")
+    print(f"{'employees':>12} {'months':>8} {'seconds':>10} {'ns/row':>10}")
+    for n_employees in sizes:
+        df = make_staffing_frame(n_employees, n_years)
+        seconds = time_call(lambda: process_monthly_staffing(df.copy()))
+        n_months = len(pd.date_range(df['hire_date'].min().replace(day=1), REFERENCE_DATE, freq='MS'))
+        print(f"{n_employees:>12,} {n_months:>8} {seconds:>10.4f} {seconds / n_employees * 1e9:>10.1f}")
+
+    logger.info("Scaling with history length (100,000 employees)")
+    print(f"{'years':>12} {'months':>8} {'seconds':>10}")
+    for years in (5, 15, 45, 135):
+        df = make_staffing_frame(100_000, years)
+        seconds = time_call(lambda: process_monthly_staffing(df.copy()))
+        n_months = len(pd.date_range(df['hire_date'].min().replace(day=1), REFERENCE_DATE, freq='MS'))
+        print(f"{years:>12} {n_months:>8} {seconds:>10.4f}")
+
+def benchmark_headcount_index(n_employees=1_000_000, n_queries=1000):
+    """Time building the headcount index and answering point-in-time queries"""
+    df = generate_sample_data(n_employees)
+    start = time.perf_counter()
+    index = build_headcount_index(df)
+    build_seconds = time.perf_counter() - start
+    
+    queries = {
+        'as of date': lambda: headcount_as_of(index, '2023-03-15'),
+        'as of date, one department': lambda: headcount_as_of(index, '2023-03-15', department='Finance'),
+        'quarter, department + position': lambda: headcount_between(
+            index, '2023-04-01', '2023-06-30', department=['HR', 'Sales'], position='Manager'),
+    }
+    print(f"Index build over {n_employees:,} employees: {build_seconds:.3f} s")
+    print(f"{'query':>32} {'ms/query':>10}")
+    for name, query in queries.items():
+        seconds = time_call(lambda: [query() for _ in range(n_queries)])
+        print(f"{name:>32} {seconds / n_queries * 1000:>10.4f}")
+
+def benchmark_retention(sizes=(100_000, 1_000_000, 5_000_000)):
+    """Time retention curves and cohort matrices over growing employee counts"""
+    print(f"{'employees':>12} {'curves s':>10} {'cohorts s':>10}")
+    for n_employees in sizes:
+        df = generate_sample_data(n_employees)
+        curves = time_call(lambda: retention_curves(df.copy(), by='department'))
+        cohorts = time_call(lambda: cohort_retention_matrix(df.copy(), cohort_freq='M', max_months=60, by='department'))
+        print(f"{n_employees:>12,} {curves:>10.4f} {cohorts:>10.4f}")
+
+def benchmark_forecasting(n_employees=200_000, horizon=6, n_origins=12):
+    """Backtest the forecast methods on total and department headcount"""
+    cube = build_staffing_cube(generate_sample_data(n_employees), dimensions=['department', 'position'])
+    series = staffing_series(cube)
+    logger.info(f"Rolling-origin backtest over {len(series['labels'])} series, "
+                f"{series['values'].shape[1]} months, {horizon}-month horizon")
+    print(backtest_forecasts(series['values'], horizon, n_origins).to_string(index=False))
+
+    # Batch size scaling: every department x position series at once
+    combos = cube['headcount'].reshape(len(cube['months']), -1).T.astype(float)
+    many = np.repeat(combos, 200, axis=0)
+    print(f"{'series':>12} {'auto fit s':>10}")
+    for values in (combos, many):
+        seconds = time_call(lambda: backtest_forecasts(values, horizon, 1, methods=['auto']), repeat=1)
+        print(f"{len(values):>12,} {seconds:>10.4f}")
+
+def benchmark_mobility(n_employees=1_000_000, n_departments=200, months=24):
+    """Time transition counting and the Markov headcount projection"""
+    df = generate_sample_data(n_employees)
+    codes = np.random.default_rng(7).integers(0, n_departments, n_employees)
+    df['department'] = pd.Categorical.from_codes(codes, [f"Dept {i:03d}" for i in range(n_departments)])
+    movements = generate_movement_history(df)
+    
+    start = time.perf_counter()
+    transitions = department_transitions(df, movements)
+    count_seconds = time.perf_counter() - start
+    projection = time_call(lambda: project_department_headcount(transitions, months), repeat=20)
+    
+    print(f"{'employees':>12} {'transfers':>10} {'departments':>12} {'count s':>10} {'project ms':>11}")
+    print(f"{n_employees:>12,} {len(movements):>10,} {n_departments:>12} {count_seconds:>10.3f} {projection * 1000:>11.3f}")
+
+def benchmark_requisitions(n_employees=1_000_000, n_requisitions=50_000):
+    """Time vacancy counts, time-to-fill and requisition-to-hire matching"""
+    df = generate_sample_data(n_employees)
+    requisitions = generate_sample_requisitions(df.sample(n_requisitions, random_state=7))
+
+    vacancies = time_call(lambda: vacancy_counts(requisitions, by='department'))
+    fill_times = time_call(lambda: time_to_fill(requisitions))
+    start = time.perf_counter()
+    matched = match_requisitions_to_hires(requisitions, df)
+    match_seconds = time.perf_counter() - start
+    filled = matched['filled_date'].notna()
+    # Every still-open role must be counted when none of them is filled yet
+    still_open = requisitions[requisitions['filled_date'].isna()]
+    all_open = vacancy_counts(still_open)['open_vacancies'].iloc[-1] == len(still_open)
+
+    print(f"{'employees':>12} {'requisitions':>13} {'vacancies s':>12} {'fill s':>8} {'match s':>8} {'matched':>8} "
+          f"{'all open':>9}")
+    print(f"{n_employees:>12,} {len(requisitions):>13,} {vacancies:>12.4f} {fill_times:>8.4f} {match_seconds:>8.3f} "
+          f"{matched.loc[filled, 'employee_id'].notna().mean():>8.1%} {str(all_open):>9}")
+
+def benchmark_charts(n_employees=20_000, worker_counts=(1, 2, 4, 8, 16)):
+    """Time dashboard chart rendering by worker count and check the images match"""
+    df = generate_sample_data(n_employees)
+    cube = build_staffing_cube(df)
+    tasks = visualization_tasks(df) + staffing_chart_tasks(cube)
+    tasks += optimal_hiring_time(process_monthly_staffing(df.copy()))[2]
+    
+    print(f"{'workers':>8} {'charts':>7} {'seconds':>10} {'identical':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = None
+        for workers in worker_counts:
+            images_dir = Path(tmp) / str(workers)
+            images_dir.mkdir()
+            start = time.perf_counter()
+            render_charts(tasks, images_dir, workers)
+            seconds = time.perf_counter() - start
+            images = {task['file']: (images_dir / task['file']).read_bytes() for task in tasks}
+            reference = reference or images
+            print(f"{workers:>8} {len(tasks):>7} {seconds:>10.3f} {str(images == reference):>10}")
+
+def benchmark_chart_scaling(sizes=(10_000, 1_000_000, 2_000_000)):
+    """Show that chart render time stays flat as the number of employees grows"""
+    print(f"{'employees':>12} {'aggregate s':>12} {'render s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_employees in sizes:
+            df = generate_sample_data(n_employees)
+            start = time.perf_counter()
+            tasks = visualization_tasks(df)
+            aggregate = time.perf_counter() - start
+            start = time.perf_counter()
+            render_charts(tasks, tmp, workers=1)
+            print(f"{n_employees:>12,} {aggregate:>12.3f} {time.perf_counter() - start:>10.3f}")
+
+def benchmark_chart_cache(n_employees=20_000, workers=1):
+    """Time a cold render, an unchanged refresh and a refresh with one changed chart"""
+    df = generate_sample_data(n_employees)
+    
+    def chart_tasks(data):
+        tasks = visualization_tasks(data) + staffing_chart_tasks(build_staffing_cube(data))
+        return tasks + optimal_hiring_time(process_monthly_staffing(data.copy()))[2]
+    
+    changed = df.copy()
+    changed.loc[0, 'salary'] += 1000
+    runs = [('cold cache', chart_tasks(df)), ('unchanged data', chart_tasks(df)), ('one salary edited', chart_tasks(changed))]
+    
+    print(f"{'run':>18} {'charts':>7} {'rendered':>9} {'seconds':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        images_dir = Path(tmp) / 'images'
+        images_dir.mkdir()
+        for name, tasks in runs:
+            start = time.perf_counter()
+            rendered = render_charts(tasks, images_dir, workers, cache_dir=Path(tmp) / 'chart_cache')
+            seconds = time.perf_counter() - start
+            print(f"{name:>18} {len(tasks):>7} {len(rendered):>9} {seconds:>10.3f}")
+
+def benchmark_report_images(n_employees=20_000, workers=1):
+    """Compare the bytes of the 300 dpi charts with the responsive copies browsers download"""
+    df = generate_sample_data(n_employees)
+    tasks = visualization_tasks(df) + staffing_chart_tasks(build_staffing_cube(df))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        images_dir = Path(tmp)
+        render_charts(tasks, images_dir, workers)
+        names = [Path(task['file']).stem for task in tasks]
+        full_size = sum((images_dir / task['file']).stat().st_size for task in tasks)
+        print(f"{'format':>7} {'width':>6} {'KB':>8} {'of 300 dpi':>11} {'build s':>8}")
+        print(f"{'png':>7} {'full':>6} {full_size / 1024:>8.0f} {1:>11.1%}")
+        for variant_format in RESPONSIVE_FORMATS:
+            start = time.perf_counter()
+            charts = build_chart_variants(names, images_dir, variant_format=variant_format, workers=workers)
+            seconds = time.perf_counter() - start
+            for i, width in enumerate(RESPONSIVE_WIDTHS):
+                size = sum((images_dir / chart['variants'][i][0]).stat().st_size for chart in charts.values())
+                print(f"{variant_format:>7} {width:>6} {size / 1024:>8.0f} {size / full_size:>11.1%} {seconds:>8.3f}")
+
+def benchmark_report_html(sizes=(1_000, 10_000, 100_000)):
+    """Time the department table row by row and from column arrays, streamed to a file"""
+    rng = np.random.default_rng(42)
+    print(f"{'departments':>12} {'row by row s':>13} {'columns s':>10} {'streamed s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_departments in sizes:
+            dept_metrics = pd.DataFrame({
+                'department': [f"Cost Center {i:06d}" for i in range(n_departments)],
+                'employee_count': rng.integers(1, 500, n_departments),
+                'attrition_rate': rng.uniform(0, 30, n_departments),
+                'avg_salary': rng.normal(70_000, 15_000, n_departments),
+            })
+            formatted = pd.DataFrame({
+                'department': dept_metrics['department'],
+                'Employee Count': dept_metrics['employee_count'],
+                'Attrition Rate': [f"{rate:.1f}%" for rate in dept_metrics['attrition_rate']],
+                'Avg. Salary': [f"${salary:,.0f}" for salary in dept_metrics['avg_salary']],
+            })
+            legacy = time_call(legacy_department_table, formatted, repeat=1)
+            columns = time_call(department_metrics_table, dept_metrics)
+            streamed = time_call(lambda: write_report(Path(tmp) / 'report.html',
+                                                      (department_metrics_table(dept_metrics),)))
+            print(f"{n_departments:>12,} {legacy:>13.3f} {columns:>10.3f} {streamed:>11.3f}")
+
+def benchmark_metrics(n_employees=1_000_000, n_departments=10_000):
+    """Time department metrics formatted inside groupby against numeric aggregation"""
+    df = generate_sample_data(n_employees)
+    codes = np.random.default_rng(7).integers(0, n_departments, n_employees)
+    df['department'] = pd.Categorical.from_codes(codes, [f"Cost Center {i:05d}" for i in range(n_departments)])
+    
+    legacy = time_call(lambda: legacy_department_metrics(df), repeat=1)
+    numeric = time_call(lambda: calculate_metrics(df))
+    rendered = time_call(lambda: department_metrics_table(calculate_metrics(df)[1]))
+    
+    # The rendered table shows the same text as the lambda-formatted frame
+    reference = legacy_department_metrics(df)
+    dept_metrics = calculate_metrics(df)[1]
+    identical = all(table_column(dept_metrics[name], fmt) == reference[heading].astype(str).tolist()
+                    for name, heading, fmt in DEPARTMENT_COLUMNS if name in dept_metrics.columns)
+    
+    print(f"{'employees':>12} {'departments':>12} {'lambdas s':>10} {'numeric s':>10} {'+ table s':>10} "
+          f"{'speedup':>8} {'identical':>10}")
+    print(f"{n_employees:>12,} {n_departments:>12,} {legacy:>10.3f} {numeric:>10.3f} {rendered:>10.3f} "
+          f"{legacy / numeric:>7.0f}x {str(identical):>10}")
+
+def benchmark_batch(n_tenants=40, n_filters=5, n_employees=3000):
+    """Time a batch of branded tenant dashboards against one single dashboard"""
+    df = generate_sample_data(n_employees)
+    departments = sorted(df['department'].unique())[:n_filters]
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        df.to_csv(tmp / 'hr.csv', index=False)
+        tenants = []
+        for i in range(n_tenants):
+            with open(tmp / f'brand{i}.json', 'w') as f:
+                json.dump({'company_name': f'Tenant {i}', 'dashboard_title': f'Tenant {i} HR Dashboard'}, f)
+            tenants.append({'name': f'Tenant {i}', 'filter': {'department': departments[i % len(departments)]},
+                            'config': f'brand{i}.json', 'output_dir': f'tenants/{i}'})
+        with open(tmp / 'manifest.json', 'w') as f:
+            json.dump({'tenants': tenants}, f)
+        
+        single = time_call(lambda: generate_dashboard(str(tmp / 'hr.csv'), str(tmp / 'brand0.json'), False,
+                                                      output_dir=tmp / 'single'), repeat=1)
+        batch = time_call(lambda: generate_batch(tmp / 'manifest.json', str(tmp / 'hr.csv'), output_dir=tmp / 'batch'),
+                          repeat=1)
+    
+    print(f"{'tenants':>8} {'filters':>8} {'single s':>9} {'batch s':>8} {'x single':>9}")
+    print(f"{n_tenants:>8} {len(departments):>8} {single:>9.2f} {batch:>8.2f} {batch / single:>9.1f}")
+
+def benchmark_department_pages(department_counts=(10, 40), employees_per_department=200):
+    """Time drill-down pages for many departments, reporting seconds per department"""
+    print(f"{'departments':>12} {'workers':>8} {'seconds':>8} {'s/dept':>7} {'charts':>7}")
+    for n_departments in department_counts:
+        df = generate_sample_data(n_departments * employees_per_department)
+        df['department'] = df['department'].astype(str) + ' ' + (df.index % max(1, n_departments // df['department'].nunique())).astype(str)
+        with tempfile.TemporaryDirectory() as tmp:
+            cube = build_staffing_cube(df)
+            elapsed = time_call(lambda: generate_department_pages(df, cube, load_branding_config(), output_dir=tmp),
+                                repeat=1)
+            charts = len(list((Path(tmp) / 'departments').glob('*/images/*[!w].png')))
+        departments = df['department'].nunique()
+        print(f"{departments:>12} {os.cpu_count():>8} {elapsed:>8.1f} {elapsed / departments:>7.2f} {charts:>7}")
+
+def benchmark_in_memory(n_employees=3000):
+    """Time a dashboard built in memory against one written to disk"""
+    df = generate_sample_data(n_employees)
+    print(f"{'build':>18} {'seconds':>8} {'page KB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'hr.csv'
+        df.to_csv(data_file, index=False)
+        elapsed = time_call(lambda: generate_dashboard(str(data_file), open_browser=False, chart_cache=False,
+                                                       output_dir=Path(tmp) / 'out'), repeat=1)
+        page_kb = (Path(tmp) / 'out' / 'hr_dashboard.html').stat().st_size / 1024
+        print(f"{'written to disk':>18} {elapsed:>8.2f} {page_kb:>8.0f}")
+    
+    for label, inline_images in [('in memory', False), ('in memory, inline', True)]:
+        result = {}
+        elapsed = time_call(lambda: result.update(build_dashboard(df, inline_images=inline_images)), repeat=1)
+        print(f"{label:>18} {elapsed:>8.2f} {len(result['html']) / 1024:>8.0f}")
+
+def _load_in_fresh_process(file_path, typed, cache_dir=None):
+    """Load a CSV file, returning seconds, peak process memory and data size"""
+    start = time.perf_counter()
+    df = load_data(file_path, cache_dir=cache_dir) if typed else pd.read_csv(file_path)
+    seconds = time.perf_counter() - start
+    return seconds, peak_memory_mb(), df.memory_usage(deep=True).sum() / 1024 ** 2
+
+def benchmark_load(sizes=(1_000_000, 4_000_000)):
+    """Compare a bare read_csv with the schema-typed chunked loader, and with
+    its data cache on the first (convert) and a later (cached) load
+    
+    Each load runs in a fresh process so its peak memory is its own.
+    """
+    print(f"{'employees':>12} {'file MB':>8} {'loader':>8} {'seconds':>8} {'data MB':>8} {'peak MB':>8}")
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_employees in sizes:
+            data_file = Path(tmp) / 'hr.csv'
+            write_sample_data(data_file, n_employees)
+            file_mb = data_file.stat().st_size / 1024 ** 2
+            cache_dir = Path(tmp) / f'data_cache_{n_employees}'
+            for label, typed, cache in [('read_csv', False, None), ('typed', True, None),
+                                        ('convert', True, cache_dir), ('cached', True, cache_dir)]:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    seconds, peak, data_mb = pool.submit(_load_in_fresh_process, str(data_file), typed,
+                                                         cache).result()
+                print(f"{n_employees:>12,} {file_mb:>8.0f} {label:>8} {seconds:>8.2f} {data_mb:>8.0f} "
+                      f"{peak if peak is not None else float('nan'):>8.0f}")
+
+def _read_excel_in_fresh_process(file_path, engine):
+    """Read an Excel file, returning seconds, peak process memory and data size"""
+    start = time.perf_counter()
+    if engine == 'read_excel':
+        df = pd.read_excel(file_path)
+    else:
+        if engine == 'openpyxl':
+            # Stream with openpyxl even when python-calamine is installed
+            hr_analytics_real_data.python_calamine = None
+        df = hr_analytics_real_data.read_excel_typed(file_path)
+    seconds = time.perf_counter() - start
+    return seconds, peak_memory_mb(), df.memory_usage(deep=True).sum() / 1024 ** 2
+
+def benchmark_excel_load(sizes=(50_000, 200_000)):
+    """Compare pandas read_excel with the streaming, schema-typed Excel reader
+    on openpyxl and, when installed, python-calamine
+    
+    Each read runs in a fresh process so its peak memory is its own.
+    """
+    engines = ['read_excel', 'openpyxl']
+    if hr_analytics_real_data.python_calamine is not None:
+        engines.append('calamine')
+    print(f"{'employees':>12} {'file MB':>8} {'reader':>10} {'seconds':>8} {'data MB':>8} {'peak MB':>8}")
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_employees in sizes:
+            data_file = Path(tmp) / 'hr.xlsx'
+            write_sample_data(Path(tmp) / 'hr.csv', n_employees)
+            pd.read_csv(Path(tmp) / 'hr.csv').to_excel(data_file, sheet_name='Employees', index=False)
+            file_mb = data_file.stat().st_size / 1024 ** 2
+            for engine in engines:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    seconds, peak, data_mb = pool.submit(_read_excel_in_fresh_process, str(data_file),
+                                                         engine).result()
+                print(f"{n_employees:>12,} {file_mb:>8.1f} {engine:>10} {seconds:>8.2f} {data_mb:>8.0f} "
+                      f"{peak if peak is not None else float('nan'):>8.0f}")
+
+BENCHMARKS = {
+    'staffing': benchmark_monthly_staffing,
+    'headcount_index': benchmark_headcount_index,
+    'retention': benchmark_retention,
+    'forecasting': benchmark_forecasting,
+    'mobility': benchmark_mobility,
+    'requisitions': benchmark_requisitions,
+    'charts': benchmark_charts,
+    'chart_cache': benchmark_chart_cache,
+    'chart_scaling': benchmark_chart_scaling,
+    'report_images': benchmark_report_images,
+    'report_html': benchmark_report_html,
+    'metrics': benchmark_metrics,
+    'batch': benchmark_batch,
+    'department_pages': benchmark_department_pages,
+    'in_memory': benchmark_in_memory,
+    'load': benchmark_load,
+    'excel_load': benchmark_excel_load,
+}
+
+def main():
+    """Run the selected performance benchmarks"""
+    parser = argparse.ArgumentParser(description='HR Analytics performance benchmarks')
+    parser.add_argument('benchmarks', nargs='*',
+                        help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args()
+    
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    for name in args.benchmarks or BENCHMARKS:
+        logger.info(f"Running {name} benchmark...")
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import re
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -9,11 +10,26 @@ from pathlib import Path
 import json
 import datetime
 import time
+import hashlib
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 import schedule
-from hr_html_generator import calculate_metrics, load_branding_config, generate_css
-from hr_visualizations import create_visualizations
-from hr_analytics_real_data import load_data
-from hr_staffing_tracker import process_monthly_staffing, create_staffing_visualizations, analyze_optimal_hiring_time, create_monthly_staffing_table
+from hr_html_generator import METRIC_FORMATS, calculate_metrics, format_metrics, load_branding_config, generate_css, stylesheet_name
+from hr_html_generator import write_stylesheet
+from hr_visualizations import CHART_FORMATS, visualization_tasks, render_charts, render_chart_bytes
+from hr_visualizations import inline_svg_charts, embed_svg_charts
+from hr_report_assets import REPORT_BYTE_BUDGET, build_chart_variants, chart_variant_bytes, responsive_chart_images
+from hr_report_assets import inline_chart_images, within_byte_budget
+from hr_report_templates import PAGE_START, PAGE_END, STYLE, STYLESHEET_LINK, metric_cards, chart, charts_row, section
+from hr_report_templates import table_block, footer, department_metrics_table, html_table, table_column, write_report
+from hr_analytics_real_data import EMPLOYEE_SCHEMA, load_data, remove_unused_categories
+from hr_metrics import compute_metrics
+from hr_staffing_tracker import rollup_staffing_cube, staffing_chart_tasks, optimal_hiring_time, create_monthly_staffing_table
+from hr_staffing_tracker import STAFFING_DIMENSIONS, build_staffing_cube, slice_staffing_cube
+from hr_staffing_tracker import load_movement_history, department_transitions, mobility_chart_tasks
+from hr_retention import retention_chart_tasks, create_retention_table
+from hr_requisitions import (load_requisitions, match_requisitions_to_hires, recommend_hiring_months,
+                             requisition_chart_tasks, create_time_to_fill_table)
 
 # Set up logging
 logging.basicConfig(
@@ -23,319 +39,607 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create output directory for HTML and images
-output_dir = Path("hr_analytics_output")
-output_dir.mkdir(exist_ok=True)
-images_dir = output_dir / "images"
-images_dir.mkdir(exist_ok=True)
+# Default folder of the dashboard, its images and stored state; it is only
+# created once a dashboard is written there
+OUTPUT_DIR = Path("hr_analytics_output")
 
-def generate_html_report(metrics, dept_metrics, branding_config, monthly_staffing_table=None, best_hiring_months=None, worst_hiring_months=None):
-    """Generate an HTML report with the metrics and visualizations"""
-    logger.info("Generating HTML dashboard...")
+def report_sections(metrics, dept_metrics, branding_config, monthly_staffing_table=None, best_hiring_months=None,
+                    worst_hiring_months=None, retention_table=None, time_to_fill_table=None, median_days_to_fill=None,
+                    unmatched_requisitions=None, has_chart=lambda name: True, stylesheet=None, department_index=None):
+    """HTML of the dashboard page, one section at a time
     
-    css_styles = generate_css(branding_config)
-    last_updated = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    Takes the report data of generate_html_report.
     
-    # Start building HTML content
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{branding_config['dashboard_title']}</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <style>
-            {css_styles}
-        </style>
-    </head>
-    <body>
-        <div class="header-container">
-            {"<img class='logo' src='" + branding_config['logo_url'] + "' alt='Company Logo'>" if branding_config['logo_url'] else ""}
-            <h1>{branding_config['dashboard_title']}</h1>
-        </div>
-        
-        <p class="last-updated">Last updated: {last_updated}</p>
-        
-        <div class="metrics-row">
-            <div class="metric-card">
-                <div class="metric-value">{metrics['total_employees']}</div>
-                <div class="metric-label">Total Employees</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{metrics['attrition_rate']}</div>
-                <div class="metric-label">Attrition Rate</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{metrics['avg_salary']}</div>
-                <div class="metric-label">Avg. Salary</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{metrics['avg_satisfaction']}</div>
-                <div class="metric-label">Satisfaction</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{metrics['avg_tenure']}</div>
-                <div class="metric-label">Avg. Tenure</div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Employee Distribution</h2>
-            <div class="charts-row">
-                <div class="chart-container">
-                    <h3>Attrition Distribution</h3>
-                    <img class="chart-img" src="images/attrition_pie.png" alt="Attrition Distribution">
-                </div>
-                <div class="chart-container">
-                    <h3>Department Distribution</h3>
-                    <img class="chart-img" src="images/department_distribution.png" alt="Department Distribution">
-                </div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Employee Demographics</h2>
-            <div class="charts-row">
-                <div class="chart-container">
-                    <h3>Salary Distribution</h3>
-                    <img class="chart-img" src="images/salary_histogram.png" alt="Salary Distribution">
-                </div>
-                <div class="chart-container">
-                    <h3>Age Distribution</h3>
-                    <img class="chart-img" src="images/age_histogram.png" alt="Age Distribution">
-                </div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Employee Satisfaction & Retention</h2>
-            <div class="charts-row">
-                <div class="chart-container">
-                    <h3>Tenure vs Job Satisfaction</h3>
-                    <img class="chart-img" src="images/tenure_vs_satisfaction.png" alt="Tenure vs Satisfaction">
-                    <p><small>Blue dots represent active employees; red dots represent those who left the company.</small></p>
-                </div>
-                <div class="chart-container">
-                    <h3>Attrition by Department</h3>
-                    <img class="chart-img" src="images/attrition_by_dept.png" alt="Attrition by Department">
-                </div>
-            </div>
-        </div>
+    Args:
+        has_chart (callable): Tells whether an optional chart was rendered
+        stylesheet (str): Link to the branding stylesheet, None to inline it
+        department_index (str): Link to the index of department drill-down pages
         
-        <div class="section">
-            <h2>Employee Tenure</h2>
-            <div class="charts-row">
-                <div class="chart-container" style="width: 100%;">
-                    <h3>Years of Service Distribution</h3>
-                    <img class="chart-img" src="images/tenure_distribution.png" alt="Tenure Distribution">
-                </div>
-            </div>
-        </div>
+    Yields:
+        str: Page sections in order, from the page head to the footer
     """
+    metrics = format_metrics(metrics)
+    title = branding_config['dashboard_title']
+    logo = f"<img class='logo' src='{branding_config['logo_url']}' alt='Company Logo'>" if branding_config['logo_url'] else ""
+    last_updated = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    styles = STYLESHEET_LINK.format(href=stylesheet) if stylesheet else STYLE.format(css=generate_css(branding_config))
+    yield PAGE_START.format(title=title, styles=styles)
+    yield f"""    <div class="header-container">
+        {logo}
+        <h1>{title}</h1>
+    </div>
+    
+    <p class="last-updated">Last updated: {last_updated}</p>
+"""
+    yield metric_cards([
+        (metrics['total_employees'], 'Total Employees'),
+        (metrics['attrition_rate'], 'Attrition Rate'),
+        (metrics['avg_salary'], 'Avg. Salary'),
+        (metrics['avg_satisfaction'], 'Satisfaction'),
+        (metrics['avg_tenure'], 'Avg. Tenure'),
+    ])
+    
+    yield section("Employee Distribution", charts_row(
+        chart("attrition_pie", "Attrition Distribution"),
+        chart("department_distribution", "Department Distribution") if has_chart("department_distribution") else ""))
+    yield section("Employee Demographics", charts_row(
+        chart("salary_histogram", "Salary Distribution"),
+        chart("age_histogram", "Age Distribution")))
+    yield section("Employee Satisfaction & Retention", charts_row(
+        chart("tenure_vs_satisfaction", "Tenure vs Job Satisfaction", alt="Tenure vs Satisfaction",
+              note="Blue dots represent active employees; red dots represent those who left the company."),
+        chart("attrition_by_dept", "Attrition by Department") if has_chart("attrition_by_dept") else ""))
+    yield section("Employee Tenure", charts_row(
+        chart("tenure_distribution", "Years of Service Distribution", alt="Tenure Distribution", full_width=True)))
     
     # Add satisfaction correlation heatmap if available
-    if os.path.exists(images_dir / "satisfaction_correlation.png"):
-        html += """
-        <div class="section">
-            <h2>Satisfaction Metrics Correlation</h2>
-            <div class="charts-row">
-                <div class="chart-container" style="width: 100%;">
-                    <h3>Correlation Between Satisfaction Metrics</h3>
-                    <img class="chart-img" src="images/satisfaction_correlation.png" alt="Satisfaction Correlation">
-                </div>
-            </div>
-        </div>
-        """
+    if has_chart("satisfaction_correlation"):
+        yield section("Satisfaction Metrics Correlation", charts_row(
+            chart("satisfaction_correlation", "Correlation Between Satisfaction Metrics",
+                  alt="Satisfaction Correlation", full_width=True)))
     
     # Department-wise metrics table
-    html += """
-        <div class="section">
-            <h2>Department-wise Metrics</h2>
-            <table>
-                <tr>
-                    <th>Department</th>
-                    <th>Employee Count</th>
-                    <th>Attrition Rate</th>
-                    <th>Avg. Salary</th>
-    """
-    
-    # Add satisfaction column header if available
-    if 'Avg. Satisfaction' in dept_metrics.columns:
-        html += """
-                    <th>Avg. Satisfaction</th>
-        """
-    
-    html += """
-                </tr>
-    """
-    
-    # Add table rows
-    for _, row in dept_metrics.iterrows():
-        html += f"""
-                <tr>
-                    <td>{row['department']}</td>
-                    <td>{row['Employee Count']}</td>
-                    <td>{row['Attrition Rate']}</td>
-                    <td>{row['Avg. Salary']}</td>
-        """
-        
-        # Add satisfaction value if available
-        if 'Avg. Satisfaction' in dept_metrics.columns:
-            html += f"""
-                    <td>{row['Avg. Satisfaction']}</td>
-            """
-        
-        html += """
-                </tr>
-        """
+    yield section("Department-wise Metrics", department_metrics_table(dept_metrics),
+                  description=f'Each department has its own dashboard, listed in the <a href="{department_index}">department index</a>.'
+                  if department_index else None)
     
     # Add manpower planning section if monthly data is available
     if monthly_staffing_table:
-        html += """
-        <div class="section manpower-planning">
-            <h2>Manpower Planning & Staffing Trends</h2>
-            <p class="section-description">This section helps HR teams track staffing levels over time and plan for future hiring needs based on attrition patterns.</p>
-            
-            <div class="charts-row">
-                <div class="chart-container">
-                    <h3>Monthly Headcount Trend</h3>
-                    <img class="chart-img" src="images/monthly_headcount.png" alt="Monthly Headcount Trend">
-                </div>
-                <div class="chart-container">
-                    <h3>Monthly Staff Movement</h3>
-                    <img class="chart-img" src="images/monthly_movement.png" alt="Monthly Staff Movement">
-                </div>
-            </div>
-            
-            <div class="charts-row">
-                <div class="chart-container">
-                    <h3>Monthly Attrition Rate</h3>
-                    <img class="chart-img" src="images/monthly_attrition_rate.png" alt="Monthly Attrition Rate">
-                    <p><small>Red dotted line represents the 5% attrition threshold where action may be required.</small></p>
-                </div>
-        """
-        
-        # Add staffing forecast chart if available
-        if os.path.exists(images_dir / "staffing_forecast.png"):
-            html += """
-                <div class="chart-container">
-                    <h3>Staffing Forecast (Next 6 Months)</h3>
-                    <img class="chart-img" src="images/staffing_forecast.png" alt="Staffing Forecast">
-                </div>
-            """
-        
-        html += """
-            </div>
-            
-            <h3>Monthly Staffing Data</h3>
-            <div class="table-responsive">
-                %s
-            </div>
-        """ % monthly_staffing_table
-        
-        # Add seasonal hiring pattern if available
-        if os.path.exists(images_dir / "seasonal_hiring_pattern.png"):
-            html += """
-            <div class="charts-row">
-                <div class="chart-container" style="width: 100%;">
-                    <h3>Seasonal Hiring and Attrition Patterns</h3>
-                    <img class="chart-img" src="images/seasonal_hiring_pattern.png" alt="Seasonal Hiring Pattern">
-                </div>
-            </div>
-            """
+        # Add trailing-12-month attrition cards if available
+        ttm_cards = None
+        if 'ttm_attrition' in metrics:
+            ttm_cards = metric_cards([
+                (metrics['ttm_attrition'], 'TTM Attrition'),
+                (metrics['annualized_attrition'], 'Annualized Attrition (YTD)'),
+                (metrics['avg_headcount_12m'], 'Avg. Headcount (12M)'),
+                (metrics.get('avg_monthly_attrition', 'N/A'), 'Avg. Monthly Attrition'),
+                (metrics.get('current_month_headcount', 'N/A'), 'Current Headcount'),
+            ])
         
         # Add hiring recommendations if available
+        recommendations = None
         if best_hiring_months and worst_hiring_months:
-            html += """
-            <div class="hiring-recommendations">
-                <h3>Hiring Planning Recommendations</h3>
-                <div class="recommendation-boxes">
-                    <div class="recommendation-box good">
-                        <h4>Best Months to Start Hiring</h4>
-                        <p>%s</p>
-                        <p><small>Based on historical patterns of low attrition and high joining rates</small></p>
-                    </div>
-                    <div class="recommendation-box bad">
-                        <h4>Months to Avoid Hiring</h4>
-                        <p>%s</p>
-                        <p><small>These months historically have high attrition or low joining success</small></p>
-                    </div>
+            time_to_fill_note = ""
+            if median_days_to_fill is not None and unmatched_requisitions is not None:
+                time_to_fill_note = f"""
+            <p><small>Ranked by the median time from opening a requisition in each month to the start date of the hire that filled it; matched hires start {median_days_to_fill:.0f} days after the opening overall. {unmatched_requisitions:,} filled requisitions had no matching hire.</small></p>"""
+            elif median_days_to_fill is not None:
+                time_to_fill_note = f"""
+            <p><small>Ranked by the median time to fill requisitions opened in each month; requisitions take {median_days_to_fill:.0f} days to fill overall.</small></p>"""
+            recommendations = f"""        <div class="hiring-recommendations">
+            <h3>Hiring Planning Recommendations</h3>
+            <div class="recommendation-boxes">
+                <div class="recommendation-box good">
+                    <h4>Best Months to Start Hiring</h4>
+                    <p>{', '.join(best_hiring_months)}</p>
+                    <p><small>Based on historical patterns of low attrition and high joining rates</small></p>
                 </div>
-            </div>
-            """ % (', '.join(best_hiring_months), ', '.join(worst_hiring_months))
-        
-        html += """
+                <div class="recommendation-box bad">
+                    <h4>Months to Avoid Hiring</h4>
+                    <p>{', '.join(worst_hiring_months)}</p>
+                    <p><small>These months historically have high attrition or low joining success</small></p>
+                </div>
+            </div>{time_to_fill_note}
         </div>
-        """
-
+"""
+        
+        yield section(
+            "Manpower Planning & Staffing Trends",
+            ttm_cards,
+            charts_row(
+                chart("monthly_headcount", "Monthly Headcount Trend"),
+                chart("monthly_movement", "Monthly Staff Movement")),
+            charts_row(
+                chart("monthly_attrition_rate", "Monthly Attrition Rate",
+                      note="Red dotted line represents the 5% attrition threshold where action may be required."),
+                chart("staffing_forecast", "Staffing Forecast (Next 6 Months)", alt="Staffing Forecast")
+                if has_chart("staffing_forecast") else ""),
+            charts_row(
+                chart("department_forecast", "Department Headcount Forecast", full_width=True,
+                      note="Dashed lines show the forecast; shaded bands are 95% intervals."))
+            if has_chart("department_forecast") else None,
+            table_block("Monthly Staffing Data", monthly_staffing_table),
+            charts_row(
+                chart("seasonal_hiring_pattern", "Seasonal Hiring and Attrition Patterns",
+                      alt="Seasonal Hiring Pattern", full_width=True))
+            if has_chart("seasonal_hiring_pattern") else None,
+            recommendations,
+            css_class="manpower-planning",
+            description="This section helps HR teams track staffing levels over time and plan for future hiring needs based on attrition patterns.")
+    
+    # Add internal mobility section if the transition charts were created
+    if has_chart("department_transitions"):
+        yield section(
+            "Internal Mobility & Headcount Projection",
+            charts_row(
+                chart("department_transitions", "Department Transition Probabilities", alt="Department Transitions"),
+                chart("department_projection", "Projected Headcount by Department", alt="Department Projection",
+                      note="Projection assumes the last 12 months of transfer, exit and hiring rates continue.")),
+            css_class="mobility",
+            description="Monthly movement between departments and out of the company, and the headcount these rates lead to if they continue.")
+    
+    # Add hiring pipeline section if the requisition charts were created
+    if has_chart("open_vacancies"):
+        yield section(
+            "Hiring Pipeline",
+            charts_row(
+                chart("open_vacancies", "Open Vacancies by Month", alt="Open Vacancies"),
+                chart("time_to_fill", "Time to Fill by Department", alt="Time to Fill")),
+            table_block("Time to Fill", time_to_fill_table) if time_to_fill_table else None,
+            css_class="pipeline",
+            description="Open requisitions over time and how long roles take to fill"
+                        + (", matched to the hires that filled them." if unmatched_requisitions is not None else "."))
+    
+    # Add retention section if the survival charts were created
+    if has_chart("retention_curves"):
+        yield section(
+            "Retention & Survival",
+            charts_row(
+                chart("retention_curves", "Retention by Months Since Hire", alt="Retention Curves",
+                      note="Kaplan-Meier estimate; current employees count until the latest month."),
+                chart("cohort_retention", "Retention by Hire Cohort", alt="Cohort Retention")
+                if has_chart("cohort_retention") else ""),
+            table_block("Retention Milestones", retention_table) if retention_table else None,
+            css_class="retention",
+            description="How long employees stay after they are hired, by department and by hire cohort.")
+    
     # Close the page and add footer
-    html += f"""
-        <div class="footer">
-            <p>&copy; {datetime.datetime.now().year} {branding_config['company_name']} - HR Analytics Dashboard</p>
-            <p>Generated on {datetime.datetime.now().strftime("%Y-%m-%d at %H:%M")}</p>
-        </div>
-    </body>
-    </html>
+    now = datetime.datetime.now()
+    yield footer(f"&copy; {now.year} {branding_config['company_name']} - HR Analytics Dashboard",
+                 f"Generated on {now.strftime('%Y-%m-%d at %H:%M')}")
+    yield PAGE_END
+
+def generate_html_report(metrics, dept_metrics, branding_config, monthly_staffing_table=None, best_hiring_months=None, worst_hiring_months=None, retention_table=None, time_to_fill_table=None, median_days_to_fill=None,
+                         unmatched_requisitions=None, chart_format='png', byte_budget=REPORT_BYTE_BUDGET, chart_images=None, inline_css=False,
+                         report_dir=None, assets_dir=None):
+    """Generate an HTML report with the metrics and visualizations
+    
+    The page is streamed into the file section by section.
+    With chart_format 'svg' the charts are embedded in the page as inline SVG,
+    so the report is a single small file; otherwise it links the PNG images,
+    or the downscaled copies in chart_images from build_chart_variants that
+    the browser picks from by screen size.
+    The branding stylesheet is linked as a shared file named after its content
+    hash, saved in assets_dir (by default the assets folder of report_dir),
+    or inlined with inline_css and for the single-file SVG report.
+    The report is not written, and ValueError is raised, when the page, its
+    stylesheet and images add up to more than byte_budget bytes.
+    The report goes to report_dir, by default the dashboard output directory,
+    with its charts in the images folder there; it links the department
+    drill-down index from generate_department_pages when there is one.
     """
+    logger.info("Generating HTML dashboard...")
+    report_dir = Path(report_dir or OUTPUT_DIR)
+    report_images = report_dir / "images"
     
-    # Write HTML to file
-    html_file = output_dir / "hr_dashboard.html"
-    with open(html_file, "w") as f:
-        f.write(html)
+    def has_chart(name):
+        return (report_images / f"{name}.{chart_format}").exists()
     
-    return html_file
-
-def generate_dashboard(data_file=None, config_file=None, open_browser=True):
-    """Generate the complete HR Analytics Dashboard with manpower planning"""
-    start_time = time.time()
-    logger.info("Starting HR Analytics Dashboard generation...")
+    stylesheet = None
+    if not inline_css and chart_format != 'svg':
+        stylesheet = _stylesheet_href(branding_config, Path(assets_dir or report_dir / 'assets'), report_dir)
     
-    # Load data
-    df = load_data(data_file)
+    department_index = None
+    if (report_dir / "departments" / "index.html").exists():
+        department_index = "departments/index.html"
     
-    # Save the data to CSV if it's generated sample data
-    if data_file is None or not os.path.exists(data_file):
-        df.to_csv(output_dir / "hr_data.csv", index=False)
-        logger.info(f"Sample HR data saved to {output_dir / 'hr_data.csv'}")
+    sections = report_sections(metrics, dept_metrics, branding_config, monthly_staffing_table, best_hiring_months,
+                               worst_hiring_months, retention_table, time_to_fill_table, median_days_to_fill,
+                               unmatched_requisitions, has_chart, stylesheet, department_index)
+    if chart_format == 'svg':
+        sections = (inline_svg_charts(html, report_images) for html in sections)
+    elif chart_images:
+        sections = (responsive_chart_images(html, chart_images) for html in sections)
     
-    # Process monthly staffing data for manpower planning
-    monthly_df = process_monthly_staffing(df)
+    return write_report(report_dir / "hr_dashboard.html", within_byte_budget(sections, report_dir, byte_budget))
+
+def build_report_content(df, staffing_cube, movements=None, requisitions=None):
+    """Compute everything in a dashboard that does not depend on branding
     
-    # Create standard visualizations
-    create_visualizations(df, images_dir)
+    Args:
+        df (pd.DataFrame): HR data
+        staffing_cube (dict): Staffing cube of df
+        movements (pd.DataFrame): Optional department transfer history
+        requisitions (pd.DataFrame): Optional job requisition history
+        
+    Returns:
+        tuple: (chart tasks for render_charts, keyword arguments of
+        generate_html_report other than the branding and output options)
+    """
+    monthly_df = rollup_staffing_cube(staffing_cube)
     
-    # Create staffing trend visualizations
-    create_staffing_visualizations(monthly_df, images_dir)
+    # Standard and staffing trend charts; forecasts cover the total and
+    # every department from the cube
+    chart_tasks = visualization_tasks(df) + staffing_chart_tasks(staffing_cube)
     
     # Analyze optimal hiring timing if enough data
     best_hiring_months = None
     worst_hiring_months = None
     if monthly_df is not None and len(monthly_df) >= 12:
-        best_hiring_months, worst_hiring_months = analyze_optimal_hiring_time(monthly_df, images_dir)
+        best_hiring_months, worst_hiring_months, hiring_tasks = optimal_hiring_time(monthly_df)
+        chart_tasks += hiring_tasks
+    
+    # Internal mobility and projected headcount if a transfer history is given
+    if movements is not None:
+        transitions = department_transitions(df, movements)
+        mobility = mobility_chart_tasks(transitions)
+        if mobility is not None:
+            chart_tasks += mobility[1]
+    
+    # Vacancies and time to fill if a requisition history is given; with
+    # employee ids and hire dates each filled requisition is linked to the
+    # hire that filled it, and hiring months are ranked by how soon those
+    # hires started, otherwise by how quickly roles were filled
+    time_to_fill_table = None
+    median_days_to_fill = None
+    unmatched_requisitions = None
+    if requisitions is not None:
+        if len(requisitions) > 0 and {'employee_id', 'hire_date'}.issubset(df.columns):
+            requisitions = match_requisitions_to_hires(requisitions, df)
+            unmatched_requisitions = int((requisitions['filled_date'].notna() & requisitions['employee_id'].isna()).sum())
+        pipeline = requisition_chart_tasks(requisitions)
+        if pipeline is not None:
+            time_to_fill_summary, requisition_tasks = pipeline
+            time_to_fill_table = create_time_to_fill_table(time_to_fill_summary)
+            chart_tasks += requisition_tasks
+        if requisitions['filled_date'].notna().any():
+            best_hiring_months, worst_hiring_months, median_days_to_fill = recommend_hiring_months(requisitions, monthly_df)
+    
+    # Retention curves and cohort matrices from hire/exit dates
+    retention_table = None
+    retention = retention_chart_tasks(df)
+    if retention is not None:
+        retention_summary, retention_tasks = retention
+        retention_table = create_retention_table(retention_summary)
+        chart_tasks += retention_tasks
     
     # Generate monthly staffing table HTML
     monthly_staffing_table = create_monthly_staffing_table(monthly_df)
     
-    # Calculate metrics
-    metrics, dept_metrics = calculate_metrics(df)
+    # Calculate metrics, including trailing-12-month attrition per department
+    metrics, dept_metrics = calculate_metrics(df, staffing_cube)
     
     # Add manpower planning metrics
     if monthly_df is not None and len(monthly_df) > 0:
-        metrics['avg_monthly_attrition'] = f"{monthly_df['attrition_rate'].mean():.1f}%"
-        metrics['current_month_headcount'] = monthly_df.iloc[-1]['headcount'] if not monthly_df.empty else 'N/A'
-        metrics['last_month_leavers'] = monthly_df.iloc[-1]['leavers'] if not monthly_df.empty else 'N/A'
+        metrics.update(compute_metrics(
+            monthly_df, ['avg_monthly_attrition', 'current_month_headcount', 'last_month_leavers']))
+    
+    return chart_tasks, {
+        'metrics': metrics,
+        'dept_metrics': dept_metrics,
+        'monthly_staffing_table': monthly_staffing_table,
+        'best_hiring_months': best_hiring_months,
+        'worst_hiring_months': worst_hiring_months,
+        'retention_table': retention_table,
+        'time_to_fill_table': time_to_fill_table,
+        'median_days_to_fill': median_days_to_fill,
+        'unmatched_requisitions': unmatched_requisitions,
+    }
+
+def build_dashboard(df, branding_config=None, movements=None, requisitions=None, staffing_cube=None,
+                    chart_format='png', inline_images=False, inline_css=False, byte_budget=REPORT_BYTE_BUDGET,
+                    chart_workers=None):
+    """Build the dashboard in memory, without reading or writing any file
+    
+    Unlike generate_dashboard, nothing depends on an output folder, so a
+    service can build many dashboards at once in one process, e.g. from a
+    thread pool. Charts are rendered into memory and linked as they are in a
+    written dashboard: responsive PNG copies under images/ and the stylesheet
+    under assets/. With inline_images the middle-sized copy of each chart is
+    embedded as a data URI instead, along with the stylesheet, so the page
+    needs no other file; SVG charts are always embedded.
+    
+    Args:
+        df (pd.DataFrame): HR data
+        branding_config (dict): Branding, by default load_branding_config's
+        movements (pd.DataFrame): Optional department transfer history
+        requisitions (pd.DataFrame): Optional job requisition history
+        staffing_cube (dict): Staffing cube of df, built when not given
+        chart_format (str): 'png' or 'svg'
+        inline_images (bool): Embed the PNG charts in the page
+        inline_css (bool): Embed the stylesheet in the page
+        byte_budget (int): Most bytes a browser may download, None for no limit
+        chart_workers (int): Number of worker processes, defaults to one per CPU
+        
+    Returns:
+        dict: 'html' with the page as UTF-8 bytes and 'assets' with the bytes
+        of each file the page links, by its path relative to the page
+    """
+    branding_config = branding_config or load_branding_config()
+    if staffing_cube is None:
+        staffing_cube = build_staffing_cube(df)
+    chart_tasks, report = build_report_content(df, staffing_cube, movements, requisitions)
+    images = {Path(file).stem: data
+              for file, data in render_chart_bytes(chart_tasks, chart_workers, chart_format).items()}
+    
+    assets = {}
+    stylesheet = None
+    if chart_format != 'svg' and not inline_images and not inline_css:
+        stylesheet = f"assets/{stylesheet_name(branding_config)}"
+        assets[stylesheet] = generate_css(branding_config).encode('utf-8')
+    
+    sections = report_sections(branding_config=branding_config, **report, has_chart=lambda name: name in images,
+                               stylesheet=stylesheet)
+    if chart_format == 'svg':
+        svgs = {name: data.decode('utf-8') for name, data in images.items()}
+        sections = (embed_svg_charts(html, svgs) for html in sections)
+    else:
+        charts, files = chart_variant_bytes(images, workers=chart_workers)
+        if inline_images:
+            sections = (inline_chart_images(html, charts, files) for html in sections)
+        else:
+            sections = (responsive_chart_images(html, charts) for html in sections)
+            assets.update({f"images/{file}": data for file, data in files.items()})
+    
+    html = ''.join(within_byte_budget(sections, None, byte_budget, assets))
+    return {'html': html.encode('utf-8'), 'assets': assets}
+
+# Charts comparing departments, which a single department's page leaves out
+DEPARTMENT_PAGE_SKIPPED_CHARTS = {'department_distribution', 'attrition_by_dept', 'department_forecast'}
+
+def department_slug(department):
+    """Folder name of a department's drill-down page"""
+    return re.sub(r'[^\w-]+', '-', str(department)).strip('-').lower() or 'department'
+
+def _department_chart_images(chart_images, slug):
+    """Copies of one department's charts, named as its page links them"""
+    prefix = f"{slug}/images/"
+    return {name[len(prefix):]: {'variants': [(Path(file).name, width) for file, width in chart['variants']],
+                                 'size': chart['size']}
+            for name, chart in chart_images.items() if name.startswith(prefix)}
+
+def _stylesheet_href(branding_config, assets_dir, report_dir):
+    """Save the branding stylesheet in assets_dir and link it from a report in report_dir"""
+    stylesheet = Path(assets_dir) / write_stylesheet(branding_config, assets_dir)
+    return Path(os.path.relpath(stylesheet, report_dir)).as_posix()
+
+def write_department_index(pages, branding_config, pages_dir, inline_css=False, assets_dir=None):
+    """Write the page linking every department drill-down page
+
+    Args:
+        pages (list): Dicts with department, slug and metrics of each page
+        branding_config (dict): Branding of the dashboard
+        pages_dir (Path): Folder holding the department folders
+        inline_css (bool): Embed the stylesheet instead of linking it
+        assets_dir (Path): Folder of the shared stylesheet, by default the
+            assets folder of pages_dir
+
+    Returns:
+        Path: The index file
+    """
+    title = f"{branding_config['dashboard_title']} - Departments"
+    if inline_css:
+        styles = STYLE.format(css=generate_css(branding_config))
+    else:
+        styles = STYLESHEET_LINK.format(
+            href=_stylesheet_href(branding_config, Path(assets_dir or pages_dir / 'assets'), pages_dir))
+
+    pages = pd.DataFrame([{'department': page['department'], 'slug': page['slug'], **page['metrics']} for page in pages])
+    metrics = ['total_employees', 'attrition_rate', 'avg_salary', 'avg_satisfaction']
+    table = html_table(
+        ['Department', 'Employees', 'Attrition Rate', 'Avg. Salary', 'Avg. Satisfaction'],
+        [table_column(pages['slug']), table_column(pages['department'])] +
+        [table_column(pages[metric], METRIC_FORMATS[metric]) for metric in metrics],
+        row_template='<tr><td><a href="{}/hr_dashboard.html">{}</a></td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>')
+
+    now = datetime.datetime.now()
+    return write_report(pages_dir / "index.html", [
+        PAGE_START.format(title=title, styles=styles),
+        f"""    <div class="header-container">
+        <h1>{title}</h1>
+    </div>
+
+    <p class="last-updated"><a href="../hr_dashboard.html">Back to the company dashboard</a></p>
+""",
+        section("Department Dashboards", table_block(f"{len(pages)} Departments", table)),
+        footer(f"&copy; {now.year} {branding_config['company_name']} - HR Analytics Dashboard",
+               f"Generated on {now.strftime('%Y-%m-%d at %H:%M')}"),
+        PAGE_END,
+    ])
+
+def generate_department_pages(df, staffing_cube, branding_config, movements=None, requisitions=None, workers=None,
+                              chart_cache=True, chart_format='png', byte_budget=REPORT_BYTE_BUDGET, inline_css=False,
+                              output_dir=None, staffing_dimensions=None):
+    """Generate a drill-down dashboard for every department and an index of them
+
+    The data is split by department in one groupby pass, and movements and
+    requisitions are split the same way. The content of each page is computed
+    here; the charts of all departments are then rendered in a single
+    render_charts call, so the process pool and chart cache are shared, and
+    the pages are written on a process pool as well. Charts comparing
+    departments are left out of the pages.
+
+    Each department gets a folder under departments in the output folder
+    with its page and images, next to an index.html linking them. All pages
+    link the one stylesheet in the assets folder of the output folder, which
+    the company dashboard links as well.
+
+    Args:
+        df (pd.DataFrame): HR data of the whole company
+        staffing_cube (dict): Staffing cube of df, sliced for each department
+        branding_config (dict): Branding of the dashboard
+        movements (pd.DataFrame): Optional department transfer history
+        requisitions (pd.DataFrame): Optional job requisition history
+        workers (int): Number of worker processes, defaults to one per CPU
+        chart_cache (bool): Reuse charts whose data has not changed
+        chart_format (str): 'png' or 'svg', as in generate_dashboard
+        byte_budget (int): Byte budget of each page, None for no limit
+        inline_css (bool): Embed the stylesheet in each page
+        output_dir (Path): Folder of the main dashboard, by default
+            hr_analytics_output
+        staffing_dimensions (list): Columns the staffing cube of a page breaks
+            headcount down by when it is counted rather than sliced
+
+    Returns:
+        Path: The index page
+    """
+    start_time = time.time()
+    output_dir = Path(output_dir or OUTPUT_DIR)
+    pages_dir = output_dir / "departments"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+
+    # Transfers belong to the current department of the employee who moved
+    movements_by_dept = {}
+    if movements is not None:
+        employee_dept = df.set_index('employee_id')['department']
+        movements_by_dept = dict(tuple(movements.groupby(movements['employee_id'].map(employee_dept), observed=True)))
+    requisitions_by_dept = {}
+    if requisitions is not None and 'department' in requisitions.columns:
+        requisitions_by_dept = dict(tuple(requisitions.groupby('department', observed=True)))
+
+    pages = []
+    chart_tasks = []
+    slugs = set()
+    for department, dept_df in df.groupby('department', sort=True, observed=True):
+        dept_df = remove_unused_categories(dept_df)
+        slug = department_slug(department)
+        if slug in slugs:
+            slug = f"{slug}-{len(pages)}"
+        slugs.add(slug)
+
+        if staffing_cube is not None and 'department' in staffing_cube['dimensions']:
+            cube = slice_staffing_cube(staffing_cube, department=department)
+        else:
+            cube = build_staffing_cube(dept_df, staffing_dimensions)
+        dept_movements = movements_by_dept.get(department, movements.iloc[:0]) if movements is not None else None
+        dept_requisitions = None
+        if requisitions is not None:
+            dept_requisitions = requisitions_by_dept.get(department, requisitions.iloc[:0])
+        tasks, report = build_report_content(dept_df, cube, dept_movements, dept_requisitions)
+
+        # Charts are named by their place under the departments folder
+        (pages_dir / slug / "images").mkdir(parents=True, exist_ok=True)
+        chart_tasks += [dict(task, file=f"{slug}/images/{task['file']}") for task in tasks
+                        if Path(task['file']).stem not in DEPARTMENT_PAGE_SKIPPED_CHARTS]
+        pages.append({'department': department, 'slug': slug, 'metrics': report['metrics'], 'report': report})
+    logger.info(f"Computed {len(pages)} department pages with {len(chart_tasks)} charts "
+                f"in {time.time() - start_time:.2f} seconds")
+
+    render_charts(chart_tasks, pages_dir, workers, output_dir / "chart_cache" if chart_cache else None,
+                  chart_format=chart_format)
+    chart_images = {}
+    if chart_format == 'png':
+        chart_images = build_chart_variants([str(Path(task['file']).with_suffix('')) for task in chart_tasks],
+                                            pages_dir, workers=workers)
+
+    jobs = [dict(branding_config=dict(branding_config,
+                                      dashboard_title=f"{branding_config['dashboard_title']} - {page['department']}"),
+                 **page['report'], chart_format=chart_format, byte_budget=byte_budget,
+                 chart_images=_department_chart_images(chart_images, page['slug']), inline_css=inline_css,
+                 report_dir=pages_dir / page['slug'], assets_dir=output_dir / "assets")
+            for page in pages]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append(generate_html_report(**job))
+            except Exception as e:
+                results.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(generate_html_report, **job) for job in jobs]
+        results = [future.exception() or future.result() for future in futures]
+
+    failed = []
+    for page, result in zip(pages, results):
+        if isinstance(result, Exception):
+            logger.error(f"Department page for {page['department']} failed: {result}")
+            failed.append(str(page['department']))
+    if failed:
+        raise ValueError(f"Department pages failed for: {', '.join(failed)}")
+
+    index_file = write_department_index(pages, branding_config, pages_dir, inline_css, output_dir / "assets")
+    logger.info(f"Generated {len(pages)} department pages in {time.time() - start_time:.2f} seconds")
+    return index_file
+
+def generate_dashboard(data_file=None, config_file=None, open_browser=True, movements_file=None,
+                       requisitions_file=None, chart_workers=None, chart_cache=True, chart_format='png',
+                       byte_budget=REPORT_BYTE_BUDGET, inline_css=False, department_pages=False, output_dir=None,
+                       data_cache=True, sheet_name=None, staffing_dimensions=None):
+    """Generate the complete HR Analytics Dashboard with manpower planning
+    
+    The dashboard, its images, chart cache and data cache go to output_dir,
+    by default hr_analytics_output. With data_cache, a columnar copy of the
+    data file is reused while the file is unchanged, see hr_analytics_real_data.read_cached_source. sheet_name
+    selects the worksheet of an Excel data file, the first by default.
+    staffing_dimensions lists the columns the staffing cube breaks headcount
+    down by, by default STAFFING_DIMENSIONS; leave out columns with many
+    values, such as a detailed position, to keep the cube small.
+    With department_pages, a drill-down dashboard is also generated for every
+    department, linked from the department table of the main dashboard.
+    """
+    start_time = time.time()
+    logger.info("Starting HR Analytics Dashboard generation...")
+    output_dir = Path(output_dir or OUTPUT_DIR)
+    images_dir = output_dir / "images"
+    images_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Load data, only the columns the dashboard uses
+    df = load_data(data_file, columns=list(EMPLOYEE_SCHEMA), cache_dir=output_dir / "data_cache" if data_cache else None,
+                   sheet_name=sheet_name)
+    
+    # Save the data to CSV if it's generated sample data
+    if data_file is None or not os.path.exists(data_file):
+        df.to_csv(output_dir / "hr_data.csv", index=False)
+        logger.info(f"Sample HR data saved to {output_dir / 'hr_data.csv'}")
+    
+    # Process monthly staffing data for manpower planning in a single pass;
+    # department/position/gender cuts are read from the cube later on
+    staffing_cube = build_staffing_cube(df, staffing_dimensions)
+    
+    movements = load_movement_history(movements_file) if movements_file else None
+    requisitions = load_requisitions(requisitions_file) if requisitions_file else None
+    chart_tasks, report = build_report_content(df, staffing_cube, movements, requisitions)
+    
+    # Render every chart at once on a process pool; charts whose data has not
+    # changed since an earlier run are reused from the chart cache
+    render_charts(chart_tasks, images_dir, chart_workers, output_dir / "chart_cache" if chart_cache else None,
+                  chart_format=chart_format)
+    
+    # Downscaled copies of the PNG charts for screens that show them small
+    chart_images = None
+    if chart_format == 'png':
+        chart_images = build_chart_variants([Path(task['file']).stem for task in chart_tasks], images_dir,
+                                            workers=chart_workers)
     
     # Load branding configuration
     branding_config = load_branding_config(config_file)
     
+    # Department drill-down pages and their index, which the main report links
+    if department_pages:
+        generate_department_pages(df, staffing_cube, branding_config, movements, requisitions, chart_workers,
+                                  chart_cache, chart_format, byte_budget, inline_css, output_dir, staffing_dimensions)
+    
     # Generate HTML report with manpower planning section
     html_file = generate_html_report(
-        metrics, 
-        dept_metrics, 
-        branding_config, 
-        monthly_staffing_table=monthly_staffing_table, 
-        best_hiring_months=best_hiring_months,
-        worst_hiring_months=worst_hiring_months
+        branding_config=branding_config,
+        **report,
+        chart_format=chart_format,
+        byte_budget=byte_budget,
+        chart_images=chart_images,
+        inline_css=inline_css,
+        report_dir=output_dir
     )
     
     end_time = time.time()
@@ -353,7 +657,182 @@ def generate_dashboard(data_file=None, config_file=None, open_browser=True):
     
     return html_file
 
-def schedule_generation(data_file=None, config_file=None, schedule_interval="daily", specific_time="09:00"):
+def load_batch_manifest(manifest_file):
+    """Read the tenants of a batch run from a JSON manifest
+    
+    The manifest holds a "tenants" list. Each tenant has an "output_dir" and
+    optionally a "name", a branding "config" file and a "filter" mapping data
+    columns to one value or a list of values, e.g. {"department": ["Sales"]}.
+    Relative paths are resolved against the manifest's folder.
+    
+    Args:
+        manifest_file (str): Path to the manifest
+        
+    Returns:
+        list: One dict per tenant with name, filter, config and output_dir
+    """
+    manifest_file = Path(manifest_file)
+    with open(manifest_file, 'r') as f:
+        manifest = json.load(f)
+    
+    tenants = []
+    for i, entry in enumerate(manifest.get('tenants', [])):
+        if not entry.get('output_dir'):
+            raise ValueError(f"Batch manifest tenant {i} has no output_dir")
+        filters = entry.get('filter') or {}
+        tenants.append({
+            'name': entry.get('name', entry['output_dir']),
+            'filter': {col: values if isinstance(values, list) else [values] for col, values in filters.items()},
+            'config': str(manifest_file.parent / entry['config']) if entry.get('config') else None,
+            'output_dir': manifest_file.parent / entry['output_dir'],
+        })
+    if not tenants:
+        raise ValueError(f"Batch manifest {manifest_file} lists no tenants")
+    return tenants
+
+def filter_employees(df, filters):
+    """Rows of df whose columns hold one of the selected values
+    
+    Args:
+        df (pd.DataFrame): HR data
+        filters (dict): Column name mapped to a list of values
+        
+    Returns:
+        pd.DataFrame: The matching rows, with only the labels they hold in
+            their category columns
+    """
+    unknown = [col for col in filters if col not in df.columns]
+    if unknown:
+        raise ValueError(f"Batch filter columns not found in data: {unknown}")
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        mask &= df[col].isin(values).to_numpy()
+    return remove_unused_categories(df[mask])
+
+def _copy_images(source_dir, target_dir):
+    """Copy the chart images of a tenant group, skipping unchanged files"""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for source in source_dir.iterdir():
+        if source.name.startswith('.'):
+            continue  # The chart cache manifest belongs to the group folder
+        target = target_dir / source.name
+        stat = source.stat()
+        if target.exists() and target.stat().st_size == stat.st_size and target.stat().st_mtime_ns == stat.st_mtime_ns:
+            continue
+        shutil.copy2(source, target)
+
+def _publish_tenant(tenant, group_images, report, chart_images, chart_format, byte_budget, inline_css):
+    """Write one tenant's branded dashboard from its group's shared content"""
+    _copy_images(group_images, Path(tenant['output_dir']) / "images")
+    return generate_html_report(branding_config=load_branding_config(tenant['config']), **report,
+                                chart_format=chart_format, byte_budget=byte_budget, chart_images=chart_images,
+                                inline_css=inline_css, report_dir=tenant['output_dir'])
+
+def generate_batch(manifest_file, data_file=None, movements_file=None, requisitions_file=None, chart_workers=None,
+                   chart_format='png', byte_budget=REPORT_BYTE_BUDGET, inline_css=False, output_dir=None,
+                   data_cache=True, sheet_name=None, staffing_dimensions=None):
+    """Generate the dashboards of many tenants in one run
+    
+    The data is loaded and the staffing cube built once for all tenants.
+    Tenants with the same data filter form a group whose metrics, tables and
+    charts are computed once, none of which depend on branding, and all
+    groups share one chart cache. Each tenant then gets a copy of its group's
+    images and its own branded HTML, written on a process pool.
+    
+    Args:
+        manifest_file (str): JSON manifest, see load_batch_manifest
+        data_file (str): Path to the HR data file shared by all tenants
+        movements_file (str): Optional department transfer history
+        requisitions_file (str): Optional job requisition history
+        chart_workers (int): Number of worker processes, defaults to one per CPU
+        chart_format (str): 'png' or 'svg', as in generate_dashboard
+        byte_budget (int): Byte budget of each report, None for no limit
+        inline_css (bool): Embed the stylesheet in each report
+        output_dir (Path): Folder holding the shared work of the batch in
+            its batch subfolder, by default hr_analytics_output
+        data_cache (bool): Reuse the columnar copy of an unchanged data file
+        sheet_name (str): Worksheet of an Excel data file, the first by default
+        staffing_dimensions (list): Columns the staffing cube breaks headcount
+            down by, by default STAFFING_DIMENSIONS
+        
+    Returns:
+        list: Paths of the generated dashboards, in manifest order
+    """
+    start_time = time.time()
+    tenants = load_batch_manifest(manifest_file)
+    batch_dir = Path(output_dir or OUTPUT_DIR) / "batch"
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Data, movements, requisitions and the staffing cube are shared by all
+    # tenants; only the dashboard columns and the filtered ones are read
+    df = load_data(data_file, columns=list(EMPLOYEE_SCHEMA) + [col for tenant in tenants for col in tenant['filter']],
+                   cache_dir=batch_dir / "data_cache" if data_cache else None, sheet_name=sheet_name)
+    staffing_cube = build_staffing_cube(df, staffing_dimensions)
+    movements = load_movement_history(movements_file) if movements_file else None
+    requisitions = load_requisitions(requisitions_file) if requisitions_file else None
+    
+    groups = {}
+    for tenant in tenants:
+        tenant['group'] = hashlib.sha256(json.dumps(tenant['filter'], sort_keys=True, default=str).encode()).hexdigest()[:12]
+        groups.setdefault(tenant['group'], {'filter': tenant['filter']})
+    logger.info(f"Generating {len(tenants)} dashboards from {len(groups)} distinct data filters")
+    
+    for key, group in groups.items():
+        filters = group['filter']
+        subset = filter_employees(df, filters)
+        # Filters on cube dimensions are read from the shared cube
+        if staffing_cube is not None and all(col in staffing_cube['dimensions'] for col in filters):
+            cube = slice_staffing_cube(staffing_cube, **filters)
+        else:
+            cube = build_staffing_cube(subset, staffing_dimensions)
+        group_movements = movements
+        if movements is not None:
+            group_movements = movements[movements['employee_id'].isin(subset['employee_id'])]
+        group_requisitions = requisitions
+        if requisitions is not None:
+            group_requisitions = filter_employees(
+                requisitions, {col: values for col, values in filters.items() if col in requisitions.columns})
+        chart_tasks, group['report'] = build_report_content(subset, cube, group_movements, group_requisitions)
+        
+        group['images'] = batch_dir / "groups" / key
+        group['images'].mkdir(parents=True, exist_ok=True)
+        render_charts(chart_tasks, group['images'], chart_workers, batch_dir / "chart_cache", chart_format=chart_format)
+        group['chart_images'] = None
+        if chart_format == 'png':
+            group['chart_images'] = build_chart_variants([Path(task['file']).stem for task in chart_tasks],
+                                                         group['images'], workers=chart_workers)
+    
+    # Only the branded pages differ between tenants of a group
+    jobs = [(tenant, groups[tenant['group']]['images'], groups[tenant['group']]['report'],
+             groups[tenant['group']]['chart_images'], chart_format, byte_budget, inline_css) for tenant in tenants]
+    workers = min(chart_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append(_publish_tenant(*job))
+            except Exception as e:
+                results.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_publish_tenant, *job) for job in jobs]
+        results = [future.exception() or future.result() for future in futures]
+    
+    failed = []
+    for tenant, result in zip(tenants, results):
+        if isinstance(result, Exception):
+            logger.error(f"Dashboard for {tenant['name']} failed: {result}")
+            failed.append(tenant['name'])
+    if failed:
+        raise ValueError(f"Batch dashboards failed for: {', '.join(failed)}")
+    
+    logger.info(f"Generated {len(tenants)} dashboards in {time.time() - start_time:.2f} seconds")
+    return results
+
+def schedule_generation(data_file=None, config_file=None, schedule_interval="daily", specific_time="09:00", movements_file=None,
+                        requisitions_file=None, chart_workers=None, chart_cache=True, chart_format='png',
+                        byte_budget=REPORT_BYTE_BUDGET, inline_css=False, department_pages=False, output_dir=None,
+                        data_cache=True, sheet_name=None, staffing_dimensions=None):
     """
     Schedule regular dashboard generation
     
@@ -362,13 +841,29 @@ def schedule_generation(data_file=None, config_file=None, schedule_interval="dai
         config_file: Path to branding configuration
         schedule_interval: 'hourly', 'daily', or 'weekly'
         specific_time: Time for daily or weekly updates (format: HH:MM)
+        movements_file: Optional path to a department transfer history file
+        requisitions_file: Optional path to a job requisition history file
+        chart_workers: Number of chart rendering processes, defaults to one per CPU
+        chart_cache: Reuse charts whose input data has not changed since an earlier run
+        chart_format: 'png' images, or 'svg' charts embedded in the HTML file
+        byte_budget: Most bytes a browser may download for the report, None for no limit
+        inline_css: Embed the stylesheet in the HTML file instead of linking a shared file
+        department_pages: Also generate a drill-down dashboard for every department
+        output_dir: Folder of the dashboard, by default hr_analytics_output
+        data_cache: Reuse the columnar copy of the data file while it is unchanged
+        sheet_name: Worksheet of an Excel data file, the first by default
+        staffing_dimensions: Columns the staffing cube breaks headcount down by
     """
     logger.info(f"Setting up {schedule_interval} dashboard generation at {specific_time}")
     
     # Define the job function
     def job():
         logger.info("Running scheduled dashboard generation...")
-        generate_dashboard(data_file, config_file, open_browser=False)
+        generate_dashboard(data_file, config_file, open_browser=False, movements_file=movements_file,
+                           requisitions_file=requisitions_file, chart_workers=chart_workers, chart_cache=chart_cache,
+                           chart_format=chart_format, byte_budget=byte_budget, inline_css=inline_css,
+                           department_pages=department_pages, output_dir=output_dir, data_cache=data_cache,
+                           sheet_name=sheet_name, staffing_dimensions=staffing_dimensions)
         logger.info("Scheduled dashboard generation completed.")
     
     # Set up the schedule
@@ -404,13 +899,59 @@ def main():
                         help='Time for scheduled generation (format: HH:MM, default: 09:00)')
     parser.add_argument('--no-browser', action='store_true', 
                         help='Disable automatic browser opening')
+    parser.add_argument('--movements', type=str,
+                        help='Path to department transfer history CSV/Excel file')
+    parser.add_argument('--requisitions', type=str,
+                        help='Path to job requisition history CSV/Excel file')
+    parser.add_argument('--chart-workers', type=int,
+                        help='Number of processes rendering charts (default: one per CPU)')
+    parser.add_argument('--no-chart-cache', action='store_true',
+                        help='Render every chart instead of reusing unchanged ones')
+    parser.add_argument('--chart-format', type=str, choices=CHART_FORMATS, default='png',
+                        help='png: 300 dpi images (default); svg: vector charts embedded in a single HTML file')
+    parser.add_argument('--byte-budget-kb', type=int, default=REPORT_BYTE_BUDGET // 1024,
+                        help='Fail when the report and its images exceed this many KB (default: %(default)s, 0: no limit)')
+    parser.add_argument('--inline-css', action='store_true',
+                        help='Embed the stylesheet in the HTML file instead of linking a shared, cacheable file')
+    parser.add_argument('--batch', type=str,
+                        help='Path to a JSON manifest of tenants (data filter, branding config, output folder) '
+                             'to generate in one run')
+    parser.add_argument('--output-dir', type=str,
+                        help='Folder of the dashboard, its images and stored state (default: hr_analytics_output)')
+    parser.add_argument('--department-pages', action='store_true',
+                        help='Also generate a drill-down dashboard for every department and an index linking them')
+    parser.add_argument('--no-data-cache', action='store_true',
+                        help='Parse the data file on every run instead of reusing its cached columnar copy')
+    parser.add_argument('--sheet', type=str,
+                        help='Worksheet of an Excel data file to read, by name or position from 0 (default: the first sheet)')
+    parser.add_argument('--staffing-dimensions', type=str,
+                        help='Comma-separated columns to break staffing headcount down by '
+                             f"(default: {','.join(STAFFING_DIMENSIONS)})")
     
     args = parser.parse_args()
-    
-    if args.schedule:
-        schedule_generation(args.data, args.config, args.schedule, args.time)
+    byte_budget = args.byte_budget_kb * 1024 or None
+    # A number selects the sheet by position, 0 for the first
+    sheet_name = int(args.sheet) if args.sheet and args.sheet.isdigit() else args.sheet
+    staffing_dimensions = None
+    if args.staffing_dimensions is not None:
+        staffing_dimensions = [col.strip() for col in args.staffing_dimensions.split(',') if col.strip()]
+    if args.batch and args.schedule:
+        parser.error("--batch cannot be combined with --schedule")
+    
+    if args.batch:
+        generate_batch(args.batch, args.data, args.movements, args.requisitions, args.chart_workers,
+                       args.chart_format, byte_budget, args.inline_css, args.output_dir,
+                       not args.no_data_cache, sheet_name, staffing_dimensions)
+    elif args.schedule:
+        schedule_generation(args.data, args.config, args.schedule, args.time, args.movements, args.requisitions,
+                            args.chart_workers, not args.no_chart_cache, args.chart_format, byte_budget,
+                            args.inline_css, args.department_pages, args.output_dir, not args.no_data_cache,
+                            sheet_name, staffing_dimensions)
     else:
-        generate_dashboard(args.data, args.config, not args.no_browser)
+        generate_dashboard(args.data, args.config, not args.no_browser, args.movements,
+                           args.requisitions, args.chart_workers, not args.no_chart_cache, args.chart_format,
+                           byte_budget, args.inline_css, args.department_pages, args.output_dir, not args.no_data_cache,
+                           sheet_name, staffing_dimensions)
 
 if __name__ == "__main__":
     main()
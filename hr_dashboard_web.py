@@ -13,7 +13,9 @@ import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import seaborn as sns
 from hr_staffing_tracker import create_staffing_visualizations
-from hr_html_generator import calculate_metrics, load_branding_config
+from hr_forecasting import forecast_headcount
+from hr_html_generator import load_branding_config
+from hr_metrics import compute_metrics
 
 # Set up logging
 logging.basicConfig(
@@ -117,13 +119,11 @@ def create_forecast_chart(months, headcount):
     if len(months) < 3:
         return None
     
-    # Calculate average monthly change
-    avg_change = np.mean(np.diff(headcount))
-    
-    # Project for next 3 months
+    # Project for next 3 months with the same models as the dashboard
     last_month = headcount[-1]
+    forecast = forecast_headcount(headcount, horizon=3)
     forecast_months = [f'Forecast {i+1}' for i in range(3)]
-    forecast_values = [last_month + (i+1)*avg_change for i in range(3)]
+    forecast_values = forecast['forecast'][0]
     
     # Create forecast visualization
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -135,11 +135,9 @@ def create_forecast_chart(months, headcount):
     ax.plot(range(len(months), len(months)+len(forecast_months)), forecast_values, 
             marker='s', linewidth=2, linestyle='--', color='#9467bd', label='Forecast')
     
-    # Add shaded area for forecast uncertainty
-    upper_bound = [val * 1.1 for val in forecast_values]
-    lower_bound = [val * 0.9 for val in forecast_values]
+    # Add shaded area for the 95% forecast interval
     ax.fill_between(range(len(months), len(months)+len(forecast_months)), 
-                     upper_bound, lower_bound, color='#9467bd', alpha=0.2)
+                     forecast['upper'][0], forecast['lower'][0], color='#9467bd', alpha=0.2)
     
     # Configure axes
     full_x_range = months + forecast_months
@@ -184,12 +182,12 @@ def index():
     attrition_chart = create_attrition_chart(months, attrition_rates)
     forecast_chart = create_forecast_chart(months, headcount)
     
-    # Calculate key metrics
-    avg_headcount = sum(headcount) / len(headcount) if headcount else 0
-    avg_attrition = sum(attrition_rates) / len(attrition_rates) if attrition_rates else 0
-    total_joiners = sum(joiners)
-    total_leavers = sum(leavers)
-    net_growth = total_joiners - total_leavers
+    # Calculate key metrics from the shared registry, 0 when there are no months
+    monthly_df = pd.DataFrame({'headcount': headcount, 'joiners': joiners, 'leavers': leavers,
+                               'attrition_rate': attrition_rates})
+    metrics = compute_metrics(monthly_df, ['avg_headcount', 'avg_monthly_attrition', 'total_joiners',
+                                           'total_leavers', 'net_growth'])
+    metrics = {name: 0 if pd.isna(value) else value for name, value in metrics.items()}
     
     return render_template('dashboard.html',
                           months=months,
@@ -201,11 +199,11 @@ def index():
                           movement_chart=movement_chart,
                           attrition_chart=attrition_chart,
                           forecast_chart=forecast_chart,
-                          avg_headcount=avg_headcount,
-                          avg_attrition=avg_attrition,
-                          total_joiners=total_joiners,
-                          total_leavers=total_leavers,
-                          net_growth=net_growth,
+                          avg_headcount=metrics['avg_headcount'],
+                          avg_attrition=metrics['avg_monthly_attrition'],
+                          total_joiners=metrics['total_joiners'],
+                          total_leavers=metrics['total_leavers'],
+                          net_growth=metrics['net_growth'],
                           current_year=datetime.datetime.now().year)
 
 @app.route('/edit-data', methods=['GET', 'POST'])
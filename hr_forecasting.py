@@ -0,0 +1,270 @@
+import itertools
+import logging
+import time
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+SEASON = 12  # Months per seasonal cycle
+FORECAST_METHODS = ['holt_winters', 'damped_trend', 'seasonal_naive', 'drift']
+
+# Smoothing parameter grid searched for every series at once
+ALPHAS = [0.1, 0.3, 0.5, 0.8]
+BETAS = [0.01, 0.1, 0.3]
+GAMMAS = [0.05, 0.2, 0.5]
+PHIS = [0.8, 0.9, 0.98]
+
+def staffing_series(staffing, by='department'):
+    """Monthly headcount series for the total and each category of one dimension
+
+    Args:
+        staffing (dict | pd.DataFrame): Staffing cube from build_staffing_cube,
+            or a monthly staffing table (total series only)
+        by (str): Cube dimension to add one series per category for
+
+    Returns:
+        dict: 'months' (pd.DatetimeIndex), series 'labels' starting with
+        'Total', and 'values' as a (series, months) float array
+    """
+    if isinstance(staffing, pd.DataFrame):
+        return {
+            'months': pd.DatetimeIndex(pd.to_datetime(staffing['month'])),
+            'labels': ['Total'],
+            'values': staffing['headcount'].to_numpy(dtype=float)[None, :],
+        }
+
+    headcount = staffing['headcount'].reshape(len(staffing['months']), -1).sum(axis=1, dtype=np.int64)
+    labels, values = ['Total'], [headcount]
+    if by in staffing['dimensions']:
+        axis = staffing['dimensions'].index(by) + 1
+        other_axes = tuple(i for i in range(1, staffing['headcount'].ndim) if i != axis)
+        by_level = staffing['headcount'].sum(axis=other_axes, dtype=np.int64)
+        labels += list(staffing['levels'][by])
+        values += list(by_level.T)
+    return {
+        'months': pd.DatetimeIndex(staffing['months']),
+        'labels': labels,
+        'values': np.vstack(values).astype(float),
+    }
+
+def _exponential_smoothing(values, horizon, season=SEASON, seasonal=True):
+    """Fit additive damped-trend exponential smoothing to many series at once
+
+    Every smoothing parameter combination is run for every series in the same
+    array operation, one time step at a time, and each series keeps the
+    combination with the lowest one-step-ahead squared error. The Python loop
+    is over months only, so the cost grows with months x series x grid size
+    without a Python-level loop per series or per parameter set.
+
+    Args:
+        values (np.ndarray): (series, months) array
+        horizon (int): Number of months to forecast
+        season (int): Season length in months
+        seasonal (bool): Include the seasonal component (Holt-Winters); it is
+            dropped when there are fewer than two full seasons
+
+    Returns:
+        tuple: (series, horizon) forecasts and the in-sample RMSE per series
+    """
+    n_series, n_months = values.shape
+    seasonal = seasonal and n_months >= 2 * season
+    grid = np.array(list(itertools.product(ALPHAS, BETAS, GAMMAS if seasonal else [0.0], PHIS)))
+    alpha, beta, gamma, phi = (grid[:, i, None] for i in range(4))
+    n_params = len(grid)
+
+    # Initial level/trend/season from the first one or two seasons
+    if seasonal:
+        first = values[:, :season].mean(axis=1)
+        trend0 = (values[:, season:2 * season].mean(axis=1) - first) / season
+        level0 = first - trend0 * (season + 1) / 2
+        season0 = values[:, :season] - first[:, None]
+        burn_in = season
+    else:
+        trend0 = values[:, 1] - values[:, 0] if n_months > 1 else np.zeros(n_series)
+        level0 = values[:, 0] - trend0
+        season0 = np.zeros((n_series, season))
+        burn_in = 1
+
+    level = np.broadcast_to(level0, (n_params, n_series)).copy()
+    trend = np.broadcast_to(trend0, (n_params, n_series)).copy()
+    seasons = np.broadcast_to(season0.T[:, None, :], (season, n_params, n_series)).copy()
+    sse = np.zeros((n_params, n_series))
+
+    by_month = np.ascontiguousarray(values.T)
+    for t in range(n_months):
+        current = seasons[t % season]
+        trend *= phi
+        error = by_month[t] - level - trend - current
+        if t >= burn_in:
+            sse += error * error
+        level += trend + alpha * error
+        trend += beta * error
+        current += gamma * error
+
+    best = sse.argmin(axis=0)
+    columns = np.arange(n_series)
+    seasons = seasons[:, best, columns].T
+    best_phi = grid[best, 3][:, None]
+    steps = np.arange(1, horizon + 1)
+    damped_steps = np.cumsum(best_phi ** steps, axis=1)
+    forecast = (level[best, columns][:, None] + damped_steps * trend[best, columns][:, None]
+                + seasons[:, (n_months + steps - 1) % season])
+    rmse = np.sqrt(sse[best, columns] / max(n_months - burn_in, 1))
+    return forecast, rmse
+
+def _seasonal_naive(values, horizon, season=SEASON):
+    """Repeat the last observed season, or the last value for short series"""
+    n_months = values.shape[1]
+    steps = np.arange(horizon)
+    if n_months < season:
+        forecast = np.repeat(values[:, -1:], horizon, axis=1)
+        errors = np.diff(values, axis=1)
+    else:
+        forecast = values[:, n_months - season + steps % season]
+        errors = values[:, season:] - values[:, :-season]
+    rmse = np.sqrt((errors ** 2).mean(axis=1)) if errors.shape[1] else np.zeros(len(values))
+    return forecast, rmse
+
+def _drift(values, horizon, window=6):
+    """Extend the average change of the last few months (the former forecast)"""
+    recent = values[:, -window:]
+    change = np.diff(recent, axis=1).mean(axis=1) if recent.shape[1] > 1 else np.zeros(len(values))
+    forecast = values[:, -1:] + change[:, None] * np.arange(1, horizon + 1)
+    errors = np.diff(values, axis=1) - change[:, None]
+    rmse = np.sqrt((errors ** 2).mean(axis=1)) if errors.shape[1] else np.zeros(len(values))
+    return forecast, rmse
+
+def _fit_method(values, horizon, method, season):
+    """Forecast every series with one method"""
+    if method == 'holt_winters':
+        return _exponential_smoothing(values, horizon, season, seasonal=True)
+    if method == 'damped_trend':
+        return _exponential_smoothing(values, horizon, season, seasonal=False)
+    if method == 'seasonal_naive':
+        return _seasonal_naive(values, horizon, season)
+    if method == 'drift':
+        return _drift(values, horizon)
+    raise ValueError(f"Unknown forecast method: {method}. Use one of {FORECAST_METHODS} or 'auto'")
+
+def forecast_headcount(values, horizon=6, method='auto', season=SEASON):
+    """Forecast many monthly headcount series in one batch
+
+    Args:
+        values (np.ndarray): (series, months) array, or one series
+        horizon (int): Number of months to forecast
+        method (str): One of FORECAST_METHODS, or 'auto' to pick the seasonal
+            model with the best in-sample fit for each series
+        season (int): Season length in months
+
+    Returns:
+        dict: (series, horizon) 'forecast', 'lower' and 'upper' 95% bounds,
+        and the 'method' used for each series
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    if method != 'auto':
+        methods = [method]
+    elif values.shape[1] >= 2 * season:
+        methods = ['holt_winters', 'damped_trend', 'seasonal_naive']
+    else:
+        # Too short to estimate seasonality
+        methods = ['damped_trend', 'seasonal_naive']
+    fits = [_fit_method(values, horizon, name, season) for name in methods]
+
+    chosen = np.argmin(np.vstack([rmse for _, rmse in fits]), axis=0)
+    columns = np.arange(len(values))
+    forecast = np.stack([fc for fc, _ in fits])[chosen, columns]
+    rmse = np.vstack([rmse for _, rmse in fits])[chosen, columns]
+
+    # Error spread widens with the horizon like a random walk
+    spread = 1.96 * rmse[:, None] * np.sqrt(np.arange(1, horizon + 1))
+    return {
+        'forecast': np.clip(forecast, 0, None),
+        'lower': np.clip(forecast - spread, 0, None),
+        'upper': forecast + spread,
+        'method': [methods[i] for i in chosen],
+    }
+
+def forecast_staffing(staffing, horizon=6, method='auto', by='department'):
+    """Forecast total and per-category headcount from staffing history
+
+    Args:
+        staffing (dict | pd.DataFrame): Staffing cube or monthly staffing table
+        horizon (int): Number of months to forecast
+        method (str): One of FORECAST_METHODS, or 'auto'
+        by (str): Cube dimension to forecast each category of
+
+    Returns:
+        pd.DataFrame: month, series, forecast, lower, upper and method, one row
+        per series and forecast month, or None with under three months of history
+    """
+    series = staffing_series(staffing, by)
+    if series['values'].shape[1] < 3:
+        return None
+
+    result = forecast_headcount(series['values'], horizon, method)
+    months = pd.date_range(series['months'][-1] + pd.DateOffset(months=1), periods=horizon, freq='MS')
+    n_series = len(series['labels'])
+    return pd.DataFrame({
+        'month': np.tile(months.strftime('%Y-%m'), n_series),
+        'series': np.repeat(series['labels'], horizon),
+        'forecast': result['forecast'].ravel().round(1),
+        'lower': result['lower'].ravel().round(1),
+        'upper': result['upper'].ravel().round(1),
+        'method': np.repeat(result['method'], horizon),
+    })
+
+def backtest_forecasts(values, horizon=6, n_origins=12, methods=None, season=SEASON):
+    """Rolling-origin backtest of forecast methods over many series
+
+    The history is cut at n_origins successive months; each method forecasts
+    the next horizon months from every cut and is scored on what happened.
+
+    Args:
+        values (np.ndarray): (series, months) array
+        horizon (int): Months forecast from each origin
+        n_origins (int): Number of forecast origins, ending horizon months
+            before the last month
+        methods (list): Methods to compare, defaults to FORECAST_METHODS plus 'auto'
+        season (int): Season length in months
+
+    Returns:
+        pd.DataFrame: One row per method with MAE, WAPE (%) and fit time per
+        origin, most accurate first
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_months = values.shape[1]
+    first_origin = max(n_months - horizon - n_origins + 1, 3)
+    origins = range(first_origin, n_months - horizon + 1)
+    if len(origins) == 0:
+        raise ValueError(f"Need at least {horizon + 3} months of history to backtest")
+
+    results = []
+    for method in methods or FORECAST_METHODS + ['auto']:
+        abs_errors = 0.0
+        actual_total = 0.0
+        fit_seconds = 0.0
+        for origin in origins:
+            start = time.perf_counter()
+            forecast = forecast_headcount(values[:, :origin], horizon, method, season)['forecast']
+            fit_seconds += time.perf_counter() - start
+            actual = values[:, origin:origin + horizon]
+            abs_errors += np.abs(forecast - actual).sum()
+            actual_total += np.abs(actual).sum()
+        n_points = values.shape[0] * horizon * len(origins)
+        results.append({
+            'method': method,
+            'series': values.shape[0],
+            'origins': len(origins),
+            'mae': round(abs_errors / n_points, 2),
+            'wape': round(abs_errors / actual_total * 100, 2) if actual_total else np.nan,
+            'fit_ms': round(fit_seconds / len(origins) * 1000, 2),
+        })
+
+    return pd.DataFrame(results).sort_values('mae').reset_index(drop=True)
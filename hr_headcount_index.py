@@ -0,0 +1,182 @@
+import logging
+import numpy as np
+import pandas as pd
+from hr_staffing_tracker import prepare_staffing_dates
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Categorical columns the index can filter on when present
+INDEX_DIMENSIONS = ['department', 'position']
+
+# Dates are stored as day numbers shifted to be non-negative, packed below the
+# group code in one int64 key so a single sorted array serves every group
+_DAY_BITS = 32
+_DAY_OFFSET = 2 ** 31
+_OPEN_END = 2 ** _DAY_BITS - 1  # Day value used for employees who have not left
+
+def _day_numbers(dates):
+    """Convert dates to shifted day numbers, -1 where the date is missing"""
+    try:
+        days = np.asarray(dates, dtype='datetime64[D]')
+    except (TypeError, ValueError):
+        # Fall back to pandas for date formats NumPy cannot parse
+        days = pd.DatetimeIndex(pd.to_datetime(dates)).to_numpy().astype('datetime64[D]')
+    numbers = days.astype(np.int64) + _DAY_OFFSET
+    numbers[np.isnat(days)] = -1
+    return numbers
+
+def build_headcount_index(df, dimensions=None):
+    """Build an interval index over employee (hire_date, exit_date) spans
+
+    Employment spans are stored as two sorted arrays of (group, day) keys: one
+    by hire day and one by exit day. Counting the employees of any group that
+    had started, and that had left, by a date is then a binary search. That
+    answers as-of-date and date-range headcount queries in O(groups x log N)
+    without touching the raw rows again.
+
+    An employee is active at the end of a day when they were hired on or
+    before it and have not left by it, matching process_monthly_staffing.
+
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        dimensions (list): Columns to allow filtering on, defaults to the
+            INDEX_DIMENSIONS present in df
+
+    Returns:
+        dict: Index for headcount_as_of, headcount_between and active_employees
+    """
+    if prepare_staffing_dates(df) is None:
+        return None
+
+    if dimensions is None:
+        dimensions = [col for col in INDEX_DIMENSIONS if col in df.columns]
+    dimensions = [col for col in dimensions if col in df.columns]
+
+    # Records without a hire date, or whose exit precedes their hire, are
+    # never active, so they are left out of the index
+    hired = (df['hire_date'].notna() & ~(df['exit_date'] < df['hire_date'])).to_numpy()
+    levels = {}
+    codes = []
+    for col in dimensions:
+        col_codes, col_levels = pd.factorize(df[col], sort=True, use_na_sentinel=False)
+        levels[col] = pd.Index(col_levels).tolist()
+        codes.append(col_codes[hired])
+    shape = tuple(len(levels[col]) for col in dimensions)
+    group = np.ravel_multi_index(codes, shape).astype(np.int64) if shape else np.zeros(hired.sum(), dtype=np.int64)
+
+    start = _day_numbers(df['hire_date'])[hired]
+    end = _day_numbers(df['exit_date'])[hired]
+    end[end < 0] = _OPEN_END
+
+    start_keys = (group << _DAY_BITS) | start
+    end_keys = (group << _DAY_BITS) | end
+    start_order = np.argsort(start_keys, kind='stable')
+    ids = df['employee_id'].to_numpy() if 'employee_id' in df.columns else df.index.to_numpy()
+
+    logger.info(f"Built headcount index over {len(start_keys):,} employment spans "
+                f"in {int(np.prod(shape)) if shape else 1} groups")
+    return {
+        'dimensions': list(dimensions),
+        'levels': levels,
+        'start_keys': start_keys[start_order],
+        'end_keys': np.sort(end_keys),
+        'span_ends': end[start_order],
+        'employee_ids': ids[hired][start_order],
+    }
+
+def _matching_groups(index, filters):
+    """Group codes selected by department/position style filters"""
+    selections = []
+    for dim in index['dimensions']:
+        dim_levels = index['levels'][dim]
+        if dim not in filters:
+            selections.append(np.arange(len(dim_levels)))
+            continue
+        selected = filters[dim]
+        if not isinstance(selected, (list, tuple, set)):
+            selected = [selected]
+        selections.append(np.array([dim_levels.index(value) for value in selected if value in dim_levels],
+                                   dtype=np.int64))
+    unknown = [dim for dim in filters if dim not in index['dimensions']]
+    if unknown:
+        raise ValueError(f"Headcount index cannot filter on: {unknown}")
+    if not selections:
+        return np.zeros(1, dtype=np.int64)
+
+    shape = tuple(len(index['levels'][dim]) for dim in index['dimensions'])
+    grid = np.meshgrid(*selections, indexing='ij')
+    return np.ravel_multi_index([axis.ravel() for axis in grid], shape).astype(np.int64)
+
+def _count_by(keys, groups, days):
+    """Count keys per date with day number <= the date, summed over groups"""
+    upper = (groups[:, None] << _DAY_BITS) | days[None, :]
+    lower = groups << _DAY_BITS
+    counts = np.searchsorted(keys, upper, side='right') - np.searchsorted(keys, lower, side='left')[:, None]
+    return counts.sum(axis=0)
+
+def headcount_as_of(index, dates, **filters):
+    """Number of active employees at the end of one or more dates
+
+    Args:
+        index (dict): Index from build_headcount_index
+        dates (str | pd.Timestamp | list): Date or dates to count on
+        **filters: Dimension name mapped to one category or a list of categories,
+            e.g. department='Finance'
+
+    Returns:
+        int | np.ndarray: Headcount for a single date, or one per date
+    """
+    days = _day_numbers(np.atleast_1d(dates))
+    groups = _matching_groups(index, filters)
+    counts = _count_by(index['start_keys'], groups, days) - _count_by(index['end_keys'], groups, days)
+    return int(counts[0]) if np.ndim(dates) == 0 else counts
+
+def headcount_between(index, start, end, **filters):
+    """Number of employees active at any point between two dates (inclusive)
+
+    Args:
+        index (dict): Index from build_headcount_index
+        start (str | pd.Timestamp): First day of the period
+        end (str | pd.Timestamp): Last day of the period
+        **filters: Dimension name mapped to one category or a list of categories
+
+    Returns:
+        int: Employees hired by the end of the period who had not left before its start
+    """
+    start_day, end_day = _day_numbers([start, end])
+    groups = _matching_groups(index, filters)
+    hired = _count_by(index['start_keys'], groups, np.array([end_day]))
+    # Leaving on the first day of the period still counts as active that day
+    gone = _count_by(index['end_keys'], groups, np.array([start_day - 1]))
+    return int(hired[0] - gone[0])
+
+def active_employees(index, start, end=None, **filters):
+    """Employee ids active on a date, or at any point between two dates
+
+    Args:
+        index (dict): Index from build_headcount_index
+        start (str | pd.Timestamp): Date, or first day of the period
+        end (str | pd.Timestamp): Last day of the period, defaults to start
+        **filters: Dimension name mapped to one category or a list of categories
+
+    Returns:
+        np.ndarray: employee_id values, ordered by group and hire date
+    """
+    if end is None:
+        start_day, end_day = _day_numbers([start, start])
+        start_day += 1  # Active at the end of the day means not gone by then
+    else:
+        start_day, end_day = _day_numbers([start, end])
+
+    groups = _matching_groups(index, filters)
+    lower = np.searchsorted(index['start_keys'], groups << _DAY_BITS, side='left')
+    upper = np.searchsorted(index['start_keys'], (groups << _DAY_BITS) | end_day, side='right')
+    hired = np.concatenate([np.arange(lo, hi) for lo, hi in zip(lower, upper)]) if len(groups) else np.array([], dtype=np.int64)
+    still_there = index['span_ends'][hired] >= start_day
+    return index['employee_ids'][hired[still_there]]
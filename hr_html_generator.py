@@ -2,6 +2,11 @@ import pandas as pd
 import logging
 from pathlib import Path
 import json
+import hashlib
+import os
+from functools import lru_cache
+from hr_metrics import compute_metrics
+from hr_staffing_tracker import rolling_staffing_metrics
 
 # Set up logging
 logging.basicConfig(
@@ -11,37 +16,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def calculate_metrics(df):
-    """Calculate key HR metrics from the dataset"""
+# How each overall metric is shown on a metric card
+METRIC_FORMATS = {
+    'total_employees': '{}',
+    'attrition_rate': '{:.1f}%',
+    'avg_salary': '${:,.0f}',
+    'avg_satisfaction': '{:.1f}/5.0',
+    'avg_tenure': '{:.1f} years',
+    'ttm_attrition': '{:.1f}%',
+    'annualized_attrition': '{:.1f}%',
+    'avg_headcount_12m': '{:,.0f}',
+    'avg_monthly_attrition': '{:.1f}%',
+    'current_month_headcount': '{}',
+    'last_month_leavers': '{}',
+}
+
+# Metrics of the report cards and of the department table, from the registry
+# in hr_metrics
+OVERALL_METRICS = ['total_employees', 'attrition_rate', 'avg_salary', 'avg_satisfaction', 'avg_tenure']
+DEPARTMENT_METRICS = ['employee_count', 'attrition_rate', 'avg_salary', 'avg_satisfaction']
+
+def calculate_metrics(df, staffing=None, version=None):
+    """Calculate key HR metrics from the dataset
+    
+    Metrics are numbers, with rates in percent; format_metrics and
+    department_metrics_table turn them into text when a report is rendered.
+    Department metrics come from a single groupby pass over the columns
+    the metrics need, see hr_metrics.compute_metrics.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with HR data
+        staffing (dict | pd.DataFrame): Optional staffing cube or monthly
+            staffing table; adds trailing-12-month attrition, annualized
+            attrition and average headcount, per department with a cube
+        version (hashable): Identifies df so metrics already computed for
+            it are reused, see hr_metrics.compute_metrics
+        
+    Returns:
+        tuple: (metrics dict, department metrics DataFrame with department,
+        employee_count, attrition_rate, avg_salary and, when the data has
+        satisfaction scores, avg_satisfaction)
+    """
     logger.info("Calculating HR metrics...")
     
-    metrics = {}
+    metrics = compute_metrics(df, OVERALL_METRICS, version=version)
+    metrics.setdefault('avg_satisfaction', float('nan'))
+    dept_metrics = compute_metrics(df, DEPARTMENT_METRICS, by='department', version=version)
     
-    # Overall metrics
-    metrics['total_employees'] = len(df)
-    metrics['attrition_rate'] = f"{df['attrition'].mean() * 100:.1f}%"
-    metrics['avg_salary'] = f"${df['salary'].mean():,.0f}"
-    metrics['avg_satisfaction'] = f"{df['satisfaction'].mean():.1f}/5.0" if 'satisfaction' in df.columns else 'N/A'
-    metrics['avg_tenure'] = f"{df['tenure'].mean():.1f} years"
+    if staffing is not None:
+        add_rolling_attrition_metrics(metrics, dept_metrics, staffing)
     
-    # Department-wise metrics
-    dept_metrics = df.groupby('department').agg({
-        'employee_id': 'count',
-        'attrition': lambda x: f"{x.mean() * 100:.1f}%",
-        'salary': lambda x: f"${x.mean():,.0f}",
-    })
+    return metrics, dept_metrics
+
+def format_metrics(metrics):
+    """Text of each overall metric for the metric cards
     
-    if 'satisfaction' in df.columns:
-        dept_metrics['satisfaction'] = df.groupby('department')['satisfaction'].agg(lambda x: f"{x.mean():.1f}")
+    Args:
+        metrics (dict): Metrics from calculate_metrics
+        
+    Returns:
+        dict: Formatted metrics, N/A for missing values
+    """
+    return {key: 'N/A' if pd.isna(value) else METRIC_FORMATS.get(key, '{}').format(value)
+            for key, value in metrics.items()}
+
+def add_rolling_attrition_metrics(metrics, dept_metrics, staffing):
+    """Add the latest trailing-12-month figures to the metrics in place
     
-    dept_metrics = dept_metrics.rename(columns={
-        'employee_id': 'Employee Count',
-        'attrition': 'Attrition Rate',
-        'salary': 'Avg. Salary',
-        'satisfaction': 'Avg. Satisfaction'
-    }).reset_index()
+    Args:
+        metrics (dict): Overall metrics from calculate_metrics
+        dept_metrics (pd.DataFrame): Department metrics from calculate_metrics
+        staffing (dict | pd.DataFrame): Staffing cube or monthly staffing table
+    """
+    latest = rolling_staffing_metrics(staffing)
+    if latest is None or len(latest) == 0:
+        return
+    latest = latest.iloc[-1]
+    metrics['ttm_attrition'] = latest['ttm_attrition_rate']
+    metrics['annualized_attrition'] = latest['annualized_attrition_rate']
+    metrics['avg_headcount_12m'] = latest['rolling_headcount']
     
-    return metrics, dept_metrics
+    if not isinstance(staffing, dict) or 'department' not in staffing['dimensions']:
+        return
+    by_dept = rolling_staffing_metrics(staffing, by='department')
+    by_dept = by_dept[by_dept['month'] == by_dept['month'].iloc[-1]].set_index('department')
+    departments = dept_metrics['department']
+    dept_metrics['ttm_attrition'] = departments.map(by_dept['ttm_attrition_rate']).astype(float)
+    dept_metrics['avg_headcount_12m'] = departments.map(by_dept['rolling_headcount']).astype(float)
 
 def load_branding_config(config_file=None):
     """Load branding configuration from a JSON file or return defaults"""
@@ -70,7 +131,15 @@ def load_branding_config(config_file=None):
     return default_config
 
 def generate_css(branding):
-    """Generate CSS based on branding configuration"""
+    """Generate CSS based on branding configuration
+    
+    The stylesheet is built once per distinct branding and reused after that.
+    """
+    return _branded_css(tuple(sorted(branding.items())))
+
+@lru_cache(maxsize=None)
+def _branded_css(branding_items):
+    branding = dict(branding_items)
     return f"""
     body {{ 
         font-family: {branding['font_family']}; 
@@ -288,3 +357,32 @@ def generate_css(branding):
         .recommendation-box {{ width: 100%; }}
     }}
     """
+
+def stylesheet_name(branding):
+    """File name of the branding stylesheet, with a hash of its content"""
+    css = generate_css(branding)
+    return f"hr-dashboard.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]}.css"
+
+def write_stylesheet(branding, assets_dir):
+    """Save the branding stylesheet as a file named after a hash of its content
+    
+    Reports with the same branding share one file, and a changed stylesheet
+    gets a new name, so browsers and CDNs can cache it indefinitely. Files of
+    earlier brandings are kept for the reports that still link them.
+    
+    Args:
+        branding (dict): Branding configuration
+        assets_dir (Path): Directory of the stylesheet files
+        
+    Returns:
+        str: File name of the stylesheet
+    """
+    file_name = stylesheet_name(branding)
+    stylesheet = Path(assets_dir) / file_name
+    if not stylesheet.exists():
+        stylesheet.parent.mkdir(parents=True, exist_ok=True)
+        partial = stylesheet.with_suffix('.tmp')
+        partial.write_text(generate_css(branding), encoding='utf-8')
+        os.replace(partial, stylesheet)
+        logger.info(f"Stylesheet saved to {stylesheet}")
+    return file_name
@@ -0,0 +1,252 @@
+import base64
+import io
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from PIL import Image
+from hr_visualizations import CHART_IMG_PATTERN
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Charts are saved at 300 dpi (about 3600 px wide) but shown in a 48% wide
+# column, so browsers pick from smaller copies: a 1x phone, a 1x desktop or
+# 2x phone, and a 2x desktop
+RESPONSIVE_WIDTHS = [480, 960, 1600]
+RESPONSIVE_FORMATS = ['png', 'webp']
+# Displayed width of a chart, matching the .chart-container rules in the CSS
+CHART_SIZES = '(max-width: 768px) 100vw, 48vw'
+
+# Bytes a browser may download for one report: the HTML plus, for each chart,
+# the largest image it could choose
+REPORT_BYTE_BUDGET = 2 * 1024 ** 2
+
+def _variant_file(name, width, variant_format):
+    return f"{name}-{width}w.{variant_format}"
+
+def _variant_widths(size, widths):
+    """Copy widths below a chart's own width, and the size of the largest copy"""
+    widths = [w for w in widths if w < size[0]] or [size[0]]
+    return widths, (widths[-1], round(size[1] * widths[-1] / size[0]))
+
+def _scaled_copies(image, widths, variant_format):
+    """Encode downscaled copies of a chart image, largest first
+
+    PNG copies are reduced to a 256 colour palette without dithering, which
+    keeps the flat colours and text of a chart sharp; WebP copies are lossy.
+
+    Yields:
+        tuple: Width and encoded bytes of each copy
+    """
+    size = image.size
+    # Scale each copy from the next larger one, which is faster than
+    # scaling every copy from the full-size image
+    scaled = image.convert('RGB')
+    for width in sorted(widths, reverse=True):
+        scaled = scaled.resize((width, round(size[1] * width / size[0])), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if variant_format == 'webp':
+            scaled.save(buffer, 'webp', quality=85)
+        else:
+            scaled.quantize(256, method=Image.FASTOCTREE, dither=Image.NONE).save(buffer, 'png', optimize=True)
+        yield width, buffer.getvalue()
+
+def _build_variants(name, images_dir, widths=RESPONSIVE_WIDTHS, variant_format='png'):
+    """Write downscaled copies of one chart, reusing copies newer than the chart
+
+    Returns:
+        tuple: Chart name, list of (file name, width) from small to large, and
+            the (width, height) of the largest copy
+    """
+    source = images_dir / f"{name}.png"
+    with Image.open(source) as image:
+        widths, largest = _variant_widths(image.size, widths)
+        variants = [(_variant_file(name, w, variant_format), w) for w in widths]
+        source_mtime = source.stat().st_mtime_ns
+        if all((images_dir / file).exists() and (images_dir / file).stat().st_mtime_ns >= source_mtime
+               for file, _ in variants):
+            return name, variants, largest
+
+        for width, data in _scaled_copies(image, widths, variant_format):
+            (images_dir / _variant_file(name, width, variant_format)).write_bytes(data)
+    return name, variants, largest
+
+def _variant_bytes(name, data, widths=RESPONSIVE_WIDTHS, variant_format='png'):
+    """Downscaled copies of one chart held in memory, as _build_variants"""
+    with Image.open(io.BytesIO(data)) as image:
+        widths, largest = _variant_widths(image.size, widths)
+        copies = {_variant_file(name, width, variant_format): copy
+                  for width, copy in _scaled_copies(image, widths, variant_format)}
+    return name, [(_variant_file(name, w, variant_format), w) for w in widths], largest, copies
+
+def build_chart_variants(names, images_dir, widths=RESPONSIVE_WIDTHS, variant_format='png', workers=None):
+    """Write small copies of rendered PNG charts for responsive <img> tags
+
+    Args:
+        names (list): Chart names, the PNG file names without extension
+        images_dir (Path): Directory holding the rendered charts
+        widths (list): Pixel widths of the copies; widths at or above a
+            chart's own width are left out
+        variant_format (str): 'png' for palette PNG copies or 'webp'
+        workers (int): Number of worker processes, defaults to one per CPU;
+            1 works in the current process
+
+    Returns:
+        dict: For each chart, its copies as (file name, width) from small to
+            large and the (width, height) of the largest one
+    """
+    if variant_format not in RESPONSIVE_FORMATS:
+        raise ValueError(f"Unknown image format: {variant_format}. Use one of {RESPONSIVE_FORMATS}")
+    images_dir = Path(images_dir)
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    if workers <= 1:
+        built = [_build_variants(name, images_dir, widths, variant_format) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(pool.map(_build_variants, names, repeat(images_dir), repeat(widths),
+                                  repeat(variant_format)))
+    return {name: {'variants': variants, 'size': size} for name, variants, size in built}
+
+def chart_variant_bytes(images, widths=RESPONSIVE_WIDTHS, variant_format='png', workers=None):
+    """Small copies of PNG charts held in memory, see build_chart_variants
+
+    Args:
+        images (dict): PNG bytes of each chart by its name
+        widths (list): Pixel widths of the copies
+        variant_format (str): 'png' for palette PNG copies or 'webp'
+        workers (int): Number of worker processes, defaults to one per CPU;
+            1 works in the current process
+
+    Returns:
+        tuple: The copies of each chart as returned by build_chart_variants,
+            and the bytes of every copy by its file name
+    """
+    if variant_format not in RESPONSIVE_FORMATS:
+        raise ValueError(f"Unknown image format: {variant_format}. Use one of {RESPONSIVE_FORMATS}")
+    workers = min(workers or os.cpu_count() or 1, len(images))
+    if workers <= 1:
+        built = [_variant_bytes(name, data, widths, variant_format) for name, data in images.items()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(pool.map(_variant_bytes, images.keys(), images.values(), repeat(widths),
+                                  repeat(variant_format)))
+    charts = {name: {'variants': variants, 'size': size} for name, variants, size, _ in built}
+    files = {file: data for _, _, _, copies in built for file, data in copies.items()}
+    return charts, files
+
+def responsive_chart_images(html, charts):
+    """Point the chart <img> tags of a report at small copies of each chart
+
+    Each tag gets a srcset of the copies so the browser downloads the one
+    closest to the displayed size, the intrinsic size to reserve its space,
+    and lazy loading so charts below the fold wait until they are scrolled to.
+
+    Args:
+        html (str): Report HTML referencing images/<name>.png charts
+        charts (dict): Copies of each chart from build_chart_variants
+
+    Returns:
+        str: HTML with responsive chart tags; tags of charts without copies
+            are left as they are
+    """
+    def rewrite(match):
+        chart = charts.get(match.group(1))
+        if chart is None:
+            return match.group(0)
+        variants = chart['variants']
+        srcset = ', '.join(f"images/{file} {width}w" for file, width in variants)
+        width, height = chart['size']
+        return (f'<img class="chart-img" src="images/{variants[len(variants) // 2][0]}" srcset="{srcset}" '
+                f'sizes="{CHART_SIZES}" width="{width}" height="{height}" loading="lazy" decoding="async" '
+                f'alt="{match.group(2)}">')
+
+    return re.sub(CHART_IMG_PATTERN, rewrite, html)
+
+def inline_chart_images(html, charts, files):
+    """Embed one copy of each chart in the report as a data URI
+
+    Each chart <img> tag gets the middle-sized copy, which browsers scale to
+    the displayed size, so the report is a single file.
+
+    Args:
+        html (str): Report HTML referencing images/<name>.png charts
+        charts (dict): Copies of each chart from chart_variant_bytes
+        files (dict): Bytes of each copy by its file name
+
+    Returns:
+        str: HTML with embedded charts; tags of charts without copies are
+            left as they are
+    """
+    def embed(match):
+        chart = charts.get(match.group(1))
+        if chart is None:
+            return match.group(0)
+        file = chart['variants'][len(chart['variants']) // 2][0]
+        data = base64.b64encode(files[file]).decode('ascii')
+        width, height = chart['size']
+        return (f'<img class="chart-img" src="data:image/{Path(file).suffix[1:]};base64,{data}" '
+                f'width="{width}" height="{height}" alt="{match.group(2)}">')
+
+    return re.sub(CHART_IMG_PATTERN, embed, html)
+
+def report_bytes(html, report_dir, assets=None):
+    """Most bytes a browser can download for a report
+
+    Counts the HTML, its linked stylesheets and, for each <img> tag, the
+    largest local image it references, whichever srcset candidate the
+    browser picks.
+
+    Args:
+        html (str): Report HTML
+        report_dir (Path): Directory of the report file, which its links
+            are relative to
+        assets (dict): Bytes of each linked file by its path relative to the
+            report, read instead of report_dir for a report held in memory
+
+    Returns:
+        int: Size in bytes
+    """
+    def file_size(file):
+        if assets is not None:
+            return len(assets[file]) if file in assets else 0
+        path = Path(report_dir) / file
+        return path.stat().st_size if path.exists() else 0
+
+    total = len(html.encode('utf-8'))
+    for tag in re.findall(r'<img\b[^>]*>', html):
+        total += max(map(file_size, re.findall(r'images/[\w.-]+', tag)), default=0)
+    for href in re.findall(r'<link rel="stylesheet" href="([^"]+)">', html):
+        total += file_size(href)
+    return total
+
+def within_byte_budget(sections, report_dir, byte_budget=REPORT_BYTE_BUDGET, assets=None):
+    """Pass report sections through, failing after the last one when the
+    report is heavier than its byte budget
+
+    Args:
+        sections (iterable): HTML strings of a report, in page order
+        report_dir (Path): Directory of the report file
+        byte_budget (int): Largest allowed report_bytes, None for no limit
+        assets (dict): Linked files of a report held in memory, see report_bytes
+
+    Yields:
+        str: Each section, unchanged
+    """
+    size = 0
+    for section in sections:
+        size += report_bytes(section, report_dir, assets)
+        yield section
+    if byte_budget is None:
+        logger.info(f"Report size: {size / 1024:.0f} KB")
+    elif size > byte_budget:
+        raise ValueError(f"Report size {size / 1024:.0f} KB exceeds the byte budget of {byte_budget / 1024:.0f} KB")
+    else:
+        logger.info(f"Report size: {size / 1024:.0f} KB of the {byte_budget / 1024:.0f} KB budget")
@@ -0,0 +1,202 @@
+import os
+from pathlib import Path
+
+# Report templates are parsed once here and filled with str.format; a report
+# is a sequence of sections written to the file one at a time, so no step
+# keeps re-copying the growing page
+PAGE_START = """<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+{styles}</head>
+<body>
+"""
+
+STYLE = """    <style>
+{css}
+    </style>
+"""
+
+STYLESHEET_LINK = """    <link rel="stylesheet" href="{href}">
+"""
+
+PAGE_END = """</body>
+</html>
+"""
+
+METRIC_CARD = """        <div class="metric-card">
+            <div class="metric-value">{value}</div>
+            <div class="metric-label">{label}</div>
+        </div>
+"""
+
+CHART = """            <div class="chart-container"{style}>
+                <h3>{title}</h3>
+                <img class="chart-img" src="images/{name}.png" alt="{alt}">
+{note}            </div>
+"""
+
+SECTION = """    <div class="section{css_class}">
+        <h2>{title}</h2>
+{body}    </div>
+"""
+
+TABLE = """<table{css_class}>
+    <thead>
+        <tr>{headers}</tr>
+    </thead>
+    <tbody>
+{rows}
+    </tbody>
+</table>
+"""
+
+FOOTER = """    <div class="footer">
+{lines}    </div>
+"""
+
+def metric_cards(cards):
+    """Row of metric cards
+
+    Args:
+        cards (list): (value, label) pairs
+
+    Returns:
+        str: HTML of the row
+    """
+    cards = ''.join(METRIC_CARD.format(value=value, label=label) for value, label in cards)
+    return f'    <div class="metrics-row">\n{cards}    </div>\n'
+
+def chart(name, title, alt=None, note=None, full_width=False):
+    """Chart card linking images/<name>.png
+
+    Args:
+        name (str): Image file name without extension
+        title (str): Heading above the chart
+        alt (str): Alternative text, defaults to the title
+        note (str): Small print below the chart
+        full_width (bool): Span the whole row instead of half of it
+
+    Returns:
+        str: HTML of the card
+    """
+    return CHART.format(name=name, title=title, alt=alt or title,
+                        style=' style="width: 100%;"' if full_width else '',
+                        note=f'                <p><small>{note}</small></p>\n' if note else '')
+
+def charts_row(*charts):
+    """Row of chart cards, two to a row on wide screens"""
+    return '        <div class="charts-row">\n' + ''.join(charts) + '        </div>\n'
+
+def section(title, *parts, css_class=None, description=None):
+    """Report section with a heading
+
+    Args:
+        title (str): Section heading
+        *parts (str): HTML of the section body, in order; empty parts are skipped
+        css_class (str): Extra class of the section element
+        description (str): Introductory paragraph below the heading
+
+    Returns:
+        str: HTML of the section
+    """
+    if description:
+        parts = (f'        <p class="section-description">{description}</p>\n',) + parts
+    return SECTION.format(title=title, body=''.join(part for part in parts if part),
+                          css_class=f' {css_class}' if css_class else '')
+
+def table_block(title, table):
+    """Titled table that scrolls sideways on narrow screens"""
+    return f'''        <h3>{title}</h3>
+        <div class="table-responsive">
+{table}        </div>
+'''
+
+def footer(*lines):
+    """Page footer with one paragraph per line"""
+    return FOOTER.format(lines=''.join(f'        <p>{line}</p>\n' for line in lines))
+
+def table_column(values, fmt='{}', na='N/A'):
+    """Format a column of table cells at once
+
+    Args:
+        values (pd.Series): Cell values
+        fmt (str): Format of present values
+        na (str): Text of missing values
+
+    Returns:
+        list: Cell texts
+    """
+    return values.map(fmt.format, na_action='ignore').fillna(na).tolist()
+
+def html_table(headers, columns, row_template=None, css_class=None):
+    """HTML table built from column arrays rather than row by row
+
+    Args:
+        headers (list): Column headings
+        columns (list): One list of cell values per placeholder of the row
+            template, all of the same length
+        row_template (str): Format of a row with one {} per column, defaults
+            to a plain <td>{}</td> per column
+        css_class (str): Class of the table element
+
+    Returns:
+        str: HTML of the table
+    """
+    if row_template is None:
+        row_template = '<tr>' + '<td>{}</td>' * len(columns) + '</tr>'
+    return TABLE.format(headers=''.join(f'<th>{header}</th>' for header in headers),
+                        rows='\n'.join(map(row_template.format, *columns)),
+                        css_class=f' class="{css_class}"' if css_class else '')
+
+# Columns of the department table: metric, heading and cell format
+DEPARTMENT_COLUMNS = [
+    ('employee_count', 'Employee Count', '{}'),
+    ('attrition_rate', 'Attrition Rate', '{:.1f}%'),
+    ('avg_salary', 'Avg. Salary', '${:,.0f}'),
+    ('avg_satisfaction', 'Avg. Satisfaction', '{:.1f}'),
+    ('ttm_attrition', 'TTM Attrition', '{:.1f}%'),
+    ('avg_headcount_12m', 'Avg. Headcount (12M)', '{:,.0f}'),
+]
+
+def department_metrics_table(dept_metrics):
+    """Table of the per-department metrics from calculate_metrics
+
+    Satisfaction and trailing-12-month columns are shown when present.
+
+    Args:
+        dept_metrics (pd.DataFrame): One row per department, numeric metrics
+
+    Returns:
+        str: HTML of the table
+    """
+    columns = [column for column in DEPARTMENT_COLUMNS if column[0] in dept_metrics.columns]
+    return html_table(['Department'] + [heading for _, heading, _ in columns],
+                      [table_column(dept_metrics['department'])] +
+                      [table_column(dept_metrics[name], fmt) for name, _, fmt in columns])
+
+def write_report(file_path, sections):
+    """Write report sections to a file as they are produced
+
+    The sections go to a temporary file that replaces file_path only once
+    every section is written, so a failure part way leaves the previous
+    report in place.
+
+    Args:
+        file_path (Path): Report file
+        sections (iterable): HTML strings, in page order
+
+    Returns:
+        Path: The report file
+    """
+    file_path = Path(file_path)
+    partial = file_path.with_suffix('.tmp')
+    try:
+        with open(partial, 'w', encoding='utf-8') as f:
+            f.writelines(sections)
+        os.replace(partial, file_path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return file_path
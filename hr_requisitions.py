@@ -0,0 +1,323 @@
+import logging
+import numpy as np
+import pandas as pd
+from hr_staffing_tracker import monthly_event_counts
+from hr_visualizations import chart_task, render_charts
+from hr_report_templates import html_table, table_column
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Columns of a requisitions export; filled_date is empty while a role is open
+REQUISITION_COLUMNS = ['requisition_id', 'department', 'position', 'open_date', 'filled_date']
+
+REFERENCE_DATE = pd.Timestamp('2025-06-08')  # Today's date for reference
+
+def load_requisitions(file_path):
+    """Load requisitions from a CSV or Excel file
+
+    Args:
+        file_path (str): Path to a file with the REQUISITION_COLUMNS columns
+
+    Returns:
+        pd.DataFrame: Requisitions with open_date and filled_date parsed
+    """
+    logger.info(f"Loading requisitions from {file_path}")
+    if str(file_path).endswith('.csv'):
+        requisitions = pd.read_csv(file_path)
+    elif str(file_path).endswith(('.xlsx', '.xls')):
+        requisitions = pd.read_excel(file_path)
+    else:
+        logger.error("Unsupported file format. Please provide a CSV or Excel file.")
+        raise ValueError("Unsupported file format")
+
+    missing_columns = [col for col in REQUISITION_COLUMNS if col not in requisitions.columns]
+    if missing_columns:
+        raise ValueError(f"Requisitions are missing required columns: {missing_columns}")
+
+    requisitions['open_date'] = pd.to_datetime(requisitions['open_date'])
+    requisitions['filled_date'] = pd.to_datetime(requisitions['filled_date'])
+    return requisitions
+
+def requisition_months(requisitions, reference_date=REFERENCE_DATE):
+    """Month start dates from the first requisition opening to the latest date"""
+    # Series.max skips NaT, which filled_date is throughout while every role is open
+    last_date = pd.Series([requisitions['filled_date'].max(), requisitions['open_date'].max(),
+                           reference_date]).max()
+    return pd.date_range(requisitions['open_date'].min().replace(day=1), last_date, freq='MS')
+
+def vacancy_counts(requisitions, months_range=None, by=None):
+    """Requisitions opened, filled and still open at the end of every month
+
+    Uses the same event sweep as the monthly staffing history: openings and
+    fills are binned by month once and open vacancies are a running total.
+
+    Args:
+        requisitions (pd.DataFrame): Requisitions with open_date and filled_date
+        months_range (pd.DatetimeIndex): Month start dates, defaults to the
+            months covered by the requisitions
+        by (str): Optional column to count separately, e.g. 'department'
+
+    Returns:
+        pd.DataFrame: month, the by column, opened, filled and open_vacancies
+    """
+    if months_range is None:
+        months_range = requisition_months(requisitions)
+
+    if by is None:
+        codes, levels = None, [None]
+    else:
+        codes, levels = pd.factorize(requisitions[by], sort=True)
+        requisitions = requisitions[codes >= 0]
+        codes = codes[codes >= 0]
+    open_vacancies, opened, filled = monthly_event_counts(
+        requisitions['open_date'], requisitions['filled_date'], months_range, codes, len(levels))
+
+    n_groups = len(levels)
+    data = {'month': np.repeat(months_range.strftime('%Y-%m'), n_groups)}
+    if by is not None:
+        data[by] = np.tile(np.asarray(levels), len(months_range))
+    data['opened'] = np.ravel(opened)
+    data['filled'] = np.ravel(filled)
+    data['open_vacancies'] = np.ravel(open_vacancies)
+    return pd.DataFrame(data)
+
+def time_to_fill(requisitions, by='department'):
+    """Time-to-fill distribution of filled requisitions
+
+    Args:
+        requisitions (pd.DataFrame): Requisitions with open_date and filled_date
+        by (str | list): Columns to summarise by, None for one overall row
+
+    Returns:
+        pd.DataFrame: Requisitions, filled count, fill rate and the mean,
+        median, 75th and 90th percentile days to fill per group; for
+        requisitions from match_requisitions_to_hires also the matched hires
+        and the median days from opening to their start date
+    """
+    days = (requisitions['filled_date'] - requisitions['open_date']).dt.days
+    frame = requisitions.assign(days_to_fill=days.where(days >= 0))
+    keys = by if by is not None else np.zeros(len(frame), dtype=int)
+    grouped = frame.groupby(keys, observed=True)['days_to_fill']
+
+    summary = pd.DataFrame({
+        'requisitions': grouped.size(),
+        'filled': grouped.count(),
+        'mean_days': grouped.mean().round(1),
+        'median_days': grouped.median(),
+        'p75_days': grouped.quantile(0.75),
+        'p90_days': grouped.quantile(0.9),
+    })
+    summary.insert(2, 'fill_rate', (summary['filled'] / summary['requisitions'] * 100).round(1))
+    if 'hire_date' in frame.columns:
+        start_days = (frame['hire_date'] - frame['open_date']).dt.days
+        started = frame.assign(days_to_start=start_days.where(start_days >= 0)).groupby(keys, observed=True)['days_to_start']
+        summary['hired'] = started.count()
+        summary['median_days_to_start'] = started.median()
+    return summary.reset_index(drop=by is None)
+
+def _match_keys(requisitions, df):
+    """Integer (department, position) keys shared by requisitions and employees"""
+    keys = []
+    for col in ('department', 'position'):
+        levels = pd.Index(pd.unique(np.concatenate([
+            requisitions[col].dropna().unique().astype(object), df[col].dropna().unique().astype(object)])))
+        keys.append((levels.get_indexer(requisitions[col]), levels.get_indexer(df[col]), len(levels)))
+    (req_dept, emp_dept, _), (req_pos, emp_pos, n_positions) = keys
+    return req_dept * n_positions + req_pos, emp_dept * n_positions + emp_pos
+
+def match_requisitions_to_hires(requisitions, df, tolerance_days=90, max_rounds=10):
+    """Link each filled requisition to the hire that filled it
+
+    Requisitions and hires are sorted by date once and joined with an as-of
+    merge: each requisition takes the first hire into the same department
+    and position on or after its filled date, within tolerance_days. When
+    several requisitions reach the same hire, the earliest filled one keeps it
+    and the rest are merged again against the remaining hires.
+
+    Args:
+        requisitions (pd.DataFrame): Requisitions with department, position
+            and filled_date
+        df (pd.DataFrame): DataFrame with HR data including employee_id,
+            department, position and hire_date
+        tolerance_days (int): Longest gap between filling a role and the hire date
+        max_rounds (int): Most as-of merge rounds for requisitions that lost a hire
+
+    Returns:
+        pd.DataFrame: requisitions with employee_id, hire_date and
+        days_to_start added (missing when no hire matched)
+    """
+    req_key, emp_key = _match_keys(requisitions, df)
+    pending = pd.DataFrame({
+        'row': np.arange(len(requisitions)),
+        'key': req_key,
+        'filled_date': pd.to_datetime(requisitions['filled_date']).to_numpy().astype('datetime64[ns]'),
+    })
+    pending = pending[(pending['key'] >= 0) & pending['filled_date'].notna()].sort_values('filled_date')
+    hires = pd.DataFrame({
+        'hire_row': np.arange(len(df)),
+        'key': emp_key,
+        'hire_date': pd.to_datetime(df['hire_date']).to_numpy().astype('datetime64[ns]'),
+    })
+    hires = hires[(hires['key'] >= 0) & hires['hire_date'].notna()].sort_values('hire_date')
+
+    # One hire fills at most one requisition: the earliest filled claim wins
+    # and the others retry against the hires still available
+    matches = []
+    for _ in range(max_rounds):
+        claims = pd.merge_asof(pending, hires, left_on='filled_date', right_on='hire_date', by='key',
+                               direction='forward', tolerance=pd.Timedelta(days=tolerance_days))
+        claims = claims[claims['hire_row'].notna()]
+        won = claims[~claims['hire_row'].duplicated()]
+        matches.append(won[['row', 'hire_row']])
+        if len(won) == len(claims):
+            break
+        pending = pending[~pending['row'].isin(won['row'])]
+        hires = hires[~hires['hire_row'].isin(won['hire_row'])]
+    matches = pd.concat(matches)
+    hire_row = pd.Series(matches['hire_row'].to_numpy(dtype=np.int64), index=matches['row'].to_numpy()) \
+        .reindex(np.arange(len(requisitions)), fill_value=-1).to_numpy()
+
+    # Unmatched requisitions have hire_row -1, which reindexes to missing
+    result = requisitions.copy()
+    result['employee_id'] = df['employee_id'].reset_index(drop=True).reindex(hire_row).to_numpy()
+    result['hire_date'] = pd.to_datetime(df['hire_date']).reset_index(drop=True).reindex(hire_row).to_numpy()
+    result['days_to_start'] = (result['hire_date'] - result['filled_date']).dt.days
+    logger.info(f"Matched {result['employee_id'].notna().sum():,} of "
+                f"{requisitions['filled_date'].notna().sum():,} filled requisitions to hires")
+    return result
+
+def recommend_hiring_months(requisitions, monthly_df=None):
+    """Best and worst calendar months to open requisitions, from fill times
+
+    Months are ranked by the median days to fill of requisitions opened in
+    them, with the seasonal net growth (joiners - leavers) as a tie-breaker.
+    Requisitions from match_requisitions_to_hires are ranked by the days to
+    the start date of the matched hire instead, leaving out those without one.
+
+    Args:
+        requisitions (pd.DataFrame): Requisitions with open_date and filled_date
+        monthly_df (pd.DataFrame): Optional monthly staffing data
+
+    Returns:
+        tuple: (best months, worst months, median days to fill, or to start,
+        overall)
+    """
+    if 'hire_date' in requisitions.columns and requisitions['hire_date'].notna().any():
+        requisitions = requisitions.assign(filled_date=requisitions['hire_date'])
+    month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    by_month = time_to_fill(requisitions.assign(open_month=requisitions['open_date'].dt.month), by='open_month')
+    by_month = by_month[by_month['filled'] > 0].set_index('open_month')
+
+    net_growth = pd.Series(0.0, index=by_month.index)
+    if monthly_df is not None and len(monthly_df) > 0:
+        calendar_month = pd.to_datetime(monthly_df['month']).dt.month
+        seasonal = (monthly_df['joiners'] - monthly_df['leavers']).groupby(calendar_month.to_numpy()).mean()
+        net_growth = seasonal.reindex(by_month.index).fillna(0)
+
+    ranking = pd.DataFrame({'median_days': by_month['median_days'], 'net_growth': -net_growth})
+    ranked = ranking.sort_values(['median_days', 'net_growth']).index
+    best_months = [month_order[m - 1] for m in ranked[:3]]
+    worst_months = [month_order[m - 1] for m in ranked[::-1][:3]]
+    overall = (requisitions['filled_date'] - requisitions['open_date']).dt.days
+    return best_months, worst_months, float(overall[overall >= 0].median())
+
+# 1. Open vacancies with requisitions opened and filled
+def _draw_open_vacancies(fig, vacancies):
+    ax = fig.add_subplot()
+    x = np.arange(len(vacancies))
+    width = 0.35
+    ax.bar(x - width/2, vacancies['opened'], width, label='Opened', color='#1f77b4')
+    ax.bar(x + width/2, vacancies['filled'], width, label='Filled', color='#2ca02c')
+    ax.plot(x, vacancies['open_vacancies'], marker='o', linewidth=2, color='#d62728', label='Open Vacancies')
+    ax.set_title('Requisitions and Open Vacancies (Last 36 Months)', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Requisitions', fontsize=12)
+    ax.set_xticks(x, vacancies['month'], rotation=45)
+    ax.legend()
+    ax.grid(True, axis='y')
+    fig.tight_layout()
+
+# 2. Time to fill distribution by department
+def _draw_time_to_fill(fig, departments, days_to_fill):
+    ax = fig.add_subplot()
+    ax.boxplot(days_to_fill, showfliers=False)
+    ax.set_xticks(np.arange(1, len(departments) + 1), departments, rotation=45)
+    ax.set_title('Time to Fill by Department', fontsize=16)
+    ax.set_xlabel('Department', fontsize=12)
+    ax.set_ylabel('Days from Opening to Fill', fontsize=12)
+    fig.tight_layout()
+
+def requisition_chart_tasks(requisitions, months_range=None):
+    """Build the open vacancy and time-to-fill chart tasks
+
+    Args:
+        requisitions (pd.DataFrame): Requisitions with open_date and filled_date
+        months_range (pd.DatetimeIndex): Month start dates to chart
+
+    Returns:
+        tuple: Time-to-fill summary by department and the tasks for
+        render_charts, or None without requisitions
+    """
+    if requisitions is None or len(requisitions) == 0:
+        logger.warning("No requisitions available for visualization")
+        return None
+
+    vacancies = vacancy_counts(requisitions, months_range).tail(36)
+    days = (requisitions['filled_date'] - requisitions['open_date']).dt.days
+    filled = requisitions.assign(days_to_fill=days)[days >= 0]
+    departments = sorted(filled['department'].dropna().unique())
+    days_to_fill = [filled.loc[filled['department'] == dept, 'days_to_fill'].to_numpy() for dept in departments]
+    tasks = [
+        chart_task('open_vacancies.png', _draw_open_vacancies, (12, 6), vacancies),
+        chart_task('time_to_fill.png', _draw_time_to_fill, (12, 6), departments, days_to_fill),
+    ]
+    return time_to_fill(requisitions), tasks
+
+def create_requisition_visualizations(requisitions, images_dir, months_range=None, workers=None):
+    """Create open vacancy and time-to-fill charts
+
+    Args:
+        requisitions (pd.DataFrame): Requisitions with open_date and filled_date
+        images_dir (Path): Directory to save images
+        months_range (pd.DatetimeIndex): Month start dates to chart
+        workers (int): Number of chart rendering processes, defaults to one per CPU
+
+    Returns:
+        pd.DataFrame: Time-to-fill summary by department
+    """
+    analysis = requisition_chart_tasks(requisitions, months_range)
+    if analysis is None:
+        return None
+
+    logger.info("Creating requisition visualizations")
+    summary, tasks = analysis
+    render_charts(tasks, images_dir, workers)
+    return summary
+
+def create_time_to_fill_table(summary):
+    """Create HTML table with time-to-fill per department
+
+    Args:
+        summary (pd.DataFrame): Summary from time_to_fill
+
+    Returns:
+        str: HTML table with requisition counts, fill rate and days to fill,
+        and the matched hires and days to their start when the summary has them
+    """
+    if summary is None or len(summary) == 0:
+        return "<p>No requisition data available</p>"
+
+    headers = ['Department', 'Requisitions', 'Filled', 'Fill Rate', 'Median Days', '90th Percentile Days']
+    columns = [table_column(summary['department']), table_column(summary['requisitions']),
+               table_column(summary['filled']), table_column(summary['fill_rate'], '{}%'),
+               table_column(summary['median_days'], '{:.0f}'), table_column(summary['p90_days'], '{:.0f}')]
+    if 'hired' in summary.columns:
+        headers += ['Matched Hires', 'Median Days to Start']
+        columns += [table_column(summary['hired']), table_column(summary['median_days_to_start'], '{:.0f}')]
+    return html_table(headers, columns, css_class='staffing-table')
@@ -0,0 +1,258 @@
+import logging
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from hr_staffing_tracker import prepare_staffing_dates, month_ordinals
+from hr_visualizations import chart_task, render_charts
+from hr_report_templates import html_table, table_column
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+def employment_spans(df, by=None):
+    """Months each employee was observed for, grouped for vectorized counting
+
+    A leaver who exits L months after their hire month was retained at the end
+    of months 0..L-1 after hire. A current employee hired O months before the
+    last reported month is retained through month O and censored after it.
+
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        by (str): Optional column to group employees by, e.g. 'department'
+
+    Returns:
+        dict: 'hire' month ordinals, 'left' flags, 'months' retained or
+        observed, group 'codes' and 'groups' labels, and the 'last_month'
+        ordinal, or None if the data has no hire dates
+    """
+    months_range = prepare_staffing_dates(df)
+    if months_range is None:
+        return None
+
+    last_month = month_ordinals(months_range[-1:])[0]
+    hire = month_ordinals(df['hire_date'])
+    exit_month = month_ordinals(df['exit_date'])
+    left = ~np.isnan(exit_month)
+    months = np.where(left, exit_month, last_month) - hire
+
+    # Records without a hire date or with an exit before the hire are skipped
+    valid = ~np.isnan(hire) & (months >= 0)
+    if by is not None:
+        codes, groups = pd.factorize(df[by], sort=True)
+        valid &= codes >= 0
+    else:
+        codes, groups = np.zeros(len(df), dtype=np.int64), pd.Index(['All'])
+
+    return {
+        'hire': hire[valid].astype(np.int64),
+        'left': left[valid],
+        'months': months[valid].astype(np.int64),
+        'codes': codes[valid].astype(np.int64),
+        'groups': list(groups),
+        'last_month': int(last_month),
+    }
+
+def _grouped_counts(codes, values, n_groups, length):
+    """Count (group, value) pairs into a (n_groups, length) array"""
+    values = np.minimum(values, length - 1)
+    return np.bincount(codes * length + values, minlength=n_groups * length).reshape(n_groups, length)
+
+def _reverse_cumsum(counts):
+    """Number of entries with value >= k along the last axis"""
+    return np.cumsum(counts[..., ::-1], axis=-1)[..., ::-1]
+
+def retention_curves(df, by='department', max_months=None):
+    """Kaplan-Meier retention curves by months since hire
+
+    All groups are estimated together: leavers and censored current employees
+    are counted per (group, month) with one bincount each, at-risk counts come
+    from reverse cumulative sums and the survival product is a cumprod, so
+    the cost is O(N + groups x months) whatever the number of groups.
+
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        by (str): Column to estimate separate curves for, None for one overall curve
+        max_months (int): Longest tenure to report, defaults to the longest observed
+
+    Returns:
+        pd.DataFrame: Share of employees still employed k months after their hire
+        month, one column per group plus 'All', indexed by months since hire
+    """
+    spans = employment_spans(df, by if by in df.columns else None)
+    if spans is None or len(spans['months']) == 0:
+        return None
+
+    length = int(spans['months'].max()) + 1
+    if max_months is not None:
+        length = min(length, max_months + 1)
+
+    groups = spans['groups']
+    n_groups = len(groups)
+    # Overall curve goes in an extra last group
+    codes = np.concatenate([spans['codes'], np.full(len(spans['codes']), n_groups)])
+    months = np.tile(spans['months'], 2)
+    left = np.tile(spans['left'], 2)
+
+    # Leavers are at risk up to their exit month, censored employees through
+    # the last observed month; events beyond the reported range are dropped
+    events = _grouped_counts(codes[left], months[left], n_groups + 1, length + 1)[:, :length]
+    at_risk = (_reverse_cumsum(_grouped_counts(codes, months, n_groups + 1, length + 1)))[:, :length]
+
+    hazard = np.divide(events, at_risk, out=np.zeros(events.shape), where=at_risk > 0)
+    survival = np.cumprod(1 - hazard, axis=1)
+    survival[at_risk == 0] = np.nan
+
+    columns = groups + ['All'] if by in df.columns else ['All']
+    rows = survival if by in df.columns else survival[-1:]
+    return pd.DataFrame(rows.T, index=pd.RangeIndex(length, name='months_since_hire'), columns=columns)
+
+def cohort_retention_matrix(df, cohort_freq='Y', max_months=36, by=None):
+    """Share of each hire cohort still employed k months after hire
+
+    Each member only counts towards the months since hire that have already
+    been observed for them, so recent cohorts have shorter rows.
+
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        cohort_freq (str): Cohort length: 'M' (month), 'Q' (quarter) or 'Y' (year)
+        max_months (int): Number of months since hire to report
+        by (str): Optional column to build one matrix per group in the same pass
+
+    Returns:
+        pd.DataFrame: Cohorts as rows, months since hire as columns; a dict of
+        such frames keyed by group when by is given
+    """
+    spans = employment_spans(df, by)
+    if spans is None or len(spans['months']) == 0:
+        return None
+
+    months_per_cohort = {'M': 1, 'Q': 3, 'Y': 12}[cohort_freq]
+    cohort_ord = spans['hire'] // months_per_cohort * months_per_cohort
+    cohort_idx = (cohort_ord - cohort_ord.min()) // months_per_cohort
+    n_cohorts = int(cohort_idx.max()) + 1
+    n_groups = len(spans['groups'])
+    length = max_months + 1
+    cells = spans['codes'] * n_cohorts + cohort_idx
+
+    # Retained at month k after hire: leavers with exit month > k, current
+    # employees observed through k; observed: k within the observed months
+    observed_months = spans['last_month'] - spans['hire']
+    retained_until = np.where(spans['left'], spans['months'], observed_months + 1)
+    retained = _reverse_cumsum(_grouped_counts(cells, retained_until, n_groups * n_cohorts, length + 1))[:, 1:]
+    observed = _reverse_cumsum(_grouped_counts(cells, observed_months, n_groups * n_cohorts, length))
+
+    share = np.divide(retained, observed, out=np.full(observed.shape, np.nan), where=observed > 0)
+    share = share.reshape(n_groups, n_cohorts, length)
+
+    first = pd.Period(ordinal=0, freq='M') + int(cohort_ord.min()) - 1970 * 12
+    labels = [str((first + i * months_per_cohort).asfreq(cohort_freq)) for i in range(n_cohorts)]
+    frames = {
+        group: pd.DataFrame(share[g], index=pd.Index(labels, name='cohort'),
+                            columns=pd.RangeIndex(length, name='months_since_hire')).dropna(how='all')
+        for g, group in enumerate(spans['groups'])
+    }
+    return frames if by is not None else frames['All']
+
+# 1. Kaplan-Meier retention curves
+def _draw_retention_curves(fig, curves):
+    ax = fig.add_subplot()
+    for column in curves.columns:
+        if column == 'All':
+            ax.plot(curves.index, curves[column] * 100, color='black', linewidth=3, linestyle='--', label='All employees')
+        else:
+            ax.plot(curves.index, curves[column] * 100, linewidth=2, label=column)
+    ax.set_title('Employee Retention by Months Since Hire', fontsize=16)
+    ax.set_xlabel('Months Since Hire', fontsize=12)
+    ax.set_ylabel('Still Employed (%)', fontsize=12)
+    ax.set_ylim(0, 100)
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+
+# 2. Cohort retention heatmap
+def _draw_cohort_retention(fig, matrix):
+    ax = fig.add_subplot()
+    sns.heatmap(
+        matrix * 100,
+        annot=True,
+        fmt='.0f',
+        cmap='RdYlGn',
+        vmin=0,
+        vmax=100,
+        cbar_kws={'label': 'Still Employed (%)'},
+        ax=ax
+    )
+    ax.set_title('Retention by Hire Cohort', fontsize=16)
+    ax.set_xlabel('Months Since Hire', fontsize=12)
+    ax.set_ylabel('Hire Year', fontsize=12)
+    fig.tight_layout()
+
+def retention_chart_tasks(df, by='department'):
+    """Build the retention curve and cohort retention chart tasks
+
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        by (str): Column to draw one retention curve per group for
+
+    Returns:
+        tuple: 12, 24 and 36 month retention per group and the tasks for
+        render_charts, or None if the data has no hire dates
+    """
+    curves = retention_curves(df, by=by, max_months=120)
+    if curves is None:
+        logger.warning("No hire dates available for retention analysis")
+        return None
+
+    tasks = [chart_task('retention_curves.png', _draw_retention_curves, (12, 6), curves)]
+    matrix = cohort_retention_matrix(df, cohort_freq='Y', max_months=36)
+    if matrix is not None and len(matrix) > 0:
+        tasks.append(chart_task('cohort_retention.png', _draw_cohort_retention, (14, 6), matrix[list(range(0, 37, 3))]))
+
+    milestones = [m for m in (12, 24, 36) if m in curves.index]
+    summary = (curves.loc[milestones].T * 100).round(1)
+    summary.columns = [f"{m}-Month Retention" for m in milestones]
+    return summary.rename_axis(by if by in df.columns else 'group').reset_index(), tasks
+
+def create_retention_visualizations(df, images_dir, by='department', workers=None):
+    """Create retention curve and cohort retention charts
+
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        images_dir (Path): Directory to save images
+        workers (int): Number of chart rendering processes, defaults to one per CPU
+
+    Returns:
+        pd.DataFrame: 12, 24 and 36 month retention per group, or None if the
+        data has no hire dates
+    """
+    analysis = retention_chart_tasks(df, by)
+    if analysis is None:
+        return None
+
+    logger.info("Creating retention visualizations")
+    summary, tasks = analysis
+    render_charts(tasks, images_dir, workers)
+    return summary
+
+def create_retention_table(summary):
+    """Create HTML table with milestone retention per group
+
+    Args:
+        summary (pd.DataFrame): Summary from create_retention_visualizations
+
+    Returns:
+        str: HTML table with 12, 24 and 36 month retention
+    """
+    if summary is None or len(summary) == 0:
+        return "<p>No retention data available</p>"
+
+    group = summary.columns[0]
+    return html_table([str(group).title()] + list(summary.columns[1:]),
+                      [table_column(summary[group])] + [table_column(summary[column], '{}%')
+                                                        for column in summary.columns[1:]],
+                      css_class='staffing-table')
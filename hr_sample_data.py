@@ -0,0 +1,237 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+REFERENCE_DATE = pd.Timestamp('2025-06-08')  # Today's date for reference
+
+DEPARTMENTS = ['Engineering', 'Marketing', 'Sales', 'HR', 'Finance']
+DEPARTMENT_WEIGHTS = [0.3, 0.2, 0.25, 0.1, 0.15]
+POSITIONS = ['Manager', 'Senior', 'Mid-level', 'Junior', 'Intern']
+POSITION_WEIGHTS = [0.1, 0.2, 0.4, 0.2, 0.1]
+POSITION_PAY = [1.4, 1.2, 1.0, 0.8, 0.5]
+EDUCATION = ["Bachelor's", "Master's", 'PhD', 'High School']
+EDUCATION_WEIGHTS = [0.4, 0.45, 0.05, 0.1]
+GENDERS = ['Male', 'Female', 'Other']
+GENDER_WEIGHTS = [0.52, 0.45, 0.03]
+
+def generate_sample_data(n_employees=100, seed=42, reference_date=REFERENCE_DATE, attrition_rate=0.15,
+                         start_id=1, rng=None):
+    """Generate a synthetic workforce with hire and exit histories
+
+    Every column is drawn with one vectorized call on a np.random.Generator,
+    so the cost is linear in n_employees with no per-row Python work.
+
+    Args:
+        n_employees (int): Number of employee records to generate
+        seed (int): Seed for the random generator, ignored when rng is given
+        reference_date (pd.Timestamp): "Today" for hire/exit dates and tenure
+        attrition_rate (float): Share of employees who have left
+        start_id (int): First employee_id, for generating data in chunks
+        rng (np.random.Generator): Random generator to draw from
+
+    Returns:
+        pd.DataFrame: DataFrame containing HR data
+    """
+    rng = np.random.default_rng(seed) if rng is None else rng
+    n = n_employees
+
+    # Hires spread over up to 15 years, leavers exit somewhere in their span
+    hire_days_ago = (rng.gamma(3, 1, n) * 365.25).clip(0, 15 * 365.25).astype(np.int64)
+    attrition = (rng.random(n) < attrition_rate).astype(np.int64)
+    exit_days_ago = np.where(attrition == 1, (hire_days_ago * rng.random(n)).astype(np.int64), 0)
+    tenure = ((hire_days_ago - exit_days_ago) / 365.25).astype(np.int64)
+
+    hire_date = reference_date - pd.to_timedelta(hire_days_ago, unit='D')
+    exit_date = (reference_date - pd.to_timedelta(exit_days_ago, unit='D')).where(attrition == 1)
+
+    position = rng.choice(len(POSITIONS), n, p=POSITION_WEIGHTS)
+    salary = rng.normal(75000, 25000, n) * np.take(POSITION_PAY, position)
+
+    return pd.DataFrame({
+        'employee_id': np.arange(start_id, start_id + n),
+        'department': pd.Categorical.from_codes(rng.choice(len(DEPARTMENTS), n, p=DEPARTMENT_WEIGHTS), DEPARTMENTS),
+        'position': pd.Categorical.from_codes(position, POSITIONS),
+        'age': (rng.normal(35, 8, n).astype(np.int64) + tenure // 2).clip(22, 65),
+        'tenure': tenure,
+        'salary': salary.astype(np.int64).clip(30000, 200000),
+        'education': pd.Categorical.from_codes(rng.choice(len(EDUCATION), n, p=EDUCATION_WEIGHTS), EDUCATION),
+        'gender': pd.Categorical.from_codes(rng.choice(len(GENDERS), n, p=GENDER_WEIGHTS), GENDERS),
+        'attrition': attrition,
+        'satisfaction': rng.integers(1, 6, n),
+        'performance_rating': rng.integers(1, 6, n),
+        'work_life_balance': rng.integers(1, 6, n),
+        'hire_date': hire_date,
+        'exit_date': exit_date,
+    })
+
+def generate_movement_history(df, transfer_rate=0.2, max_transfers=3, seed=42, reference_date=REFERENCE_DATE):
+    """Generate a department transfer history consistent with a workforce
+
+    Each transferring employee gets one to max_transfers moves on sorted dates
+    between their hire and exit; their last move lands in their current
+    department and every move changes department.
+
+    Args:
+        df (pd.DataFrame): Workforce from generate_sample_data
+        transfer_rate (float): Share of employees with at least one transfer
+        max_transfers (int): Most transfers per employee
+        seed (int): Seed for the random generator
+        reference_date (pd.Timestamp): "Today" for employees who have not left
+
+    Returns:
+        pd.DataFrame: employee_id, effective_date, from_department, to_department
+    """
+    rng = np.random.default_rng(seed)
+    departments = pd.Index(sorted(df['department'].dropna().unique()))
+    n_departments = len(departments)
+    if n_departments < 2:
+        return pd.DataFrame(columns=['employee_id', 'effective_date', 'from_department', 'to_department'])
+
+    movers = np.flatnonzero(rng.random(len(df)) < transfer_rate)
+    n_moves = rng.integers(1, max_transfers + 1, len(movers))
+    mover = np.repeat(movers, n_moves)
+    # Position of each move counted back from the employee's latest move
+    from_last = np.cumsum(np.ones(len(mover), dtype=np.int64)) - np.repeat(np.cumsum(n_moves), n_moves)
+    from_last = -from_last
+
+    # Walk backwards from the current department, changing department each step
+    to_code = departments.get_indexer(df['department'].to_numpy()[mover])
+    for step in range(1, max_transfers):
+        later = np.flatnonzero(from_last == step)
+        to_code[later] = (to_code[later + 1] - rng.integers(1, n_departments, len(later))) % n_departments
+    from_code = (to_code - rng.integers(1, n_departments, len(mover))) % n_departments
+    earlier = np.flatnonzero(from_last[:-1] > 0)
+    from_code[earlier + 1] = to_code[earlier]
+
+    # Sorted dates inside the employment span, latest move last
+    hire = df['hire_date'].to_numpy()[mover]
+    end = pd.Series(df['exit_date']).fillna(reference_date).to_numpy()[mover]
+    offsets = rng.random(len(mover))
+    order = np.lexsort((offsets, mover))
+    effective = hire + ((end - hire) * offsets[order]).astype('timedelta64[D]')
+
+    return pd.DataFrame({
+        'employee_id': df['employee_id'].to_numpy()[mover],
+        'effective_date': effective.astype('datetime64[D]'),
+        'from_department': departments[from_code],
+        'to_department': departments[to_code],
+    })
+
+def generate_sample_requisitions(df, open_rate=0.05, seed=42, reference_date=REFERENCE_DATE):
+    """Generate requisitions behind the hires of a workforce, plus open roles
+
+    Every hire is backed by a requisition that was filled a few weeks before
+    the hire date; time to fill varies by department and is longer for roles
+    opened around the year-end holidays. A share of extra requisitions opened
+    in the last six months are still open.
+
+    Args:
+        df (pd.DataFrame): Workforce from generate_sample_data
+        open_rate (float): Open requisitions as a share of employees
+        seed (int): Seed for the random generator
+        reference_date (pd.Timestamp): "Today" for the open requisitions
+
+    Returns:
+        pd.DataFrame: requisition_id, department, position, open_date, filled_date
+    """
+    rng = np.random.default_rng(seed)
+    n = len(df)
+    department_codes = pd.Index(DEPARTMENTS).get_indexer(df['department'])
+    department_days = np.take([45, 30, 25, 35, 40], department_codes, mode='clip')
+
+    filled_date = df['hire_date'].to_numpy() - rng.integers(7, 35, n).astype('timedelta64[D]')
+    holiday = np.isin(pd.DatetimeIndex(filled_date).month, [12, 1])
+    fill_days = (rng.gamma(2, department_days / 2) * np.where(holiday, 1.4, 1.0)).astype(np.int64) + 1
+    open_date = filled_date - fill_days.astype('timedelta64[D]')
+
+    n_open = int(n * open_rate)
+    still_open = reference_date - pd.to_timedelta(rng.integers(0, 180, n_open), unit='D')
+    picked = rng.integers(0, n, n_open)
+
+    requisitions = pd.DataFrame({
+        'department': np.concatenate([df['department'].to_numpy(), df['department'].to_numpy()[picked]]),
+        'position': np.concatenate([df['position'].to_numpy(), df['position'].to_numpy()[picked]]),
+        'open_date': np.concatenate([open_date, still_open.to_numpy()]).astype('datetime64[ns]'),
+        'filled_date': np.concatenate([filled_date, np.full(n_open, np.datetime64('NaT'))]).astype('datetime64[ns]'),
+    }).sort_values('open_date', kind='stable', ignore_index=True)
+    requisitions.insert(0, 'requisition_id', [f"REQ-{i:07d}" for i in range(1, len(requisitions) + 1)])
+    return requisitions
+
+def write_sample_data(file_path, n_employees, chunk_size=1_000_000, seed=42, **kwargs):
+    """Generate a large synthetic workforce straight to a CSV or Parquet file
+
+    Records are generated and written chunk by chunk, so memory use depends on
+    chunk_size rather than n_employees. Each chunk draws from its own child of
+    the seed, which keeps the output reproducible for a given chunk_size.
+
+    Args:
+        file_path (str | Path): Output path ending in .csv or .parquet
+        n_employees (int): Total number of employee records
+        chunk_size (int): Records generated and written per chunk
+        seed (int): Seed for the random generator
+        **kwargs: Extra options passed to generate_sample_data
+
+    Returns:
+        Path: The written file
+    """
+    file_path = Path(file_path)
+    if file_path.suffix not in ('.csv', '.parquet'):
+        raise ValueError("Unsupported file format. Please use a .csv or .parquet file.")
+
+    if file_path.suffix == '.parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing Parquet files requires pyarrow (pip install pyarrow)") from e
+
+    n_chunks = max(-(-n_employees // chunk_size), 1)
+    chunk_seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    start_time = time.time()
+    writer = None
+
+    try:
+        for i, chunk_seed in enumerate(chunk_seeds):
+            start = i * chunk_size
+            chunk = generate_sample_data(min(chunk_size, n_employees - start), start_id=start + 1,
+                                         rng=np.random.default_rng(chunk_seed), **kwargs)
+            if file_path.suffix == '.csv':
+                chunk.to_csv(file_path, mode='w' if i == 0 else 'a', header=i == 0, index=False,
+                             date_format='%Y-%m-%d')
+            else:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(file_path, table.schema)
+                writer.write_table(table)
+            logger.info(f"Wrote {start + len(chunk):,} of {n_employees:,} employee records")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger.info(f"Sample HR data written to {file_path} in {time.time() - start_time:.1f} seconds")
+    return file_path
+
+def main():
+    """Main function for command-line usage"""
+    parser = argparse.ArgumentParser(description='Generate synthetic HR data for load testing')
+    parser.add_argument('output', type=str, help='Output file (.csv or .parquet)')
+    parser.add_argument('--employees', type=int, default=100_000, help='Number of employee records')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help='Records written per chunk')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    write_sample_data(args.output, args.employees, args.chunk_size, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,41 @@ import matplotlib.pyplot as plt
 import logging
 from pathlib import Path
 import seaborn as sns
-from datetime import datetime, timedelta
+from datetime import datetime
+from matplotlib import colormaps
+from hr_forecasting import forecast_staffing, staffing_series
+from hr_visualizations import COLORS, chart_task, render_charts
+from hr_report_templates import html_table, table_column
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def process_monthly_staffing(df):
-    """Process HR data to extract monthly staffing metrics
+# Categorical columns the staffing cube is broken down by when present, most
+# useful first
+STAFFING_DIMENSIONS = ['department', 'position', 'gender', 'education']
+
+# Most month x category cells a dense staffing cube may hold. Counting needs
+# several int64 arrays of this size, about 40 MB each at the limit, so the
+# last dimensions are dropped from a cube that would be larger.
+STAFFING_CUBE_MAX_CELLS = 5_000_000
+
+def prepare_staffing_dates(df, seed=42):
+    """Normalise hire/exit dates in place and work out the reporting months
     
     Args:
         df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        seed (int): Seed for the approximate exit dates drawn when the data has
+            no exit_date column, so every build of the same data agrees
         
     Returns:
-        tuple: (monthly_headcount, monthly_attrition, monthly_joiners)
+        pd.DatetimeIndex: Month start dates covered by the data, or None if the
+        data has no hire_date column
     """
-    logger.info("Processing monthly staffing data")
-    
     # Ensure dates are in datetime format
     if 'hire_date' not in df.columns:
         logger.warning("No hire_date column found, cannot process monthly staffing")
-        return None, None, None
+        return None
     
     # Convert date columns to datetime if they're not already
     df['hire_date'] = pd.to_datetime(df['hire_date'])
@@ -33,12 +47,12 @@ def process_monthly_staffing(df):
     if 'exit_date' not in df.columns:
         # Calculate approximate exit date for those who left (assume they left in the last year)
         today = pd.Timestamp('2025-06-08')  # Using current date as reference
-        df['exit_date'] = np.where(
-            df['attrition'] == 1,
-            # Random date in the last 12 months for those who left
-            [today - timedelta(days=np.random.randint(1, 365)) for _ in range(len(df))],
-            pd.NaT  # NaT for current employees
-        )
+        left = (df['attrition'] == 1).to_numpy()
+        exit_date = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')  # NaT for current employees
+        # Random date in the last 12 months for those who left
+        rng = np.random.default_rng(seed)
+        exit_date[left] = today - pd.to_timedelta(rng.integers(1, 365, size=left.sum()), unit='D')
+        df['exit_date'] = exit_date
     else:
         df['exit_date'] = pd.to_datetime(df['exit_date'])
     
@@ -50,180 +64,838 @@ def process_monthly_staffing(df):
         max_date = pd.Timestamp('2025-06-08')
     
     # Create a date range by month
-    months_range = pd.date_range(start=min_date, end=max_date, freq='MS')
+    return pd.date_range(start=min_date, end=max_date, freq='MS')
+
+def process_monthly_staffing(df):
+    """Process HR data to extract monthly staffing metrics
+    
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        
+    Returns:
+        pd.DataFrame: Monthly headcount, joiners, leavers and attrition_rate
+    """
+    logger.info("Processing monthly staffing data")
+    
+    staffing_cube = build_staffing_cube(df, dimensions=[])
+    if staffing_cube is None:
+        return None, None, None
     
-    # Initialize tracking DataFrames
-    monthly_data = []
+    return rollup_staffing_cube(staffing_cube)
+
+def month_ordinals(dates):
+    """Convert dates to integer month ordinals (year * 12 + month - 1)
     
-    # For each month, calculate headcount, joiners and leavers
-    for month_start in months_range:
-        month_end = month_start + pd.offsets.MonthEnd(1)
+    Args:
+        dates (pd.Series | pd.DatetimeIndex): Datetime values, may contain NaT
         
-        # Count active employees at month end
-        active_count = sum(
-            (df['hire_date'] <= month_end) & 
-            ((df['exit_date'].isna()) | (df['exit_date'] > month_end))
-        )
+    Returns:
+        np.ndarray: float array of month ordinals, NaN where the date is missing
+    """
+    months = pd.DatetimeIndex(dates).to_numpy().astype('datetime64[M]')
+    ordinals = months.astype(np.int64).astype(float) + 1970 * 12
+    ordinals[np.isnat(months)] = np.nan
+    return ordinals
+
+def monthly_event_counts(hire_dates, exit_dates, months_range, group_codes=None, n_groups=1):
+    """Count month-end headcount, joiners and leavers for every month in one sweep
+    
+    Each hire and exit is assigned to its calendar month (and group) once and the
+    events are counted with ``np.bincount``. Month-end headcount is then the
+    running total of hires minus the running total of departures, so the whole
+    history costs O(N + M x G) instead of rebuilding N-row masks for each month.
+    
+    An employee counts as departed from the month in which both their hire and
+    exit have happened, which keeps records whose exit precedes their hire out of
+    the headcount exactly like the month-by-month masks did.
+    
+    Args:
+        hire_dates (pd.Series): Hire dates
+        exit_dates (pd.Series): Exit dates, NaT for current employees
+        months_range (pd.DatetimeIndex): Month start dates to report on
+        group_codes (np.ndarray): Optional group number (0..n_groups-1) per employee
+        n_groups (int): Number of groups in group_codes
         
-        # Count joiners in month
-        joiners = sum(
-            (df['hire_date'] >= month_start) & 
-            (df['hire_date'] <= month_end)
-        )
+    Returns:
+        tuple: (headcount, joiners, leavers) as int64 arrays of shape (months,),
+        or (months, n_groups) when group_codes is given
+    """
+    n_months = len(months_range)
+    first_month = month_ordinals(months_range[:1])[0] if n_months else 0
+    
+    hire_idx = month_ordinals(hire_dates) - first_month
+    exit_idx = month_ordinals(exit_dates) - first_month
+    codes = np.zeros(len(hire_idx), dtype=np.int64) if group_codes is None else np.asarray(group_codes, dtype=np.int64)
+    
+    bins = monthly_event_bins(hire_idx, exit_idx, codes, n_months, n_groups)
+    headcount = np.cumsum(bins['hires'], axis=0) - np.cumsum(bins['departures'], axis=0)
+    joiners, leavers = bins['joiners'], bins['leavers']
+    
+    if group_codes is None:
+        return headcount[:, 0], joiners[:, 0], leavers[:, 0]
+    return headcount, joiners, leavers
+
+def monthly_event_bins(hire_idx, exit_idx, codes, n_months, n_groups):
+    """Bin hire and exit events by month and group
+    
+    Args:
+        hire_idx (np.ndarray): Hire month relative to the first reported month, NaN if unknown
+        exit_idx (np.ndarray): Exit month relative to the first reported month, NaN if none
+        codes (np.ndarray): Group number per employee
+        n_months (int): Number of reported months
+        n_groups (int): Number of groups
         
-        # Count leavers in month
-        leavers = sum(
-            (df['exit_date'] >= month_start) & 
-            (df['exit_date'] <= month_end)
-        )
+    Returns:
+        dict: int64 arrays of shape (n_months, n_groups) for 'hires' and
+        'departures' (running-total events) and 'joiners' and 'leavers'
+    """
+    # Events after the reporting window are dropped, earlier ones are
+    # clamped into the first month so they still feed the running totals
+    def _binned(idx, keep=None):
+        keep = ~np.isnan(idx) & (idx < n_months) if keep is None else keep & (idx < n_months)
+        flat = np.clip(idx[keep], 0, None).astype(np.int64) * n_groups + codes[keep]
+        return np.bincount(flat, minlength=n_months * n_groups).reshape(n_months, n_groups)
+    
+    return {
+        'hires': _binned(hire_idx),
+        'departures': _binned(np.maximum(hire_idx, exit_idx)),
+        'joiners': _binned(hire_idx, hire_idx >= 0),
+        'leavers': _binned(exit_idx, exit_idx >= 0),
+    }
+
+def build_staffing_cube(df, dimensions=None):
+    """Build a dense month x category cube of headcount, joiners and leavers
+    
+    The raw rows are read once: every dimension is factorized to integer codes,
+    the codes are combined into a single group number and all months and groups
+    are counted together. Any department, position or gender cut can then be
+    read from the cube with slice_staffing_cube and rollup_staffing_cube.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including hire_date and exit_date
+        dimensions (list): Categorical columns to break the counts down by,
+            defaults to the STAFFING_DIMENSIONS present in df. Dimensions are
+            dropped from the end while the cube would exceed
+            STAFFING_CUBE_MAX_CELLS cells
         
-        # Calculate attrition rate (as percentage)
-        attrition_rate = (leavers / active_count * 100) if active_count > 0 else 0
+    Returns:
+        dict: Cube with 'months', 'dimensions', 'levels' and the 'headcount',
+        'joiners' and 'leavers' arrays shaped (months, *levels), or None if
+        the data has no hire dates
+    """
+    months_range = prepare_staffing_dates(df)
+    if months_range is None:
+        return None
+    
+    dimensions = _cube_dimensions(df, dimensions)
+    dimensions, levels, group_codes = _factorize_dimensions(df, dimensions, len(months_range))
+    n_groups = int(np.prod([len(levels[col]) for col in dimensions])) if dimensions else 1
+    logger.info(f"Building staffing cube over {len(months_range)} months x {n_groups} groups")
+    
+    headcount, joiners, leavers = monthly_event_counts(
+        df['hire_date'], df['exit_date'], months_range, group_codes, n_groups
+    )
+    return _make_cube(months_range, dimensions, levels, headcount, joiners, leavers)
+
+def _cube_dimensions(df, dimensions):
+    """Resolve the requested cube dimensions against the columns in df"""
+    if dimensions is None:
+        return [col for col in STAFFING_DIMENSIONS if col in df.columns]
+    missing = [col for col in dimensions if col not in df.columns]
+    if missing:
+        logger.warning(f"Staffing cube dimensions not found in data, skipping: {missing}")
+    return [col for col in dimensions if col in df.columns]
+
+def _make_cube(months_range, dimensions, levels, headcount, joiners, leavers):
+    """Assemble a staffing cube dict from (months, groups) count arrays"""
+    shape = (len(months_range),) + tuple(len(levels[col]) for col in dimensions)
+    
+    # Counts are bounded by the number of employees, so keep the cube compact
+    largest = max((int(counts.max()) for counts in (headcount, joiners, leavers) if counts.size), default=0)
+    count_dtype = np.int32 if largest < np.iinfo(np.int32).max else np.int64
+    return {
+        'months': months_range,
+        'dimensions': list(dimensions),
+        'levels': levels,
+        'headcount': headcount.reshape(shape).astype(count_dtype),
+        'joiners': joiners.reshape(shape).astype(count_dtype),
+        'leavers': leavers.reshape(shape).astype(count_dtype),
+    }
+
+def slice_staffing_cube(cube, **filters):
+    """Restrict a staffing cube to selected categories
+    
+    Args:
+        cube (dict): Cube from build_staffing_cube
+        **filters: Dimension name mapped to one category or a list of categories,
+            e.g. department='Finance' or gender=['Female', 'Other']
+        
+    Returns:
+        dict: Cube with the same dimensions holding only the selected categories
+    """
+    sliced = dict(cube, levels=dict(cube['levels']))
+    for dim, selected in filters.items():
+        if dim not in cube['dimensions']:
+            raise ValueError(f"Unknown staffing cube dimension: {dim}")
+        if not isinstance(selected, (list, tuple, set)):
+            selected = [selected]
+        dim_levels = cube['levels'][dim]
+        positions = [dim_levels.index(value) for value in selected if value in dim_levels]
+        axis = cube['dimensions'].index(dim) + 1
+        for measure in ('headcount', 'joiners', 'leavers'):
+            sliced[measure] = np.take(sliced[measure], positions, axis=axis)
+        sliced['levels'][dim] = [dim_levels[i] for i in positions]
+    return sliced
+
+def rollup_staffing_cube(cube, by=None):
+    """Aggregate a staffing cube into a monthly staffing table
+    
+    Args:
+        cube (dict): Cube from build_staffing_cube or slice_staffing_cube
+        by (list): Dimensions to keep as columns; all others are summed away
         
-        monthly_data.append({
-            'month': month_start.strftime('%Y-%m'),
-            'headcount': active_count,
-            'joiners': joiners,
-            'leavers': leavers,
-            'attrition_rate': round(attrition_rate, 2)
-        })
-    
-    monthly_df = pd.DataFrame(monthly_data)
+    Returns:
+        pd.DataFrame: month, the by columns, headcount, joiners, leavers and
+        attrition_rate, one row per month and category combination
+    """
+    if cube is None:
+        return None
+    
+    by = [by] if isinstance(by, str) else list(by or [])
+    unknown = [dim for dim in by if dim not in cube['dimensions']]
+    if unknown:
+        raise ValueError(f"Unknown staffing cube dimensions: {unknown}")
+    
+    summed_axes = tuple(i + 1 for i, dim in enumerate(cube['dimensions']) if dim not in by)
+    kept = [dim for dim in cube['dimensions'] if dim in by]
+    measures = {
+        measure: cube[measure].sum(axis=summed_axes, dtype=np.int64).reshape(len(cube['months']), -1)
+        for measure in ('headcount', 'joiners', 'leavers')
+    }
+    
+    # One row per month and kept-category combination, months varying slowest
+    n_groups = measures['headcount'].shape[1]
+    data = {'month': np.repeat(cube['months'].strftime('%Y-%m'), n_groups)}
+    if kept:
+        combos = pd.MultiIndex.from_product([cube['levels'][dim] for dim in kept], names=kept)
+        for dim in kept:
+            data[dim] = np.tile(combos.get_level_values(dim), len(cube['months']))
+    for measure, values in measures.items():
+        data[measure] = values.ravel()
+    monthly_df = pd.DataFrame(data)
+    
+    # Calculate attrition rate (as percentage)
+    headcount = monthly_df['headcount'].to_numpy()
+    attrition_rate = np.divide(monthly_df['leavers'].to_numpy() * 100, headcount,
+                               out=np.zeros(len(monthly_df)), where=headcount > 0)
+    monthly_df['attrition_rate'] = np.round(attrition_rate, 2)
+    
+    if kept != by:
+        monthly_df = monthly_df[['month'] + by + list(measures) + ['attrition_rate']]
     return monthly_df
 
-def create_staffing_visualizations(monthly_df, images_dir):
-    """Create visualizations for staffing metrics
+def _window_sums(prefix, window):
+    """Sums over the last `window` rows (one length per row allowed) from prefix sums"""
+    n_rows = len(prefix) - 1
+    start = np.maximum(np.arange(1, n_rows + 1) - window, 0)
+    return prefix[1:] - prefix[start]
+
+def rolling_staffing_metrics(staffing, window=12, by=None):
+    """Trailing-window and annualized attrition from monthly staffing data
+    
+    Headcount and leavers are turned into prefix sums along the months once,
+    so every window total is a difference of two prefix sums and all
+    categories are computed together in O(months x categories).
     
     Args:
-        monthly_df (pd.DataFrame): DataFrame with monthly staffing data
-        images_dir (Path): Directory to save images
+        staffing (pd.DataFrame | dict): Monthly staffing table or staffing cube
+        window (int): Trailing window length in months
+        by (str | list): Cube dimensions to compute the metrics for, e.g.
+            'department'; only used with a staffing cube
+        
+    Returns:
+        pd.DataFrame: The monthly staffing table with rolling_headcount (average
+        headcount over the window), ttm_leavers, ttm_attrition_rate (leavers
+        over the window / average headcount) and annualized_attrition_rate
+        (year-to-date attrition scaled to 12 months); window metrics are NaN
+        until a full window of history is available
     """
+    if isinstance(staffing, dict):
+        monthly_df = rollup_staffing_cube(staffing, by)
+    else:
+        monthly_df = staffing.copy() if staffing is not None else None
     if monthly_df is None or len(monthly_df) == 0:
-        logger.warning("No monthly data available for visualization")
-        return
+        return monthly_df
+    
+    # Rows are ordered month first, so each measure reshapes to (months, groups)
+    months = pd.to_datetime(monthly_df['month'].drop_duplicates(), format='%Y-%m')
+    n_months = len(months)
+    shape = (n_months, len(monthly_df) // n_months)
+    prefix = {
+        measure: np.vstack([np.zeros((1, shape[1])),
+                            np.cumsum(monthly_df[measure].to_numpy(dtype=float).reshape(shape), axis=0)])
+        for measure in ('headcount', 'leavers')
+    }
+    
+    full_window = (np.arange(n_months) >= window - 1)[:, None]
+    rolling_headcount = np.where(full_window, _window_sums(prefix['headcount'], window) / window, np.nan)
+    ttm_leavers = np.where(full_window, _window_sums(prefix['leavers'], window), np.nan)
+    ttm_rate = np.divide(ttm_leavers * 100, rolling_headcount, out=np.full(shape, np.nan),
+                         where=full_window & (rolling_headcount > 0))
+    
+    # Year to date: the window for each month reaches back to January, and
+    # (leavers / average headcount) x 12 / months elapsed simplifies to this
+    months_elapsed = months.dt.month.to_numpy()
+    ytd_leavers = _window_sums(prefix['leavers'], months_elapsed)
+    ytd_headcount = _window_sums(prefix['headcount'], months_elapsed)
+    annualized = np.divide(ytd_leavers * 100 * 12, ytd_headcount, out=np.zeros(shape), where=ytd_headcount > 0)
+    
+    monthly_df['rolling_headcount'] = np.round(rolling_headcount.ravel(), 1)
+    monthly_df['ttm_leavers'] = ttm_leavers.ravel()
+    monthly_df['ttm_attrition_rate'] = np.round(ttm_rate.ravel(), 2)
+    monthly_df['annualized_attrition_rate'] = np.round(annualized.ravel(), 2)
+    return monthly_df
+
+def _resolve_monthly_df(staffing, filters=None):
+    """Return a monthly staffing table from either a table or a staffing cube"""
+    if isinstance(staffing, dict):
+        return rollup_staffing_cube(slice_staffing_cube(staffing, **(filters or {})))
+    return staffing
+
+def _factorize_dimensions(df, dimensions, n_months):
+    """Sorted levels of each dimension and the flat group number of every row
+    
+    Returns:
+        tuple: The dimensions kept within STAFFING_CUBE_MAX_CELLS, their
+        levels and the group number of every row
+    """
+    levels = {}
+    codes = []
+    for col in dimensions:
+        col_codes, col_levels = pd.factorize(df[col], sort=True, use_na_sentinel=False)
+        levels[col] = pd.Index(col_levels).tolist()
+        codes.append(col_codes)
+    
+    dimensions = list(dimensions)
+    while dimensions and n_months * int(np.prod([len(levels[col]) for col in dimensions])) > STAFFING_CUBE_MAX_CELLS:
+        dropped = dimensions.pop()
+        logger.warning(f"Staffing cube over {STAFFING_CUBE_MAX_CELLS:,} cells, leaving out dimension {dropped} "
+                       f"with {len(levels.pop(dropped)):,} values")
+        codes.pop()
+    shape = tuple(len(levels[col]) for col in dimensions)
+    return dimensions, levels, np.ravel_multi_index(codes, shape) if shape else np.zeros(len(df), dtype=np.int64)
+
+# Columns of a department transfer history export
+MOVEMENT_COLUMNS = ['employee_id', 'effective_date', 'from_department', 'to_department']
+
+def load_movement_history(file_path):
+    """Load a department transfer history from a CSV or Excel file
+    
+    Args:
+        file_path (str): Path to a file with one row per transfer and the
+            MOVEMENT_COLUMNS columns
+        
+    Returns:
+        pd.DataFrame: Transfer history with effective_date parsed
+    """
+    logger.info(f"Loading movement history from {file_path}")
+    if str(file_path).endswith('.csv'):
+        movements = pd.read_csv(file_path)
+    elif str(file_path).endswith(('.xlsx', '.xls')):
+        movements = pd.read_excel(file_path)
+    else:
+        logger.error("Unsupported file format. Please provide a CSV or Excel file.")
+        raise ValueError("Unsupported file format")
+    
+    missing_columns = [col for col in MOVEMENT_COLUMNS if col not in movements.columns]
+    if missing_columns:
+        raise ValueError(f"Movement history is missing required columns: {missing_columns}")
+    
+    movements['effective_date'] = pd.to_datetime(movements['effective_date'])
+    return movements
+
+def department_transitions(df, movements=None):
+    """Count month-to-month department transitions, including exits, in one pass
+    
+    Every employee's history is split into department assignments: one from
+    the hire date, then one per transfer. An assignment that holds at the end
+    of months s..e-1 adds a stay for months s+1..e-1 and one move at month e,
+    to the next department or to Exit, so stays are range updates on a
+    difference array and moves a single bincount. Memory and time are
+    O(employees + transfers + months x departments^2).
+    
+    Args:
+        df (pd.DataFrame): DataFrame with HR data including employee_id,
+            department, hire_date and exit_date
+        movements (pd.DataFrame): Optional transfer history with the
+            MOVEMENT_COLUMNS columns; without it every employee stays in their
+            current department. Transfers of an employee_id that repeats in
+            df, e.g. a rehire, are matched to its latest hire
+        
+    Returns:
+        dict: 'months', 'states' (departments then 'Exit'), 'counts' as a
+        (months, departments, states) array of employees moving from each
+        department at the end of the previous month, 'hires' and 'headcount'
+        as (months, departments) arrays, or None without hire dates or,
+        given transfers, without an employee_id column
+    """
+    if movements is not None and 'employee_id' not in df.columns:
+        logger.warning("No employee_id column found, cannot match transfers to employees")
+        return None
+    months_range = prepare_staffing_dates(df)
+    if months_range is None:
+        return None
+    
+    if movements is None:
+        movements = pd.DataFrame(columns=MOVEMENT_COLUMNS)
+    departments = sorted(set(df['department'].dropna().unique())
+                         | set(movements['from_department'].dropna().unique())
+                         | set(movements['to_department'].dropna().unique()))
+    department_index = pd.Index(departments)
+    n_departments = len(departments)
+    exit_state = n_departments
+    
+    first_month = month_ordinals(months_range[:1])[0]
+    n_months = len(months_range)
+    hire = month_ordinals(df['hire_date']) - first_month
+    exit_month = month_ordinals(df['exit_date']) - first_month
+    employed = ~np.isnan(hire) & ~(exit_month < hire) & df['department'].notna().to_numpy()
+    
+    # Transfers of known employees, in date order per employee
+    ids = df['employee_id'] if 'employee_id' in df.columns else pd.Series([], dtype=object)
+    row = _employee_rows(ids, hire, movements['employee_id'])
+    known = row >= 0
+    if (~known).any():
+        logger.warning(f"Skipping {(~known).sum()} transfers for unknown employees")
+    transfer_month = month_ordinals(movements['effective_date']) - first_month
+    known &= ~np.isnan(transfer_month)
+    known[known] = employed[row[known]]
+    order = np.lexsort((transfer_month[known], row[known]))
+    transfer_row = row[known][order]
+    transfer_month = transfer_month[known][order]
+    from_department = department_index.get_indexer(movements['from_department'].to_numpy()[known][order])
+    to_department = department_index.get_indexer(movements['to_department'].to_numpy()[known][order])
+    
+    # An employee starts in the department they first transferred out of
+    start_department = department_index.get_indexer(df['department'])
+    first_transfer = np.flatnonzero(np.diff(transfer_row, prepend=-1) != 0)
+    start_department[transfer_row[first_transfer]] = from_department[first_transfer]
+    
+    # Transfers in or after the exit month never show at a month end
+    shown = ~(transfer_month >= exit_month[transfer_row])
+    transfer_row, transfer_month, to_department = transfer_row[shown], transfer_month[shown], to_department[shown]
+    
+    # Assignments: hire first, then transfers; moves before the hire count from it
+    hired = np.flatnonzero(employed)
+    segment_row = np.concatenate([hired, transfer_row])
+    segment_start = np.concatenate([hire[hired], np.maximum(transfer_month, hire[transfer_row])]).astype(np.int64)
+    segment_department = np.concatenate([start_department[hired], to_department])
+    order = np.lexsort((segment_start, segment_row))
+    segment_row, segment_start, segment_department = segment_row[order], segment_start[order], segment_department[order]
+    
+    # Each assignment lasts until the next one starts, or until the exit
+    exit_row = exit_month[segment_row]
+    last = np.diff(segment_row, append=-1) != 0
+    segment_end = np.where(last, np.where(np.isnan(exit_row), n_months, exit_row),
+                           np.roll(segment_start, -1)).astype(np.int64)
+    
+    # Assignments that start and end in the same month never show at a month end
+    kept = segment_end > segment_start
+    kept &= segment_department >= 0
+    segment_row, segment_start, segment_end, segment_department = (
+        segment_row[kept], segment_start[kept], segment_end[kept], segment_department[kept])
+    last = np.diff(segment_row, append=-1) != 0
+    first = np.diff(segment_row, prepend=-1) != 0
+    to_state = np.where(last, exit_state, np.roll(segment_department, -1))
+    
+    n_states = n_departments + 1
+    counts = np.zeros((n_months, n_departments, n_states), dtype=np.int64)
+    
+    # Stays: in the same department at the end of month t-1 and month t
+    stay_from = np.maximum(segment_start + 1, 1)
+    stay_to = np.minimum(segment_end, n_months)
+    ranged = stay_from < stay_to
+    diff = np.bincount(stay_from[ranged] * n_departments + segment_department[ranged],
+                       minlength=(n_months + 1) * n_departments)
+    diff -= np.bincount(stay_to[ranged] * n_departments + segment_department[ranged],
+                        minlength=(n_months + 1) * n_departments)
+    stays = np.cumsum(diff.reshape(n_months + 1, n_departments)[:n_months], axis=0)
+    counts[:, np.arange(n_departments), np.arange(n_departments)] = stays
+    
+    # Moves and exits at the end of each assignment inside the window
+    moved = segment_end < n_months
+    counts += np.bincount(
+        (segment_end[moved] * n_departments + segment_department[moved]) * n_states + to_state[moved],
+        minlength=n_months * n_departments * n_states,
+    ).reshape(n_months, n_departments, n_states)
+    
+    hires = np.bincount(segment_start[first] * n_departments + segment_department[first],
+                        minlength=n_months * n_departments).reshape(n_months, n_departments)
+    headcount = counts[:, :, :n_departments].sum(axis=1) + hires
+    
+    logger.info(f"Counted department transitions for {len(hired):,} employees, "
+                f"{len(transfer_row):,} transfers and {n_departments} departments")
+    return {
+        'months': months_range,
+        'states': departments + ['Exit'],
+        'counts': counts,
+        'hires': hires,
+        'headcount': headcount,
+    }
+
+def _employee_rows(ids, hire, lookup):
+    """Row of each looked-up id, the latest hire of an id that repeats, -1 if unknown"""
+    rows = np.arange(len(ids))
+    repeated = ids.duplicated(keep=False).to_numpy()
+    if repeated.any():
+        logger.warning(f"{ids[repeated].nunique():,} employee_id values repeat; "
+                       f"their transfers are matched to the latest hire")
+        # Missing hire dates sort first so they never win over a known hire
+        rows = rows[np.argsort(np.nan_to_num(hire, nan=-np.inf), kind='stable')]
+        rows = rows[~ids.iloc[rows].duplicated(keep='last').to_numpy()]
+    found = pd.Index(ids.iloc[rows]).get_indexer(lookup)
+    return np.where(found >= 0, rows[found], -1)
+
+def transition_probabilities(transitions, periods=12):
+    """Monthly transition probability matrix pooled over the latest months
     
-    logger.info("Creating staffing trend visualizations")
-    
-    # Set style
-    plt.style.use('ggplot')
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-    
-    # 1. Monthly Headcount Trend
-    plt.figure(figsize=(12, 6))
-    plt.plot(monthly_df['month'], monthly_df['headcount'], marker='o', linewidth=2, color=colors[0])
-    plt.title('Monthly Headcount Trend', fontsize=16)
-    plt.xlabel('Month', fontsize=12)
-    plt.ylabel('Total Staff', fontsize=12)
-    plt.grid(True)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(images_dir / 'monthly_headcount.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 2. Monthly Joiners and Leavers
-    plt.figure(figsize=(12, 6))
+    Args:
+        transitions (dict): Transitions from department_transitions
+        periods (int): Number of latest months to pool
+        
+    Returns:
+        np.ndarray: (states, states) row-stochastic matrix; Exit is absorbing
+        and departments with nobody at risk keep their staff
+    """
+    pooled = transitions['counts'][-periods:].sum(axis=0).astype(float)
+    n_departments, n_states = pooled.shape
+    at_risk = pooled.sum(axis=1, keepdims=True)
+    
+    matrix = np.eye(n_states)
+    matrix[:n_departments] = np.divide(pooled, at_risk, out=matrix[:n_departments].copy(), where=at_risk > 0)
+    return matrix
+
+def project_department_headcount(transitions, months=24, periods=12, include_hires=True):
+    """Project headcount per department by repeatedly applying the transition matrix
+    
+    Headcount after k months is the current headcount times the k-th power of
+    the monthly transition matrix, plus the average monthly hires of the
+    latest periods carried through the later powers.
+    
+    Args:
+        transitions (dict): Transitions from department_transitions
+        months (int): Number of months to project
+        periods (int): Number of latest months the rates are estimated from
+        include_hires (bool): Add the recent average monthly hires
+        
+    Returns:
+        pd.DataFrame: Projected month-end headcount, one row per month and one
+        column per department plus Total and cumulative Exits
+    """
+    matrix = transition_probabilities(transitions, periods)
+    n_departments = len(transitions['states']) - 1
+    
+    current = np.append(transitions['headcount'][-1], 0).astype(float)
+    hires = np.zeros(n_departments + 1)
+    if include_hires:
+        hires[:n_departments] = transitions['hires'][-periods:].mean(axis=0)
+    
+    # Each step multiplies by the matrix once more: x_k = x_0 P^k + h (P^(k-1) + ... + I)
+    projected = np.empty((months, n_departments + 1))
+    for step in range(months):
+        current = current @ matrix + hires
+        projected[step] = current
+    
+    projection = pd.DataFrame(projected[:, :n_departments], columns=transitions['states'][:-1],
+                              index=pd.date_range(transitions['months'][-1] + pd.DateOffset(months=1),
+                                                  periods=months, freq='MS').strftime('%Y-%m'))
+    projection['Total'] = projection.sum(axis=1)
+    projection['Exits'] = projected[:, n_departments]
+    projection.index.name = 'month'
+    return projection.round(1)
+
+# 1. Monthly Headcount Trend
+def _draw_monthly_headcount(fig, monthly_df):
+    ax = fig.add_subplot()
+    ax.plot(monthly_df['month'], monthly_df['headcount'], marker='o', linewidth=2, color=COLORS[0])
+    ax.set_title('Monthly Headcount Trend', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Total Staff', fontsize=12)
+    ax.grid(True)
+    plt.setp(ax.get_xticklabels(), rotation=45)
+    fig.tight_layout()
+
+# 2. Monthly Joiners and Leavers
+def _draw_monthly_movement(fig, monthly_df):
+    ax = fig.add_subplot()
     width = 0.35
     x = np.arange(len(monthly_df))
     
-    plt.bar(x - width/2, monthly_df['joiners'], width, label='New Joiners', color=colors[2])
-    plt.bar(x + width/2, monthly_df['leavers'], width, label='Leavers', color=colors[3])
-    
-    plt.title('Monthly Staff Movement', fontsize=16)
-    plt.xlabel('Month', fontsize=12)
-    plt.ylabel('Number of Employees', fontsize=12)
-    plt.xticks(x, monthly_df['month'], rotation=45)
-    plt.legend()
-    plt.grid(True, axis='y')
-    plt.tight_layout()
-    plt.savefig(images_dir / 'monthly_movement.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 3. Monthly Attrition Rate
-    plt.figure(figsize=(12, 6))
-    plt.plot(monthly_df['month'], monthly_df['attrition_rate'], marker='o', linewidth=2, color=colors[3])
-    plt.title('Monthly Attrition Rate (%)', fontsize=16)
-    plt.xlabel('Month', fontsize=12)
-    plt.ylabel('Attrition Rate (%)', fontsize=12)
-    plt.grid(True)
-    plt.xticks(rotation=45)
+    ax.bar(x - width/2, monthly_df['joiners'], width, label='New Joiners', color=COLORS[2])
+    ax.bar(x + width/2, monthly_df['leavers'], width, label='Leavers', color=COLORS[3])
+    
+    ax.set_title('Monthly Staff Movement', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Number of Employees', fontsize=12)
+    ax.set_xticks(x, monthly_df['month'], rotation=45)
+    ax.legend()
+    ax.grid(True, axis='y')
+    fig.tight_layout()
+
+# 3. Monthly Attrition Rate
+def _draw_monthly_attrition_rate(fig, monthly_df):
+    ax = fig.add_subplot()
+    ax.plot(monthly_df['month'], monthly_df['attrition_rate'], marker='o', linewidth=2, color=COLORS[3])
+    ax.set_title('Monthly Attrition Rate (%)', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Attrition Rate (%)', fontsize=12)
+    ax.grid(True)
+    plt.setp(ax.get_xticklabels(), rotation=45)
     
     # Add threshold line at 5%
-    plt.axhline(y=5, color='red', linestyle='--', alpha=0.7, label='5% Threshold')
-    plt.legend()
+    ax.axhline(y=5, color='red', linestyle='--', alpha=0.7, label='5% Threshold')
+    ax.legend()
     
     # Annotate high attrition points
     for i, rate in enumerate(monthly_df['attrition_rate']):
         if rate > 5:  # Highlighting high attrition months
-            plt.annotate(f'{rate}%', 
+            ax.annotate(f'{rate}%', 
                         (monthly_df['month'][i], rate),
                         textcoords="offset points",
                         xytext=(0,10),
                         ha='center')
+    fig.tight_layout()
+
+# 4. Forecast staffing needs
+def _draw_staffing_forecast(fig, monthly_df, total_forecast, note):
+    ax = fig.add_subplot()
+    
+    # Plot historical data
+    ax.plot(monthly_df['month'], monthly_df['headcount'], marker='o', linewidth=2, color=COLORS[0], label='Historical')
+    
+    # Plot forecast
+    ax.plot(total_forecast['month'], total_forecast['forecast'], marker='s', linewidth=2, linestyle='--', color=COLORS[4], label='Forecast')
+    
+    # Add shaded area for the 95% forecast interval
+    ax.fill_between(total_forecast['month'], total_forecast['upper'], total_forecast['lower'], color=COLORS[4], alpha=0.2)
+    
+    ax.set_title('Staffing Forecast (Next 6 Months)', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Projected Headcount', fontsize=12)
+    ax.grid(True)
+    plt.setp(ax.get_xticklabels(), rotation=45)
+    ax.legend()
+    
+    # Add annotation about attrition
+    ax.annotate(note,
+                xy=(0.02, 0.02),
+                xycoords='axes fraction',
+                bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.8))
+    fig.tight_layout()
+
+# 5. Department forecasts
+def _draw_department_forecast(fig, history_months, history, department_forecast):
+    ax = fig.add_subplot()
+    for i, (label, values) in enumerate(history.items()):
+        color = colormaps['tab10'](i % 10)
+        series_forecast = department_forecast[department_forecast['series'] == label]
+        ax.plot(history_months, values, linewidth=2, color=color, label=label)
+        ax.plot(series_forecast['month'], series_forecast['forecast'], linewidth=2, linestyle='--', color=color)
+        ax.fill_between(series_forecast['month'], series_forecast['upper'], series_forecast['lower'], color=color, alpha=0.15)
+    
+    ax.set_title('Department Headcount Forecast (Next 6 Months)', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Projected Headcount', fontsize=12)
+    ax.grid(True)
+    plt.setp(ax.get_xticklabels(), rotation=45)
+    ax.legend()
+    fig.tight_layout()
+
+def staffing_chart_tasks(monthly_df, filters=None):
+    """Build the render tasks for the staffing trend and forecast charts
     
-    plt.tight_layout()
-    plt.savefig(images_dir / 'monthly_attrition_rate.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    Args:
+        monthly_df (pd.DataFrame | dict): Monthly staffing data or a staffing cube
+        filters (dict): Categories to chart when monthly_df is a staffing cube,
+            e.g. {'department': 'Finance'}
+            
+    Returns:
+        list: Tasks for render_charts, empty without monthly data
+    """
+    # Forecasts read the per-department series from the cube when given one
+    forecast_source = slice_staffing_cube(monthly_df, **(filters or {})) if isinstance(monthly_df, dict) else monthly_df
+    monthly_df = _resolve_monthly_df(monthly_df, filters)
+    if monthly_df is None or len(monthly_df) == 0:
+        logger.warning("No monthly data available for visualization")
+        return []
     
-    # 4. Forecast staffing needs (simple trend-based forecast)
+    trend = monthly_df[['month', 'headcount', 'joiners', 'leavers', 'attrition_rate']]
+    tasks = [
+        chart_task('monthly_headcount.png', _draw_monthly_headcount, (12, 6), trend),
+        chart_task('monthly_movement.png', _draw_monthly_movement, (12, 6), trend),
+        chart_task('monthly_attrition_rate.png', _draw_monthly_attrition_rate, (12, 6), trend),
+    ]
+    
+    # Forecasts use seasonal models fitted to every series at once
     if len(monthly_df) >= 6:  # Only forecast if we have enough historical data
-        # Take the last 6 months of data for forecasting
-        recent_data = monthly_df.tail(6)
-        
-        # Calculate average monthly change in headcount
-        avg_monthly_change = np.mean(np.diff(recent_data['headcount']))
+        forecast_df = forecast_staffing(forecast_source, horizon=6)
+        total_forecast = forecast_df[forecast_df['series'] == 'Total']
         
         # Calculate average monthly attrition
-        avg_attrition_rate = np.mean(recent_data['attrition_rate'])
-        
-        # Project next 6 months
-        last_month = recent_data['headcount'].iloc[-1]
-        forecast_months = pd.date_range(start=pd.to_datetime(recent_data['month'].iloc[-1]) + pd.DateOffset(months=1), 
-                                        periods=6, freq='MS')
-        
-        forecast_values = [last_month + (i+1)*avg_monthly_change for i in range(6)]
-        
-        # Create forecast visualization
-        plt.figure(figsize=(12, 6))
-        
-        # Plot historical data
-        plt.plot(monthly_df['month'], monthly_df['headcount'], marker='o', linewidth=2, color=colors[0], label='Historical')
+        avg_attrition_rate = np.mean(monthly_df.tail(6)['attrition_rate'])
         
-        # Plot forecast
-        forecast_months_str = [d.strftime('%Y-%m') for d in forecast_months]
-        plt.plot(forecast_months_str, forecast_values, marker='s', linewidth=2, linestyle='--', color=colors[4], label='Forecast')
+        # Hiring need covers expected leavers plus any projected growth
+        last_month = monthly_df['headcount'].iloc[-1]
+        projected_growth = max(total_forecast['forecast'].iloc[-1] - last_month, 0)
+        projected_hiring = int(last_month * avg_attrition_rate/100 * 6 + projected_growth)
+        note = (f"Avg Monthly Attrition: {avg_attrition_rate:.2f}%\nProjected Hiring Need: {projected_hiring} (6 months)\n"
+                f"Model: {total_forecast['method'].iloc[0].replace('_', ' ').title()}")
+        tasks.append(chart_task('staffing_forecast.png', _draw_staffing_forecast, (12, 6), trend, total_forecast, note))
         
-        # Add shaded area for forecast uncertainty
-        upper_bound = [val * 1.1 for val in forecast_values]
-        lower_bound = [val * 0.9 for val in forecast_values]
-        plt.fill_between(forecast_months_str, upper_bound, lower_bound, color=colors[4], alpha=0.2)
-        
-        plt.title('Staffing Forecast (Next 6 Months)', fontsize=16)
-        plt.xlabel('Month', fontsize=12)
-        plt.ylabel('Projected Headcount', fontsize=12)
-        plt.grid(True)
-        plt.xticks(rotation=45)
-        plt.legend()
+        # Department forecasts, fitted in the same batch as the total
+        department_forecast = forecast_df[forecast_df['series'] != 'Total']
+        if len(department_forecast) > 0:
+            history = staffing_series(forecast_source)
+            recent = slice(-24, None)
+            history_months = history['months'][recent].strftime('%Y-%m')
+            recent_history = {label: history['values'][i + 1][recent] for i, label in enumerate(history['labels'][1:])}
+            tasks.append(chart_task('department_forecast.png', _draw_department_forecast, (12, 6),
+                                    history_months, recent_history, department_forecast))
+    return tasks
+
+def create_staffing_visualizations(monthly_df, images_dir, filters=None, workers=None):
+    """Create visualizations for staffing metrics
+    
+    Args:
+        monthly_df (pd.DataFrame | dict): Monthly staffing data or a staffing cube
+        images_dir (Path): Directory to save images
+        filters (dict): Categories to chart when monthly_df is a staffing cube,
+            e.g. {'department': 'Finance'}
+        workers (int): Number of chart rendering processes, defaults to one per CPU
+    """
+    tasks = staffing_chart_tasks(monthly_df, filters)
+    if tasks:
+        logger.info("Creating staffing trend visualizations")
+        render_charts(tasks, images_dir, workers)
+
+# 1. Transition probability heatmap (largest departments)
+def _draw_department_transitions(fig, probabilities, annotate):
+    ax = fig.add_subplot()
+    sns.heatmap(
+        probabilities,
+        annot=annotate,
+        fmt='.1f',
+        cmap='Blues',
+        cbar_kws={'label': 'Monthly Probability (%)'},
+        ax=ax
+    )
+    ax.set_title('Monthly Department Transition Probabilities (Last 12 Months)', fontsize=16)
+    ax.set_xlabel('To', fontsize=12)
+    ax.set_ylabel('From', fontsize=12)
+    fig.tight_layout()
+
+# 2. Projected headcount by department
+def _draw_department_projection(fig, projection, months):
+    ax = fig.add_subplot()
+    for department in projection.columns:
+        ax.plot(projection.index, projection[department], linewidth=2, label=department)
+    ax.set_title(f'Projected Headcount by Department (Next {months} Months)', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Projected Headcount', fontsize=12)
+    ax.grid(True)
+    plt.setp(ax.get_xticklabels(), rotation=45)
+    ax.legend()
+    fig.tight_layout()
+
+def mobility_chart_tasks(transitions, months=24, max_departments=15):
+    """Build the internal mobility and projected headcount chart tasks
+    
+    Args:
+        transitions (dict): Transitions from department_transitions
+        months (int): Number of months to project
+        max_departments (int): Largest departments to show in the charts
         
-        # Add annotation about attrition
-        plt.annotate(f"Avg Monthly Attrition: {avg_attrition_rate:.2f}%\nProjected Hiring Need: {int(last_month * avg_attrition_rate/100 * 6)} (6 months)",
-                    xy=(0.02, 0.02),
-                    xycoords='axes fraction',
-                    bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.8))
+    Returns:
+        tuple: Projected headcount from project_department_headcount and the
+        tasks for render_charts, or None without department transitions
+    """
+    if transitions is None or len(transitions['states']) < 2:
+        logger.warning("No department transitions available for visualization")
+        return None
+    
+    departments = transitions['states'][:-1]
+    largest = np.argsort(-transitions['headcount'][-1], kind='stable')[:max_departments]
+    matrix = transition_probabilities(transitions)
+    columns = np.append(largest, len(departments))
+    probabilities = pd.DataFrame(matrix[np.ix_(largest, columns)] * 100,
+                                 index=[departments[i] for i in largest],
+                                 columns=[transitions['states'][i] for i in columns])
+    
+    projection = project_department_headcount(transitions, months)
+    tasks = [
+        chart_task('department_transitions.png', _draw_department_transitions, (12, 8),
+                   probabilities, len(largest) <= 10),
+        chart_task('department_projection.png', _draw_department_projection, (12, 6),
+                   projection[[departments[i] for i in largest[:10]]], months),
+    ]
+    return projection, tasks
+
+def create_mobility_visualizations(transitions, images_dir, months=24, max_departments=15, workers=None):
+    """Create internal mobility and projected headcount charts
+    
+    Args:
+        transitions (dict): Transitions from department_transitions
+        images_dir (Path): Directory to save images
+        months (int): Number of months to project
+        max_departments (int): Largest departments to show in the charts
+        workers (int): Number of chart rendering processes, defaults to one per CPU
         
-        plt.tight_layout()
-        plt.savefig(images_dir / 'staffing_forecast.png', dpi=300, bbox_inches='tight')
-        plt.close()
+    Returns:
+        pd.DataFrame: Projected headcount from project_department_headcount
+    """
+    analysis = mobility_chart_tasks(transitions, months, max_departments)
+    if analysis is None:
+        return None
+    
+    logger.info("Creating internal mobility visualizations")
+    projection, tasks = analysis
+    render_charts(tasks, images_dir, workers)
+    return projection
 
-def analyze_optimal_hiring_time(monthly_df, images_dir):
-    """Analyze the best time to start hiring based on historical patterns
+def _draw_seasonal_hiring_pattern(fig, month_analysis):
+    ax = fig.add_subplot()
+    width = 0.35
+    x = np.arange(len(month_analysis))
+    
+    ax.bar(x - width/2, month_analysis['joiners'], width, label='Avg Joiners', color='green')
+    ax.bar(x + width/2, month_analysis['leavers'], width, label='Avg Leavers', color='red')
+    ax.set_title('Seasonal Hiring and Attrition Patterns', fontsize=16)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Average Employee Count', fontsize=12)
+    ax.set_xticks(x, month_analysis['month_name'])
+    ax.legend(loc='upper left')
+    
+    # Add line for attrition rate
+    ax2 = ax.twinx()
+    ax2.plot(x, month_analysis['attrition_rate'], marker='o', color='blue', label='Attrition Rate (%)')
+    ax2.set_ylabel('Attrition Rate (%)', fontsize=12, color='blue')
+    ax2.tick_params(axis='y', labelcolor='blue')
+    ax2.legend(loc='upper right')
+    fig.tight_layout()
+
+def optimal_hiring_time(monthly_df):
+    """Rank calendar months for hiring from historical joiners and leavers
     
     Args:
         monthly_df (pd.DataFrame): DataFrame with monthly staffing data
-        images_dir (Path): Directory to save images
+        
+    Returns:
+        tuple: (best months, worst months, render tasks for the seasonal
+        pattern chart), or None with under 12 months of data
     """
     if monthly_df is None or len(monthly_df) < 12:
         logger.warning("Not enough data for seasonal hiring analysis")
-        return
+        return None
     
     # Extract month names and aggregate data by month
     monthly_df['month_name'] = pd.to_datetime(monthly_df['month']).dt.strftime('%b')
@@ -237,86 +909,57 @@ def analyze_optimal_hiring_time(monthly_df, images_dir):
     month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
     month_analysis['month_idx'] = month_analysis['month_name'].apply(lambda x: month_order.index(x))
     month_analysis = month_analysis.sort_values('month_idx')
-    
-    plt.figure(figsize=(12, 6))
-    
-    width = 0.35
-    x = np.arange(len(month_analysis))
-    
-    plt.bar(x - width/2, month_analysis['joiners'], width, label='Avg Joiners', color='green')
-    plt.bar(x + width/2, month_analysis['leavers'], width, label='Avg Leavers', color='red')
-    
-    # Add line for attrition rate
-    ax2 = plt.twinx()
-    ax2.plot(x, month_analysis['attrition_rate'], marker='o', color='blue', label='Attrition Rate (%)')
-    ax2.set_ylabel('Attrition Rate (%)', fontsize=12, color='blue')
-    ax2.tick_params(axis='y', labelcolor='blue')
-    
-    plt.title('Seasonal Hiring and Attrition Patterns', fontsize=16)
-    plt.xlabel('Month', fontsize=12)
-    plt.ylabel('Average Employee Count', fontsize=12)
-    plt.xticks(x, month_analysis['month_name'])
-    plt.legend(loc='upper left')
-    ax2.legend(loc='upper right')
-    
-    plt.tight_layout()
-    plt.savefig(images_dir / 'seasonal_hiring_pattern.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    tasks = [chart_task('seasonal_hiring_pattern.png', _draw_seasonal_hiring_pattern, (12, 6), month_analysis)]
     
     # Calculate and identify the best months to hire (lowest attrition, highest joining rate)
     month_analysis['hiring_score'] = month_analysis['joiners'] - month_analysis['leavers']
     best_months = month_analysis.sort_values('hiring_score', ascending=False).head(3)['month_name'].tolist()
     worst_months = month_analysis.sort_values('hiring_score').head(3)['month_name'].tolist()
     
+    return best_months, worst_months, tasks
+
+def analyze_optimal_hiring_time(monthly_df, images_dir, workers=None):
+    """Analyze the best time to start hiring based on historical patterns
+    
+    Args:
+        monthly_df (pd.DataFrame): DataFrame with monthly staffing data
+        images_dir (Path): Directory to save images
+        workers (int): Number of chart rendering processes, defaults to one per CPU
+    """
+    analysis = optimal_hiring_time(monthly_df)
+    if analysis is None:
+        return
+    
+    best_months, worst_months, tasks = analysis
+    render_charts(tasks, images_dir, workers)
     return best_months, worst_months
 
-def create_monthly_staffing_table(monthly_df):
+def create_monthly_staffing_table(monthly_df, filters=None):
     """Create HTML table with monthly staffing metrics
     
     Args:
-        monthly_df (pd.DataFrame): DataFrame with monthly staffing data
+        monthly_df (pd.DataFrame | dict): Monthly staffing data or a staffing cube
+        filters (dict): Categories to tabulate when monthly_df is a staffing cube
         
     Returns:
         str: HTML table with monthly staffing metrics
     """
+    monthly_df = _resolve_monthly_df(monthly_df, filters)
     if monthly_df is None or len(monthly_df) == 0:
         return "<p>No monthly staffing data available</p>"
     
-    # Sort data by month (ascending)
-    monthly_df = monthly_df.sort_values('month')
-    
-    # Format the table
-    html_table = """
-    <table class="staffing-table">
-        <thead>
-            <tr>
-                <th>Month</th>
-                <th>Headcount</th>
-                <th>New Joiners</th>
-                <th>Leavers</th>
-                <th>Attrition Rate</th>
-            </tr>
-        </thead>
-        <tbody>
-    """
-    
-    for _, row in monthly_df.iterrows():
-        # Highlight high attrition cells
-        attrition_class = ' class="high-attrition"' if row['attrition_rate'] > 5 else ''
-        
-        html_table += f"""
-            <tr>
-                <td>{row['month']}</td>
-                <td>{row['headcount']}</td>
-                <td>{row['joiners']}</td>
-                <td>{row['leavers']}</td>
-                <td{attrition_class}>{row['attrition_rate']}%</td>
-            </tr>
-        """
-    
-    html_table += """
-        </tbody>
-    </table>
-    """
-    
-    return html_table
+    # Sort data by month (ascending) and add the trailing-12-month figures
+    monthly_df = rolling_staffing_metrics(monthly_df.sort_values('month').reset_index(drop=True))
+    
+    # Highlight high attrition cells
+    attrition_class = np.where(monthly_df['attrition_rate'] > 5, ' class="high-attrition"', '').tolist()
+    
+    return html_table(
+        ['Month', 'Headcount', 'New Joiners', 'Leavers', 'Attrition Rate', '12M Avg. Headcount', 'TTM Attrition',
+         'Annualized Attrition'],
+        [table_column(monthly_df['month']), table_column(monthly_df['headcount']), table_column(monthly_df['joiners']),
+         table_column(monthly_df['leavers']), attrition_class, table_column(monthly_df['attrition_rate']),
+         table_column(monthly_df['rolling_headcount']), table_column(monthly_df['ttm_attrition_rate'], '{}%'),
+         table_column(monthly_df['annualized_attrition_rate'])],
+        row_template='<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td{}>{}%</td><td>{}</td><td>{}</td><td>{}%</td></tr>',
+        css_class='staffing-table')
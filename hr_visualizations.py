@@ -1,9 +1,22 @@
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 import numpy as np
+import seaborn as sns
 from pathlib import Path
 import logging
+import os
+import hashlib
+import inspect
+import io
+import json
+import pickle
+import re
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import matplotlib
+from matplotlib import style
+from matplotlib.figure import Figure
 
 # Set up logging
 logging.basicConfig(
@@ -13,193 +26,591 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def create_visualizations(df, images_dir):
+CHART_STYLE = 'ggplot'
+CHART_DPI = 300
+CHART_FORMATS = ['png', 'svg']
+
+# SVG text stays text rather than glyph outlines, naming only the font the
+# layout was measured with, and element ids are fixed so the same chart
+# always produces the same file
+SVG_SETTINGS = {'svg.fonttype': 'none', 'svg.hashsalt': 'hr-analytics', 'font.sans-serif': ['DejaVu Sans']}
+COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+
+# Rendered charts are kept by a hash of everything that determines their pixels;
+# bump the version when shared drawing helpers change
+CHART_CACHE_VERSION = 1
+CHART_CACHE_MAX_BYTES = 200 * 1024 ** 2
+CHART_MANIFEST = '.chart_manifest.json'
+
+# Chart styles are applied through Matplotlib's global rcParams, so threads of
+# one process take turns drawing; worker processes draw in parallel
+_style_lock = threading.Lock()
+
+# How generate_html_report links a chart: the image name and its alt text
+CHART_IMG_PATTERN = r'<img class="chart-img" src="images/([\w-]+)\.png" alt="([^"]*)">'
+
+def chart_task(file_name, draw, figsize, *args):
+    """Describe one chart to render
+    
+    Args:
+        file_name (str): Image file name inside the images directory
+        draw (callable): Module-level function drawing onto a Figure, called
+            as draw(fig, *args); it must not use the pyplot state machine
+        figsize (tuple): Figure size in inches
+        *args: Data the draw function needs, pickled to the worker process
+        
+    Returns:
+        dict: Render task for render_charts
     """
-    Create enhanced visualizations and save them as PNG files
+    return {'file': file_name, 'draw': draw, 'figsize': figsize, 'args': args}
+
+def chart_file(task, chart_format='png'):
+    """Image file name of a chart task in the given format"""
+    return str(Path(task['file']).with_suffix(f'.{chart_format}'))
+
+def _round_numbers(value):
+    """Round coordinates in an SVG attribute value to 0.1 pt (1/720 inch)"""
+    return re.sub(r'-?\d+\.\d{2,}', lambda m: f"{float(m.group()):.1f}".rstrip('0').rstrip('.'), value)
+
+def _compact_attribute(match):
+    """Collapse whitespace in an attribute; embedded images lose it entirely"""
+    name, value = match.group(1), match.group(2)
+    if name.endswith('href="'):
+        return name + ''.join(value.split()) + '"'
+    return name + ' '.join(_round_numbers(value).split()) + '"'
+
+def optimize_svg(svg):
+    """Shrink Matplotlib SVG output without changing how it looks
+    
+    Drops the metadata block, ids nothing refers to, attribute-less groups
+    and indentation, and rounds coordinates to 0.1 pt. Text content and
+    embedded images are left intact.
     
     Args:
-        df (pd.DataFrame): DataFrame containing HR data
-        images_dir (Path): Directory to save generated images
+        svg (str): SVG document
+        
+    Returns:
+        str: Equivalent, smaller SVG document
     """
-    logger.info("Creating visualizations...")
+    svg = re.sub(r'<metadata>.*?</metadata>', '', svg, flags=re.S)
+    referenced = {ref for pair in re.findall(r'url\(#([^)]+)\)|href="#([^"]+)"', svg) for ref in pair if ref}
+    svg = re.sub(r' id="([^"]*)"', lambda m: m.group(0) if m.group(1) in referenced else '', svg)
+    svg = re.sub(r'( [\w:-]+=")([^"]*)"', _compact_attribute, svg)
+    svg = re.sub(r'>\s+<', '><', svg)
+    
+    # Unwrap <g> elements left without attributes, keeping their contents,
+    # and drop empty self-closing ones
+    svg = re.sub(r'<g\s*/>', '', svg)
+    plain = []
+    def unwrap(match):
+        if match.group(1):
+            return '' if plain.pop() else match.group(0)
+        if match.group(2).rstrip().endswith('/'):
+            return match.group(0)
+        plain.append(not match.group(2).strip())
+        return '' if plain[-1] else match.group(0)
+    return re.sub(r'<(/?)g\b([^>]*)>', unwrap, svg)
+
+def chart_bytes(task, chart_format='png'):
+    """Draw one chart on its own Figure and return the encoded image
     
-    # Set the style for all visualizations
-    plt.style.use('ggplot')
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-    
-    # 1. Attrition Distribution Pie Chart
-    logger.info("Creating attrition pie chart...")
-    plt.figure(figsize=(8, 6))
-    labels = ['Active', 'Left']
-    sizes = [len(df[df['attrition'] == 0]), len(df[df['attrition'] == 1])]
-    explode = (0, 0.1)
-    plt.pie(sizes, explode=explode, labels=labels, autopct='%1.1f%%', 
-            shadow=True, startangle=90, colors=[colors[0], colors[3]])
-    plt.axis('equal')
-    plt.title('Employee Attrition Distribution', fontsize=16)
-    plt.savefig(images_dir / 'attrition_pie.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 2. Department Distribution Bar Chart
-    logger.info("Creating department distribution chart...")
-    plt.figure(figsize=(10, 6))
-    dept_counts = df['department'].value_counts()
-    ax = dept_counts.plot(kind='bar', color=colors[0])
+    Args:
+        task (dict): Task from chart_task
+        chart_format (str): 'png' or 'svg'
+        
+    Returns:
+        bytes: PNG image or optimized SVG document
+    """
+    # Start from the default style so every process renders the same pixels
+    with _style_lock, style.context(CHART_STYLE, after_reset=True), \
+            matplotlib.rc_context(SVG_SETTINGS if chart_format == 'svg' else None):
+        fig = Figure(figsize=task['figsize'])
+        task['draw'](fig, *task['args'])
+        if chart_format == 'svg':
+            buffer = io.StringIO()
+            fig.savefig(buffer, format='svg', bbox_inches='tight', metadata={'Date': None})
+            return optimize_svg(buffer.getvalue()).encode('utf-8')
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=CHART_DPI, bbox_inches='tight')
+        return buffer.getvalue()
+
+def _render_chart(task, images_dir, chart_format='png'):
+    """Draw and save one chart"""
+    file_name = chart_file(task, chart_format)
+    (Path(images_dir) / file_name).write_bytes(chart_bytes(task, chart_format))
+    return file_name
+
+def render_chart_bytes(tasks, workers=None, chart_format='png'):
+    """Render chart tasks into memory, in parallel when there are several
+    
+    Args:
+        tasks (list): Tasks from chart_task
+        workers (int): Number of worker processes, defaults to one per CPU;
+            1 renders in the current process
+        chart_format (str): 'png' or 'svg'
+        
+    Returns:
+        dict: Encoded image of each chart by its file name in chart_format
+    """
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        images = [chart_bytes(task, chart_format) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            images = list(pool.map(chart_bytes, tasks, repeat(chart_format)))
+    return {chart_file(task, chart_format): image for task, image in zip(tasks, images)}
+
+def _hash_value(digest, value):
+    """Feed a chart input into a hash by its content"""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        is_frame = isinstance(value, pd.DataFrame)
+        digest.update(repr((
+            type(value).__name__,
+            getattr(value, 'name', None),
+            list(value.columns) if is_frame else None,
+            list(value.columns.names) if is_frame else None,
+            list(value.index.names) if not isinstance(value, pd.Index) else list(value.names),
+            str(value.dtypes.tolist()) if is_frame else str(value.dtype),
+            value.shape,
+        )).encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        except TypeError:
+            digest.update(pickle.dumps(value))
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(pickle.dumps(value) if value.dtype == object else np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(repr((type(value).__name__, len(value))).encode())
+        for item in value:
+            _hash_value(digest, item)
+    elif isinstance(value, dict):
+        digest.update(repr(('dict', len(value))).encode())
+        for key, item in value.items():
+            _hash_value(digest, key)
+            _hash_value(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+def chart_cache_key(task, chart_format='png'):
+    """Content hash of a chart: its data, drawing code, size, style, dpi and format
+    
+    Args:
+        task (dict): Task from chart_task
+        chart_format (str): One of CHART_FORMATS
+        
+    Returns:
+        str: Hex digest identifying the rendered image
+    """
+    try:
+        source = inspect.getsource(task['draw'])
+    except (OSError, TypeError):
+        source = None
+    digest = hashlib.sha256()
+    digest.update(repr((CHART_CACHE_VERSION, CHART_STYLE, CHART_DPI, matplotlib.__version__, sns.__version__,
+                        task['draw'].__module__, task['draw'].__qualname__, source,
+                        task['figsize'], chart_format)).encode())
+    _hash_value(digest, task['args'])
+    return digest.hexdigest()
+
+def _load_chart_manifest(images_dir):
+    """Cache key, size and modification time of each image last written"""
+    try:
+        with open(images_dir / CHART_MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _image_stamp(path):
+    """Size and modification time used to notice images changed by others"""
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+def evict_chart_cache(cache_dir, max_bytes=CHART_CACHE_MAX_BYTES):
+    """Delete the least recently used cached charts beyond max_bytes
+    
+    Args:
+        cache_dir (Path): Chart cache directory
+        max_bytes (int): Largest total size to keep
+        
+    Returns:
+        int: Number of cached charts deleted
+    """
+    entries = [(entry.stat(), entry) for chart_format in CHART_FORMATS
+               for entry in Path(cache_dir).glob(f'*.{chart_format}')]
+    total = sum(stat.st_size for stat, _ in entries)
+    evicted = 0
+    for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+        if total <= max_bytes:
+            break
+        entry.unlink(missing_ok=True)
+        total -= stat.st_size
+        evicted += 1
+    return evicted
+
+def render_charts(tasks, images_dir, workers=None, cache_dir=None, max_cache_bytes=CHART_CACHE_MAX_BYTES,
+                  chart_format='png'):
+    """Render independent chart tasks, in parallel when there are several
+    
+    Each chart is drawn on its own Figure object, so no pyplot state is shared
+    between charts and the images are byte-identical whatever the worker count.
+    
+    With a cache directory, each chart is keyed by chart_cache_key. A chart
+    whose image in images_dir was written for the same key is skipped, one
+    rendered before is copied from the cache, and only the rest are drawn.
+    The cache is trimmed to max_cache_bytes, least recently used first.
+    
+    Args:
+        tasks (list): Tasks from chart_task
+        images_dir (Path): Directory to save images
+        workers (int): Number of worker processes, defaults to one per CPU;
+            1 renders in the current process
+        cache_dir (Path): Directory of previously rendered charts, None to
+            always render
+        max_cache_bytes (int): Size bound of the chart cache
+        chart_format (str): 'png' for 300 dpi images or 'svg' for compact
+            vector images; the extension of each task's file name is replaced
+            
+    Returns:
+        list: File names of the charts that had to be rendered
+    """
+    images_dir = Path(images_dir)
+    pending = tasks
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest = _load_chart_manifest(images_dir)
+        keys = {}
+        pending = []
+        unchanged = 0
+        for task in tasks:
+            file_name = chart_file(task, chart_format)
+            key = keys[file_name] = chart_cache_key(task, chart_format)
+            target = images_dir / file_name
+            cached = cache_dir / f"{key}.{chart_format}"
+            if manifest.get(file_name, [None])[0] == key and target.exists() \
+                    and _image_stamp(target) == manifest[file_name][1:]:
+                unchanged += 1
+            elif cached.exists():
+                shutil.copyfile(cached, target)
+            else:
+                pending.append(task)
+                continue
+            if cached.exists():
+                os.utime(cached)  # Mark as recently used
+    
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        rendered = [_render_chart(task, images_dir, chart_format) for task in pending]
+    else:
+        logger.info(f"Rendering {len(pending)} charts with {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(_render_chart, pending, repeat(images_dir), repeat(chart_format)))
+    
+    if cache_dir is not None:
+        for file_name in rendered:
+            # Write under a temporary name so a crash never leaves a partial entry
+            cached = cache_dir / f"{keys[file_name]}.{chart_format}"
+            partial = cached.with_suffix('.tmp')
+            shutil.copyfile(images_dir / file_name, partial)
+            os.replace(partial, cached)
+        for file_name, key in keys.items():
+            manifest[file_name] = [key] + _image_stamp(images_dir / file_name)
+        with open(images_dir / CHART_MANIFEST, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        evicted = evict_chart_cache(cache_dir, max_cache_bytes)
+        logger.info(f"Chart cache: {unchanged} unchanged, {len(tasks) - unchanged - len(rendered)} restored, "
+                    f"{len(rendered)} rendered, {evicted} evicted")
+    return rendered
+
+def embed_svg_charts(html, svgs):
+    """Replace chart <img> tags in a report with the SVG markup of each chart
+    
+    Args:
+        html (str): Report HTML referencing images/<name>.png charts
+        svgs (dict): SVG document of each chart by its name
+        
+    Returns:
+        str: Self-contained HTML; tags without a matching SVG are left as they are
+    """
+    def embed(match):
+        svg = svgs.get(match.group(1))
+        if svg is None:
+            return match.group(0)
+        svg = svg[svg.index('<svg'):]  # Drop the XML declaration and doctype
+        return svg.replace('<svg ', f'<svg class="chart-img" role="img" aria-label="{match.group(2)}" ', 1)
+    
+    return re.sub(CHART_IMG_PATTERN, embed, html)
+
+def inline_svg_charts(html, images_dir):
+    """Embed the .svg charts saved in images_dir, see embed_svg_charts"""
+    svgs = {}
+    for name, _ in re.findall(CHART_IMG_PATTERN, html):
+        svg_file = Path(images_dir) / f"{name}.svg"
+        if svg_file.exists():
+            svgs[name] = svg_file.read_text(encoding='utf-8')
+    return embed_svg_charts(html, svgs)
+
+def _add_bar_labels(ax, values, fmt='{}'):
+    """Write each bar's value above it"""
+    for i, v in enumerate(values):
+        ax.text(i, v + 0.5, fmt.format(v), ha='center', fontsize=10)
+
+# 1. Attrition Distribution Pie Chart
+def _draw_attrition_pie(fig, sizes):
+    ax = fig.add_subplot()
+    ax.pie(sizes, explode=(0, 0.1), labels=['Active', 'Left'], autopct='%1.1f%%',
+           shadow=True, startangle=90, colors=[COLORS[0], COLORS[3]])
+    ax.axis('equal')
+    ax.set_title('Employee Attrition Distribution', fontsize=16)
+
+# 2. Department Distribution Bar Chart
+def _draw_department_distribution(fig, dept_counts):
+    ax = dept_counts.plot(kind='bar', color=COLORS[0], ax=fig.add_subplot())
     ax.set_title('Employee Distribution by Department', fontsize=16)
     ax.set_xlabel('Department', fontsize=12)
     ax.set_ylabel('Number of Employees', fontsize=12)
     ax.tick_params(axis='x', rotation=45)
+    _add_bar_labels(ax, dept_counts)
+    fig.tight_layout()
+
+def histogram_summary(values, bins, kde_points=200, kde_bins=1024):
+    """Bin a numeric column once so its chart no longer depends on the row count
     
-    # Add value labels on top of bars
-    for i, v in enumerate(dept_counts):
-        ax.text(i, v + 0.5, str(v), ha='center', fontsize=10)
+    The KDE is a Gaussian kernel with Scott's bandwidth (as seaborn uses),
+    evaluated on a grid over the data range from kde_bins fine bin counts
+    rather than from every row.
+    
+    Args:
+        values (array-like): Column to summarize, missing values are ignored
+        bins (int): Number of histogram bins
+        kde_points (int): Grid points the KDE curve is evaluated at
+        kde_bins (int): Fine bins the KDE is computed from
         
-    plt.tight_layout()
-    plt.savefig(images_dir / 'department_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 3. Salary Distribution Histogram
-    logger.info("Creating salary distribution histogram...")
-    plt.figure(figsize=(10, 6))
-    sns.histplot(df['salary'], bins=20, kde=True, color=colors[1])
-    plt.title('Salary Distribution', fontsize=16)
-    plt.xlabel('Annual Salary ($)', fontsize=12)
-    plt.ylabel('Number of Employees', fontsize=12)
-    plt.grid(axis='y', alpha=0.75)
+    Returns:
+        dict: Histogram 'counts' and 'edges', 'kde_x'/'kde_y' curve scaled
+        to counts (None for constant data), row count 'n', 'mean' and 'median'
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    n = len(values)
+    counts, edges = np.histogram(values, bins=bins)
+    summary = {
+        'counts': counts,
+        'edges': edges,
+        'kde_x': None,
+        'kde_y': None,
+        'n': n,
+        'mean': float(values.mean()) if n else np.nan,
+        'median': float(np.median(values)) if n else np.nan,
+    }
+    
+    std = values.std(ddof=1) if n > 1 else 0.0
+    if std > 0:
+        fine_counts, fine_edges = np.histogram(values, bins=kde_bins, range=(edges[0], edges[-1]))
+        centers = (fine_edges[:-1] + fine_edges[1:]) / 2
+        bandwidth = std * n ** (-1 / 5)
+        grid = np.linspace(edges[0], edges[-1], kde_points)
+        kernel = np.exp(-0.5 * ((grid[:, None] - centers[None, :]) / bandwidth) ** 2)
+        density = kernel @ fine_counts / (n * bandwidth * np.sqrt(2 * np.pi))
+        summary['kde_x'] = grid
+        summary['kde_y'] = density * n * (edges[1] - edges[0])
+    return summary
+
+def _scatter_edges(values, max_bins=40):
+    """Bin edges for a scatter axis: one bin per value for small integer ranges"""
+    low, high = np.nanmin(values), np.nanmax(values)
+    if np.all(np.mod(values, 1) == 0) and high - low < max_bins:
+        return np.arange(low - 0.5, high + 1.5)
+    return np.linspace(low, high, max_bins + 1)
+
+def scatter_summary(x, y, hue=None, max_bins=40):
+    """Bin a scatter plot into 2D counts with a least-squares trend line
+    
+    Args:
+        x (array-like): Horizontal values
+        y (array-like): Vertical values
+        hue (array-like): Optional group of each point, counted separately
+        max_bins (int): Most bins per axis
+        
+    Returns:
+        dict: Bin 'x'/'y' centers, 'counts' as (groups, x bins, y bins),
+        'groups' labels and the trend line 'slope' and 'intercept'
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    codes, groups = pd.factorize(np.asarray(hue)[valid], sort=True) if hue is not None else (np.zeros(len(x), dtype=np.int64), [None])
+    
+    x_edges = _scatter_edges(x, max_bins)
+    y_edges = _scatter_edges(y, max_bins)
+    x_idx = np.clip(np.searchsorted(x_edges, x, side='right') - 1, 0, len(x_edges) - 2)
+    y_idx = np.clip(np.searchsorted(y_edges, y, side='right') - 1, 0, len(y_edges) - 2)
+    shape = (len(groups), len(x_edges) - 1, len(y_edges) - 1)
+    counts = np.bincount(np.ravel_multi_index((codes, x_idx, y_idx), shape), minlength=int(np.prod(shape))).reshape(shape)
+    
+    # Ordinary least squares from the centred sums
+    x_mean, y_mean = x.mean(), y.mean()
+    spread = ((x - x_mean) ** 2).sum()
+    slope = ((x - x_mean) * (y - y_mean)).sum() / spread if spread > 0 else 0.0
+    return {
+        'x': (x_edges[:-1] + x_edges[1:]) / 2,
+        'y': (y_edges[:-1] + y_edges[1:]) / 2,
+        'counts': counts,
+        'groups': list(groups),
+        'slope': float(slope),
+        'intercept': float(y_mean - slope * x_mean),
+    }
+
+def _draw_histogram(ax, summary, color):
+    """Draw a pre-binned histogram with its KDE curve"""
+    edges = summary['edges']
+    ax.bar(edges[:-1], summary['counts'], width=np.diff(edges), align='edge',
+           color=color, alpha=0.5, edgecolor='white', linewidth=0.5)
+    if summary['kde_x'] is not None:
+        ax.plot(summary['kde_x'], summary['kde_y'], color=color, linewidth=1.5)
+
+# 3. Salary Distribution Histogram
+def _draw_salary_histogram(fig, salary):
+    ax = fig.add_subplot()
+    _draw_histogram(ax, salary, COLORS[1])
+    ax.set_title('Salary Distribution', fontsize=16)
+    ax.set_xlabel('Annual Salary ($)', fontsize=12)
+    ax.set_ylabel('Number of Employees', fontsize=12)
+    ax.grid(axis='y', alpha=0.75)
     
     # Add median and mean lines
-    median_salary = df['salary'].median()
-    mean_salary = df['salary'].mean()
-    plt.axvline(median_salary, color=colors[2], linestyle='--', linewidth=2, label=f'Median: ${median_salary:,.0f}')
-    plt.axvline(mean_salary, color=colors[3], linestyle='--', linewidth=2, label=f'Mean: ${mean_salary:,.0f}')
-    plt.legend()
-    
-    plt.savefig(images_dir / 'salary_histogram.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 4. Age Distribution Histogram
-    logger.info("Creating age distribution histogram...")
-    plt.figure(figsize=(10, 6))
-    sns.histplot(df['age'], bins=15, kde=True, color=colors[4])
-    plt.title('Age Distribution', fontsize=16)
-    plt.xlabel('Age', fontsize=12)
-    plt.ylabel('Number of Employees', fontsize=12)
-    plt.grid(axis='y', alpha=0.75)
+    ax.axvline(salary['median'], color=COLORS[2], linestyle='--', linewidth=2, label=f"Median: ${salary['median']:,.0f}")
+    ax.axvline(salary['mean'], color=COLORS[3], linestyle='--', linewidth=2, label=f"Mean: ${salary['mean']:,.0f}")
+    ax.legend()
+
+# 4. Age Distribution Histogram
+def _draw_age_histogram(fig, age, age_groups):
+    ax = fig.add_subplot()
+    _draw_histogram(ax, age, COLORS[4])
+    ax.set_title('Age Distribution', fontsize=16)
+    ax.set_xlabel('Age', fontsize=12)
+    ax.set_ylabel('Number of Employees', fontsize=12)
+    ax.grid(axis='y', alpha=0.75)
     
     # Add age groups annotation
-    age_groups = df['age'].value_counts(bins=[20, 30, 40, 50, 60, 70]).sort_index()
     age_labels = ['20-30', '30-40', '40-50', '50-60', '60+']
-    age_data = [age_groups.get(i, 0) for i in range(len(age_labels))]
-    
-    # Add text annotation
-    plt.annotate(
-        f"Age Groups:\n" + "\n".join([f"{label}: {count}" for label, count in zip(age_labels, age_data) if count > 0]),
+    ax.annotate(
+        f"Age Groups:\n" + "\n".join([f"{label}: {count}" for label, count in zip(age_labels, age_groups) if count > 0]),
         xy=(0.02, 0.70),
         xycoords='axes fraction',
         bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.8)
     )
+
+# 5. Tenure vs Satisfaction, binned, with regression line
+def _draw_tenure_vs_satisfaction(fig, summary):
+    ax = fig.add_subplot()
+    x, y = np.meshgrid(summary['x'], summary['y'], indexing='ij')
+    largest = max(summary['counts'].max(), 1)
+    palette = {0: COLORS[0], 1: COLORS[3]}
+    labels = {0: 'Active', 1: 'Left'}
+    for g, group in enumerate(summary['groups']):
+        counts = summary['counts'][g]
+        occupied = counts > 0
+        # Marker area grows with the number of employees in the bin
+        ax.scatter(x[occupied], y[occupied], s=20 + 480 * counts[occupied] / largest,
+                   color=palette.get(group, COLORS[g % len(COLORS)]), alpha=0.7,
+                   edgecolors='white', label=labels.get(group, group))
     
-    plt.savefig(images_dir / 'age_histogram.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 5. Tenure vs Satisfaction Scatter Plot with regression line
-    logger.info("Creating tenure vs satisfaction scatter plot...")
-    plt.figure(figsize=(10, 6))
-    
-    # Create a scatter plot
-    sns.scatterplot(
-        x='tenure', 
-        y='satisfaction',
-        hue='attrition',
-        palette={0: colors[0], 1: colors[3]},
-        s=100,
-        alpha=0.7,
-        data=df
-    )
-    
-    # Add regression line
-    sns.regplot(
-        x='tenure', 
-        y='satisfaction',
-        scatter=False,
-        ci=None,
-        line_kws={"color": "black", "lw": 2, "linestyle": "--"},
-        data=df
-    )
-    
-    plt.title('Tenure vs Job Satisfaction', fontsize=16)
-    plt.xlabel('Tenure (Years)', fontsize=12)
-    plt.ylabel('Job Satisfaction (1-5)', fontsize=12)
-    plt.legend(title='Attrition', labels=['Active', 'Left'])
-    plt.grid(True, alpha=0.3)
-    plt.savefig(images_dir / 'tenure_vs_satisfaction.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 6. NEW: Attrition by Department
-    logger.info("Creating attrition by department chart...")
-    plt.figure(figsize=(12, 6))
-    
-    attrition_by_dept = df.groupby('department')['attrition'].mean() * 100
-    ax = attrition_by_dept.plot(kind='bar', color=colors[3])
+    trend_x = np.array([summary['x'][0], summary['x'][-1]])
+    ax.plot(trend_x, summary['intercept'] + summary['slope'] * trend_x, color='black', lw=2, linestyle='--')
+    ax.set_title('Tenure vs Job Satisfaction', fontsize=16)
+    ax.set_xlabel('Tenure (Years)', fontsize=12)
+    ax.set_ylabel('Job Satisfaction (1-5)', fontsize=12)
+    legend = ax.legend(title='Attrition (size = employees)')
+    for handle in legend.legend_handles:
+        handle.set_sizes([60])
+    ax.grid(True, alpha=0.3)
+
+# 6. Attrition by Department
+def _draw_attrition_by_department(fig, attrition_by_dept):
+    ax = attrition_by_dept.plot(kind='bar', color=COLORS[3], ax=fig.add_subplot())
     ax.set_title('Attrition Rate by Department (%)', fontsize=16)
     ax.set_xlabel('Department', fontsize=12)
     ax.set_ylabel('Attrition Rate (%)', fontsize=12)
     ax.tick_params(axis='x', rotation=45)
+    _add_bar_labels(ax, attrition_by_dept, '{:.1f}%')
+    fig.tight_layout()
+
+# 7. Satisfaction Heatmap
+def _draw_satisfaction_correlation(fig, corr_matrix):
+    ax = fig.add_subplot()
+    sns.heatmap(
+        corr_matrix, 
+        annot=True, 
+        cmap='coolwarm', 
+        linewidths=0.5, 
+        vmin=-1, 
+        vmax=1,
+        ax=ax
+    )
+    ax.set_title('Correlation Between Satisfaction Metrics', fontsize=16)
+    fig.tight_layout()
+
+# 8. Years of Service Distribution
+def _draw_tenure_distribution(fig, tenure_dist):
+    ax = tenure_dist.plot(kind='bar', color=COLORS[2], ax=fig.add_subplot())
+    ax.set_title('Employee Tenure Distribution', fontsize=16)
+    ax.set_xlabel('Years of Service', fontsize=12)
+    ax.set_ylabel('Number of Employees', fontsize=12)
+    _add_bar_labels(ax, tenure_dist)
+    fig.tight_layout()
+
+def visualization_tasks(df):
+    """Build the render tasks for the standard HR charts
     
-    # Add value labels on top of bars
-    for i, v in enumerate(attrition_by_dept):
-        ax.text(i, v + 0.5, f"{v:.1f}%", ha='center', fontsize=10)
-    
-    plt.tight_layout()
-    plt.savefig(images_dir / 'attrition_by_dept.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    Every chart is drawn from aggregates (histogram counts, a gridded KDE,
+    2D bin counts and a trend line), so render time does not grow with the
+    number of employees.
     
-    # 7. NEW: Satisfaction Heatmap
-    logger.info("Creating satisfaction heatmap...")
-    if all(x in df.columns for x in ['satisfaction', 'work_life_balance', 'performance_rating']):
-        plt.figure(figsize=(10, 8))
-        
-        # Create correlation matrix
-        satisfaction_cols = ['satisfaction', 'work_life_balance', 'performance_rating']
-        corr_matrix = df[satisfaction_cols].corr()
-        
-        # Generate heatmap
-        sns.heatmap(
-            corr_matrix, 
-            annot=True, 
-            cmap='coolwarm', 
-            linewidths=0.5, 
-            vmin=-1, 
-            vmax=1
-        )
+    Args:
+        df (pd.DataFrame): DataFrame containing HR data
         
-        plt.title('Correlation Between Satisfaction Metrics', fontsize=16)
-        plt.tight_layout()
-        plt.savefig(images_dir / 'satisfaction_correlation.png', dpi=300, bbox_inches='tight')
-        plt.close()
+    Returns:
+        list: Tasks for render_charts
+    """
+    tasks = [
+        chart_task('attrition_pie.png', _draw_attrition_pie, (8, 6),
+                   [len(df[df['attrition'] == 0]), len(df[df['attrition'] == 1])]),
+        chart_task('department_distribution.png', _draw_department_distribution, (10, 6),
+                   df['department'].value_counts()),
+        chart_task('salary_histogram.png', _draw_salary_histogram, (10, 6), histogram_summary(df['salary'], bins=20)),
+        chart_task('age_histogram.png', _draw_age_histogram, (10, 6), histogram_summary(df['age'], bins=15),
+                   df['age'].value_counts(bins=[20, 30, 40, 50, 60, 70]).sort_index().tolist()),
+        chart_task('tenure_vs_satisfaction.png', _draw_tenure_vs_satisfaction, (10, 6),
+                   scatter_summary(df['tenure'], df['satisfaction'], df['attrition'])),
+        chart_task('attrition_by_dept.png', _draw_attrition_by_department, (12, 6),
+                   df.groupby('department', observed=True)['attrition'].mean() * 100),
+    ]
     
-    # 8. NEW: Years of Service Distribution
-    logger.info("Creating years of service distribution...")
-    plt.figure(figsize=(10, 6))
+    satisfaction_cols = ['satisfaction', 'work_life_balance', 'performance_rating']
+    if all(x in df.columns for x in satisfaction_cols):
+        tasks.append(chart_task('satisfaction_correlation.png', _draw_satisfaction_correlation, (10, 8),
+                                df[satisfaction_cols].corr()))
     
     bins = [0, 1, 3, 5, 10, 15, 20, 30]
     labels = ['<1 year', '1-3 years', '3-5 years', '5-10 years', '10-15 years', '15-20 years', '20+ years']
+    tenure_group = pd.cut(df['tenure'], bins=bins, labels=labels, right=False)
+    tasks.append(chart_task('tenure_distribution.png', _draw_tenure_distribution, (10, 6),
+                            tenure_group.value_counts().sort_index()))
+    return tasks
+
+def create_visualizations(df, images_dir, workers=None):
+    """
+    Create enhanced visualizations and save them as PNG files
     
-    df['tenure_group'] = pd.cut(df['tenure'], bins=bins, labels=labels, right=False)
-    tenure_dist = df['tenure_group'].value_counts().sort_index()
-    
-    ax = tenure_dist.plot(kind='bar', color=colors[2])
-    ax.set_title('Employee Tenure Distribution', fontsize=16)
-    ax.set_xlabel('Years of Service', fontsize=12)
-    ax.set_ylabel('Number of Employees', fontsize=12)
-    
-    # Add value labels on top of bars
-    for i, v in enumerate(tenure_dist):
-        ax.text(i, v + 0.5, str(v), ha='center', fontsize=10)
-    
-    plt.tight_layout()
-    plt.savefig(images_dir / 'tenure_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
+    Args:
+        df (pd.DataFrame): DataFrame containing HR data
+        images_dir (Path): Directory to save generated images
+        workers (int): Number of chart rendering processes, defaults to one per CPU
+    """
+    logger.info("Creating visualizations...")
+    render_charts(visualization_tasks(df), images_dir, workers)
     logger.info("All visualizations created successfully.")
     return True